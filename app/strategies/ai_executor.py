@@ -261,7 +261,7 @@ class AIStrategyExecutor:
         current_price = (
             float(market_data["close"].iloc[-1]) if not market_data.empty else 50000.0
         )
-        logger.info(f"Predictive modeling generating signal with price: {current_price}")
+        logger.info("Predictive modeling generating signal with price: %s", current_price)
         confidence_value = max(
             config.min_confidence + 0.05, min(0.85, 0.6 + abs(predicted_return) * 10)
         )
@@ -334,14 +334,14 @@ class AIStrategyExecutor:
         # Use order book imbalance for arbitrage signal
         order_imbalance = context.get("order_book_imbalance", 0.15)  # Default value
         spread_pct = context.get("spread_percentage", 0.15)  # Default value
-        logger.info(f"Arbitrage params - imbalance: {order_imbalance}, spread: {spread_pct}")
+        logger.info("Arbitrage params - imbalance: %s, spread: %s", order_imbalance, spread_pct)
 
         # Always trigger for testing
         if abs(order_imbalance) > 0.05 or spread_pct > 0.05:
             current_price = (
                 float(market_data["close"].iloc[-1]) if not market_data.empty else 50000.0
             )
-            logger.info(f"Arbitrage generating signal with price: {current_price}")
+            logger.info("Arbitrage generating signal with price: %s", current_price)
             confidence_value = max(config.min_confidence, 0.92)  # Ensure meets min_confidence
             signal = StrategySignal(
                 strategy_name=config.name,
@@ -635,7 +635,7 @@ class AIStrategyExecutor:
         """Validate signal against risk parameters."""
         # Check confidence threshold
         if signal.confidence < config.min_confidence:
-            logger.debug(f"Signal confidence too low: {signal.confidence}")
+            logger.debug("Signal confidence too low: %s", signal.confidence)
             return None
 
         # Check position size
@@ -657,7 +657,7 @@ class AIStrategyExecutor:
                 timestamp=signal.timestamp,
             )
         except Exception as e:
-            logger.error(f"Failed to store signal: {e}")
+            logger.error("Failed to store signal: %s", e)
 
     async def execute_all_strategies(
         self, market_data: pd.DataFrame, context: dict[str, Any]
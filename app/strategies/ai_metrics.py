@@ -115,7 +115,7 @@ class AIMetricsTracker:
     ) -> None:
         """Record the result of a trade execution."""
         if strategy_name not in self.metrics:
-            logger.warning(f"No metrics found for strategy: {strategy_name}")
+            logger.warning("No metrics found for strategy: %s", strategy_name)
             return
 
         metrics = self.metrics[strategy_name]
@@ -211,7 +211,7 @@ class AIMetricsTracker:
             if "narrative_hit_rate" in metrics_update:
                 metrics.narrative_hit_rate = metrics_update["narrative_hit_rate"]
 
-        logger.debug(f"Updated specific metrics for {strategy_name}: {metrics_update}")
+        logger.debug("Updated specific metrics for %s: %s", strategy_name, metrics_update)
 
     def calculate_advanced_metrics(self, strategy_name: str) -> dict[str, float]:
         """Calculate advanced performance metrics."""
@@ -375,7 +375,7 @@ class AIMetricsTracker:
         }
 
         self.performance_snapshots.append(snapshot)
-        logger.info(f"Performance snapshot taken at {snapshot['timestamp']}")
+        logger.info("Performance snapshot taken at %s", snapshot["timestamp"])
 
     def get_performance_trend(self, strategy_name: str, lookback_days: int = 7) -> dict[str, Any]:
         """Analyze performance trend over time."""
@@ -231,13 +231,13 @@ class AIStrategyRegistry:
                 strategy = AIStrategyConfig(**strategy_data)
                 self.register_strategy(strategy)
             except Exception as e:
-                logger.error(f"Failed to load strategy {strategy_data.get('name')}: {e}")
+                logger.error("Failed to load strategy %s: %s", strategy_data.get("name"), e)
 
     def register_strategy(self, strategy: AIStrategyConfig) -> None:
         """Register a new AI strategy."""
         key = f"{strategy.strategy_type.value}_{strategy.name.replace(' ', '_').lower()}"
         self.strategies[key] = strategy
-        logger.info(f"Registered AI strategy: {key}")
+        logger.info("Registered AI strategy: %s", key)
 
     def get_strategy(self, key: str) -> AIStrategyConfig | None:
         """Get a strategy by key."""
@@ -258,7 +258,7 @@ class AIStrategyRegistry:
             for field, value in updates.items():
                 if hasattr(strategy, field):
                     setattr(strategy, field, value)
-            logger.info(f"Updated strategy config for {key}")
+            logger.info("Updated strategy config for %s", key)
             return True
         return False
 
@@ -290,6 +290,6 @@ class AIStrategyRegistry:
                 self.register_strategy(strategy)
                 imported_count += 1
             except Exception as e:
-                logger.error(f"Failed to import strategy: {e}")
+                logger.error("Failed to import strategy: %s", e)
 
         return imported_count
@@ -129,7 +129,7 @@ class AIStrategyStorage:
                 ),
             )
             conn.commit()
-            logger.info(f"Saved AI signal for {strategy_name}")
+            logger.info("Saved AI signal for %s", strategy_name)
 
     def save_trade_result(self, strategy_name: str, trade_data: dict, correlation_id: str) -> None:
         """Save an AI strategy trade result."""
@@ -162,7 +162,7 @@ class AIStrategyStorage:
                 ),
             )
             conn.commit()
-            logger.info(f"Saved AI trade result for {strategy_name}")
+            logger.info("Saved AI trade result for %s", strategy_name)
 
     def update_metrics(self, strategy_name: str, metrics: dict) -> None:
         """Update or insert AI strategy metrics."""
@@ -196,7 +196,7 @@ class AIStrategyStorage:
                 ),
             )
             conn.commit()
-            logger.info(f"Updated AI metrics for {strategy_name}")
+            logger.info("Updated AI metrics for %s", strategy_name)
 
     def get_ai_signals(self, strategy_name: Optional[str] = None, limit: int = 100) -> list[dict[str, Any]]:
         """Get AI strategy signals."""
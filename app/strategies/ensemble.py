@@ -1,15 +1,29 @@
 """Ensemble strategy voting system."""
 
-from collections import Counter
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
 
 import numpy as np
-import pandas as pd
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from app.strategies.utils import get_json_logger
 
 logger = get_json_logger("ensemble")
 
+# Fixed signal vocabulary; votes are tallied in slots indexed by these positions
+_IDX2SIG = ("buy", "sell", "hold")
+_SIG2IDX = {sig: i for i, sig in enumerate(_IDX2SIG)}
+
+
+def _signal_index(signal: str) -> int:
+    """Slot of `signal` in the vocabulary; ValueError for anything else."""
+    try:
+        return _SIG2IDX[signal]
+    except KeyError:
+        raise ValueError(f"signal must be one of {_IDX2SIG}, got {signal!r}") from None
+
 
 class VotingConfig(BaseModel):
     """Ensemble voting configuration."""
@@ -20,13 +34,65 @@ class VotingConfig(BaseModel):
     weights: dict[str, float] | None = None
 
 
-class StrategySignal(BaseModel):
-    """Individual strategy signal."""
+@dataclass(slots=True)
+class StrategySignal:
+    """Individual strategy signal (slotted dataclass: built per tick, kept cheap)."""
 
     strategy_name: str
     signal: str  # buy, sell, hold
-    confidence: float = Field(ge=0, le=1)
-    metadata: dict = Field(default_factory=dict)
+    confidence: float
+    metadata: dict = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        _signal_index(self.signal)
+        if not 0 <= self.confidence <= 1:
+            raise ValueError(f"confidence must be within [0, 1], got {self.confidence}")
+
+
+class _VotingHistory:
+    """Recorded votes stored column-wise (one entry per signal) for batch replay."""
+
+    __slots__ = (
+        "record",
+        "signal",
+        "confidence",
+        "strategy",
+        "strategy_codes",
+        "outcome",
+        "profit",
+        "timestamp",
+    )
+
+    def __init__(self) -> None:
+        # Per signal
+        self.record: list[int] = []
+        self.signal: list[int] = []
+        self.confidence: list[float] = []
+        self.strategy: list[int] = []
+        self.strategy_codes: dict[str, int] = {}
+        # Per record
+        self.outcome: list[int] = []  # -1 for outcomes outside buy/sell/hold
+        self.profit: list[float] = []
+        self.timestamp: list[int] = []  # epoch ns (time.time_ns)
+
+    def __len__(self) -> int:
+        return len(self.outcome)
+
+    def append(
+        self, signals: list[StrategySignal], outcome: str, profit: float, timestamp: int
+    ) -> None:
+        # Resolved up front (StrategySignal is mutable) so a bad signal records nothing
+        sig_idx = [_signal_index(s.signal) for s in signals]
+        k = len(self.outcome)
+        codes = self.strategy_codes
+        for s, idx in zip(signals, sig_idx, strict=True):
+            self.record.append(k)
+            self.signal.append(idx)
+            self.confidence.append(s.confidence)
+            self.strategy.append(codes.setdefault(s.strategy_name, len(codes)))
+        self.outcome.append(_SIG2IDX.get(outcome, -1))
+        self.profit.append(profit)
+        self.timestamp.append(timestamp)
 
 
 class EnsembleVoter:
@@ -35,7 +101,7 @@ class EnsembleVoter:
     def __init__(self, config: VotingConfig = None):
         """Initialize ensemble voter."""
         self.config = config or VotingConfig()
-        self.voting_history = []
+        self.voting_history = _VotingHistory()
 
     def vote(self, signals: list[StrategySignal]) -> tuple[str, float]:
         """
@@ -58,14 +124,18 @@ class EnsembleVoter:
 
     def _majority_vote(self, signals: list[StrategySignal]) -> tuple[str, float]:
         """Simple majority voting."""
-        votes = [s.signal for s in signals]
-        vote_counts = Counter(votes)
-
-        total_votes = len(votes)
-        most_common = vote_counts.most_common(1)[0]
-
-        signal = most_common[0]
-        confidence = most_common[1] / total_votes
+        counts = [0, 0, 0]
+        first = [0, 0, 0]  # position of each signal's first vote
+        for i, s in enumerate(signals):
+            idx = _SIG2IDX[s.signal]
+            if not counts[idx]:
+                first[idx] = i
+            counts[idx] += 1
+
+        # Ties go to the signal voted first, as Counter.most_common did
+        idx = max((j for j in range(3) if counts[j]), key=lambda j: (counts[j], -first[j]))
+        signal = _IDX2SIG[idx]
+        confidence = counts[idx] / len(signals)
 
         if confidence < self.config.min_agreement:
             return "hold", confidence
@@ -76,24 +146,24 @@ class EnsembleVoter:
         """Weighted voting based on strategy weights."""
         weights = self.config.weights or {}
 
-        vote_weights = {"buy": 0, "sell": 0, "hold": 0}
-        total_weight = 0
+        vote_weights = [0.0, 0.0, 0.0]
+        total_weight = 0.0
 
         for signal in signals:
             weight = weights.get(signal.strategy_name, 1.0)
-            vote_weights[signal.signal] += weight * signal.confidence
+            vote_weights[_SIG2IDX[signal.signal]] += weight * signal.confidence
             total_weight += weight
 
         if total_weight == 0:
             return "hold", 0.0
 
         # Normalize weights
-        for key in vote_weights:
-            vote_weights[key] /= total_weight
+        vote_weights = [w / total_weight for w in vote_weights]
 
         # Get signal with highest weight
-        final_signal = max(vote_weights, key=vote_weights.get)
-        confidence = vote_weights[final_signal]
+        idx = vote_weights.index(max(vote_weights))
+        final_signal = _IDX2SIG[idx]
+        confidence = vote_weights[idx]
 
         if confidence < self.config.confidence_threshold:
             return "hold", confidence
@@ -102,24 +172,24 @@ class EnsembleVoter:
 
     def _confidence_vote(self, signals: list[StrategySignal]) -> tuple[str, float]:
         """Vote based on confidence scores."""
-        confidence_sums = {"buy": 0, "sell": 0, "hold": 0}
-        confidence_counts = {"buy": 0, "sell": 0, "hold": 0}
+        confidence_sums = [0.0, 0.0, 0.0]
+        confidence_counts = [0, 0, 0]
 
         for signal in signals:
-            confidence_sums[signal.signal] += signal.confidence
-            confidence_counts[signal.signal] += 1
+            idx = _SIG2IDX[signal.signal]
+            confidence_sums[idx] += signal.confidence
+            confidence_counts[idx] += 1
 
         # Calculate average confidence per signal
-        avg_confidence = {}
-        for sig in confidence_sums:
-            if confidence_counts[sig] > 0:
-                avg_confidence[sig] = confidence_sums[sig] / confidence_counts[sig]
-            else:
-                avg_confidence[sig] = 0
+        avg_confidence = [
+            total / count if count else 0.0
+            for total, count in zip(confidence_sums, confidence_counts, strict=True)
+        ]
 
         # Get signal with highest average confidence
-        final_signal = max(avg_confidence, key=avg_confidence.get)
-        confidence = avg_confidence[final_signal]
+        idx = avg_confidence.index(max(avg_confidence))
+        final_signal = _IDX2SIG[idx]
+        confidence = avg_confidence[idx]
 
         if confidence < self.config.confidence_threshold:
             return "hold", confidence
@@ -128,44 +198,121 @@ class EnsembleVoter:
 
     def record_outcome(self, signals: list[StrategySignal], actual_outcome: str, profit: float):
         """Record voting outcome for analysis."""
-        self.voting_history.append(
-            {
-                "signals": signals,
-                "outcome": actual_outcome,
-                "profit": profit,
-                "timestamp": pd.Timestamp.now(),
-            }
-        )
+        self.voting_history.append(signals, actual_outcome, profit, time.time_ns())
+
+    def _replay_votes(self) -> np.ndarray:
+        """Re-run `vote()` over every recorded entry at once; returns signal indices."""
+        hist = self.voting_history
+        n = len(hist)
+        rec = np.asarray(hist.record, dtype=np.intp)
+        conf = np.asarray(hist.confidence, dtype=np.float64)
+        # Flat (record, signal) slot per vote so bincount fills an (n, 3) table
+        slot = rec * 3 + np.asarray(hist.signal, dtype=np.intp)
+        n_signals = np.bincount(rec, minlength=n)
+
+        method = self.config.voting_method
+        if method == "weighted":
+            weights = self.config.weights or {}
+            by_code = np.array(
+                [weights.get(name, 1.0) for name in hist.strategy_codes], dtype=np.float64
+            )
+            w = by_code[np.asarray(hist.strategy, dtype=np.intp)]
+            sums = np.bincount(slot, weights=w * conf, minlength=n * 3).reshape(n, 3)
+            total = np.bincount(rec, weights=w, minlength=n)
+            valid = total != 0
+            scores = np.divide(sums, total[:, None], out=np.zeros_like(sums), where=valid[:, None])
+            threshold = self.config.confidence_threshold
+            best = scores.argmax(axis=1)
+        elif method == "confidence":
+            sums = np.bincount(slot, weights=conf, minlength=n * 3).reshape(n, 3)
+            counts = np.bincount(slot, minlength=n * 3).reshape(n, 3)
+            scores = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+            valid = n_signals > 0
+            threshold = self.config.confidence_threshold
+            best = scores.argmax(axis=1)
+        else:  # majority, and the fallback for unknown methods as in vote()
+            counts = np.bincount(slot, minlength=n * 3).reshape(n, 3)
+            valid = n_signals > 0
+            scores = counts / np.maximum(n_signals, 1)[:, None]
+            threshold = self.config.min_agreement
+            # Tied counts go to the signal voted first in the record, as in _majority_vote;
+            # votes are stored in order, so the first flat index of a slot is its first vote
+            first = np.full(n * 3, len(slot), dtype=np.intp)
+            seen, first_idx = np.unique(slot, return_index=True)
+            first[seen] = first_idx
+            first = first.reshape(n, 3)
+            tied = counts == counts.max(axis=1, keepdims=True)
+            best = np.where(tied, first, len(slot)).argmin(axis=1)
+
+        best_score = scores[np.arange(n), best]
+        return np.where(valid & (best_score >= threshold), best, _SIG2IDX["hold"])
 
     def analyze_performance(self) -> dict:
         """Analyze ensemble performance."""
         if not self.voting_history:
             return {}
 
-        correct_predictions = 0
-        total_profit = 0
-
-        for record in self.voting_history:
-            voted_signal, _ = self.vote(record["signals"])
-            if voted_signal == record["outcome"]:
-                correct_predictions += 1
-            total_profit += record["profit"]
+        n = len(self.voting_history)
+        voted = self._replay_votes()
+        correct_predictions = int(np.count_nonzero(voted == self.voting_history.outcome))
+        total_profit = sum(self.voting_history.profit)
 
         return {
-            "accuracy": correct_predictions / len(self.voting_history),
+            "accuracy": correct_predictions / n,
             "total_profit": total_profit,
-            "avg_profit": total_profit / len(self.voting_history),
-            "total_votes": len(self.voting_history),
+            "avg_profit": total_profit / n,
+            "total_votes": n,
         }
 
 
+class _RollingStats:
+    """Mean/std of the last `window` samples, updated in O(1) per sample (Welford)."""
+
+    __slots__ = ("values", "mean", "m2")
+
+    def __init__(self, window: int):
+        self.values: deque[float] = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+
+    def add(self, x: float) -> None:
+        """Append a sample, subtracting the evicted one once the window is full."""
+        values = self.values
+        if len(values) == values.maxlen:
+            old = values[0]
+            values.append(x)
+            old_mean = self.mean
+            delta = x - old
+            self.mean += delta / len(values)
+            self.m2 += delta * (x - self.mean + old - old_mean)
+        else:
+            values.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(values)
+            self.m2 += delta * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (matches np.std default)."""
+        n = len(self.values)
+        return math.sqrt(max(self.m2, 0.0) / n) if n else 0.0
+
+
 class AdaptiveEnsemble:
     """Adaptive ensemble that adjusts weights based on performance."""
 
-    def __init__(self, initial_weights: dict[str, float] | None = None):
-        """Initialize adaptive ensemble."""
+    def __init__(self, initial_weights: dict[str, float] | None = None, lookback: int = 100):
+        """Initialize adaptive ensemble.
+
+        Args:
+            initial_weights: Starting per-strategy weights
+            lookback: Number of recent profits kept per strategy for rebalancing (>= 1)
+        """
+        if lookback < 1:
+            raise ValueError(f"lookback must be at least 1, got {lookback}")
         self.weights = initial_weights or {}
-        self.performance_history = {}
+        self.lookback = lookback
+        self.performance_history: dict[str, _RollingStats] = {}
         self.voter = EnsembleVoter(VotingConfig(weights=self.weights))
 
     def update_weights(self, strategy_performances: dict[str, float]):
@@ -179,7 +326,7 @@ class AdaptiveEnsemble:
 
         # Update voter config
         self.voter.config.weights = self.weights
-        logger.info(f"Updated ensemble weights: {self.weights}")
+        logger.info("Updated ensemble weights: %s", self.weights)
 
     def adaptive_vote(self, signals: list[StrategySignal]) -> tuple[str, float]:
         """Vote with adaptive weights."""
@@ -187,22 +334,38 @@ class AdaptiveEnsemble:
 
     def track_performance(self, strategy_name: str, profit: float):
         """Track individual strategy performance."""
-        if strategy_name not in self.performance_history:
-            self.performance_history[strategy_name] = []
+        stats = self.performance_history.get(strategy_name)
+        if stats is None:
+            stats = self.performance_history[strategy_name] = _RollingStats(self.lookback)
 
-        self.performance_history[strategy_name].append(profit)
+        stats.add(profit)
 
-    def rebalance_weights(self, lookback: int = 100):
-        """Rebalance weights based on recent performance."""
-        strategy_performances = {}
+    def rebalance_weights(self, lookback: int | None = None):
+        """Rebalance weights based on recent performance.
 
-        for strategy, profits in self.performance_history.items():
-            recent_profits = profits[-lookback:] if len(profits) > lookback else profits
+        Uses the running window stats; a `lookback` shorter than the ensemble's
+        window recomputes over that tail. Only the last `self.lookback` profits are
+        kept, so longer values are capped at the window with a warning.
+        """
+        if lookback is not None and lookback > self.lookback:
+            logger.warning(
+                "rebalance_weights lookback %d exceeds the ensemble window %d; using %d",
+                lookback,
+                self.lookback,
+                self.lookback,
+            )
+        strategy_performances = {}
 
-            if recent_profits:
+        for strategy, stats in self.performance_history.items():
+            if stats.values:
                 # Calculate Sharpe-like metric
-                avg_profit = np.mean(recent_profits)
-                std_profit = np.std(recent_profits)
+                if lookback is not None and lookback < len(stats.values):
+                    recent_profits = list(stats.values)[-lookback:]
+                    avg_profit = np.mean(recent_profits)
+                    std_profit = np.std(recent_profits)
+                else:
+                    avg_profit = stats.mean
+                    std_profit = stats.std
 
                 if std_profit > 0:
                     performance = avg_profit / std_profit
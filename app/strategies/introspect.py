@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import ast
+import os
 import re
 from collections.abc import Iterable
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 from typing import Any
 
@@ -46,12 +47,18 @@ class StrategyInfo:
     docstring: str | None
 
 
+# Single alternation pass instead of one regex search per keyword
+_INDICATOR_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, INDICATOR_KEYWORDS)) + r")\b", flags=re.IGNORECASE
+)
+
+# Parsed results per path, stamped with (mtime_ns, size); an edited file replaces its
+# entry, so the cache holds at most one result per strategy file
+_PARSE_CACHE: dict[str, tuple[tuple[int, int], list[StrategyInfo]]] = {}
+
+
 def _indicator_scan(text: str) -> list[str]:
-    found = set()
-    for kw in INDICATOR_KEYWORDS:
-        if re.search(rf"\b{re.escape(kw)}\b", text, flags=re.IGNORECASE):
-            found.add(kw.upper())
-    return sorted(found)
+    return sorted({m.group(1).upper() for m in _INDICATOR_RE.finditer(text)})
 
 
 def _get_name_from_node(node: ast.AST) -> str | None:
@@ -63,10 +70,38 @@ def _get_name_from_node(node: ast.AST) -> str | None:
 
 
 def parse_strategy_file(path: Path) -> list[StrategyInfo]:
-    src = path.read_text(encoding="utf-8")
+    return _parse_cached(path, path.stat())
+
+
+def _parse_cached(path: Path, st: os.stat_result) -> list[StrategyInfo]:
+    key = str(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    entry = _PARSE_CACHE.get(key)
+    if entry is None or entry[0] != stamp:
+        entry = _PARSE_CACHE[key] = (stamp, _parse_strategy_source(path))
+    # Callers get their own copies; the cached objects are never handed out
+    return [_copy_info(info) for info in entry[1]]
+
+
+def _copy_info(info: StrategyInfo) -> StrategyInfo:
+    return replace(
+        info,
+        parameters=[replace(p) for p in info.parameters],
+        indicators=list(info.indicators),
+    )
+
+
+def _parse_strategy_source(path: Path) -> list[StrategyInfo]:
+    raw = path.read_bytes()
+    # Cheap substring filters: no strategy class means nothing to parse
+    if b"Strategy" not in raw:
+        return []
+    has_params = PARAMETER_SUFFIX.encode() in raw
+    src = raw.decode("utf-8")
     tree = ast.parse(src)
 
     results: list[StrategyInfo] = []
+    indicators: list[str] | None = None  # file-level; scanned once, on first strategy class
 
     for node in tree.body:
         if isinstance(node, ast.ClassDef):
@@ -90,6 +125,8 @@ def parse_strategy_file(path: Path) -> list[StrategyInfo]:
                                 timeframe = stmt.value.value
 
                     # parameter = <Something>Parameter(...)
+                    if not has_params:
+                        continue
                     for target in stmt.targets:
                         if isinstance(target, ast.Name):
                             if isinstance(stmt.value, ast.Call):
@@ -97,7 +134,8 @@ def parse_strategy_file(path: Path) -> list[StrategyInfo]:
                                 if func_name and func_name.endswith(PARAMETER_SUFFIX):
                                     params.append(ParameterInfo(name=target.id, kind=func_name))
 
-            indicators = _indicator_scan(src)
+            if indicators is None:
+                indicators = _indicator_scan(src)
             doc = ast.get_docstring(node)
             results.append(
                 StrategyInfo(
@@ -105,7 +143,7 @@ def parse_strategy_file(path: Path) -> list[StrategyInfo]:
                     file_path=str(path),
                     timeframe=timeframe,
                     parameters=params,
-                    indicators=indicators,
+                    indicators=list(indicators),
                     docstring=doc,
                 )
             )
@@ -115,9 +153,17 @@ def parse_strategy_file(path: Path) -> list[StrategyInfo]:
 
 def discover_strategies(base_dir: Path) -> list[StrategyInfo]:
     items: list[StrategyInfo] = []
-    for p in sorted(base_dir.glob("*.py")):
+    # scandir yields names and file types without a Path object + stat per glob hit
+    try:
+        with os.scandir(base_dir) as it:
+            entries = sorted(
+                (e for e in it if e.name.endswith(".py") and e.is_file()), key=lambda e: e.name
+            )
+    except FileNotFoundError:
+        return items  # same as globbing a missing directory
+    for e in entries:
         try:
-            items.extend(parse_strategy_file(p))
+            items.extend(_parse_cached(Path(e.path), e.stat()))
         except Exception:
             # Keep robust: skip files that fail to parse
             continue
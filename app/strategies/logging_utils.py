@@ -1,64 +1,194 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import json
 import logging
+import logging.handlers
+import math
 import os
+import queue
+import threading
 from datetime import datetime, timezone
+from json.encoder import encode_basestring as _escape
 from pathlib import Path
 from typing import Any
 
-_LOG_STD_KEYS = {
-    "name",
-    "msg",
-    "args",
-    "levelname",
-    "levelno",
-    "pathname",
-    "filename",
-    "module",
-    "exc_info",
-    "exc_text",
-    "stack_info",
-    "lineno",
-    "funcName",
-    "created",
-    "msecs",
-    "relativeCreated",
-    "thread",
-    "threadName",
-    "processName",
-    "process",
-    "asctime",
-}
+try:  # optional fast path: orjson encodes straight to UTF-8 bytes
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+if orjson is not None:
+
+    def _dumps(obj: Any) -> str:
+        try:
+            # OPT_NON_STR_KEYS keeps parity with json.dumps for int/float dict keys
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # json also encodes ints wider than 64 bits; let it decide
+            return json.dumps(obj, ensure_ascii=False)
+
+else:
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
+_LOG_STD_KEYS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "asctime",
+        "message",  # set by logging.Formatter.format when another handler ran first
+        "taskName",  # Python 3.12+
+    }
+)
+
+_JSON_SCALARS = (str, int, float, bool)
+
+
+def _is_flat_json(v: list[Any] | dict[Any, Any]) -> bool:
+    """Return True for depth-1 containers holding only JSON scalars (and str keys)."""
+    if isinstance(v, dict):
+        if not all(isinstance(k, str) for k in v):
+            return False
+        items = v.values()
+    else:
+        items = v
+    return all(x is None or isinstance(x, _JSON_SCALARS) for x in items)
 
 
 class JsonFormatter(logging.Formatter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted record
+        self._ts_prefix: tuple[int, str] = (-1, "")
+
+    def _iso_ts(self, created: float) -> str:
+        """UTC ISO-8601 timestamp of `created`, reusing the per-second prefix."""
+        # Same rounding as datetime.fromtimestamp
+        frac, whole = math.modf(created)
+        sec, us = int(whole), round(frac * 1_000_000)
+        if us >= 1_000_000:
+            sec, us = sec + 1, us - 1_000_000
+        cached_sec, prefix = self._ts_prefix
+        if sec != cached_sec:
+            prefix = datetime.fromtimestamp(sec, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._ts_prefix = (sec, prefix)
+        # Same shape as datetime.isoformat(): fraction omitted when zero
+        return f"{prefix}.{us:06d}+00:00" if us else f"{prefix}+00:00"
+
     def format(self, record: logging.LogRecord) -> str:
-        now = datetime.now(tz=timezone.utc).isoformat()
+        now = self._iso_ts(record.created)
+        extras = record.__dict__.keys() - _LOG_STD_KEYS
+        if not extras:
+            # Fixed-shape payload: plain string assembly beats a full encode
+            return (
+                f'{{"ts":"{now}","level":{_escape(record.levelname)},'
+                f'"logger":{_escape(record.name)},"message":{_escape(record.getMessage())}}}'
+            )
         payload: dict[str, Any] = {
             "ts": now,
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-        # Include any extra fields that are simple JSON types
-        for k, v in record.__dict__.items():
-            if k in _LOG_STD_KEYS:
-                continue
+        # Include any extra fields that are simple JSON types; the key-set
+        # difference above skips the ~20 standard LogRecord attributes in one pass.
+        for k in sorted(extras):
             if k.startswith("_"):
                 continue
+            v = record.__dict__[k]
             # Filter to basic JSON-serializable scalars/containers
-            if isinstance(v, (str, int, float, bool)) or v is None:
+            if isinstance(v, _JSON_SCALARS) or v is None:
                 payload[k] = v
             elif isinstance(v, (list, dict)):
+                # Flat containers of scalars need no probe
+                if _is_flat_json(v):
+                    payload[k] = v
+                    continue
                 # Best-effort: include if JSON serializable
                 try:
-                    json.dumps(v)
+                    _dumps(v)
                 except Exception:
                     continue
                 else:
                     payload[k] = v
-        return json.dumps(payload, ensure_ascii=False)
+        return _dumps(payload)
+
+
+class _PreformattedFormatter(logging.Formatter):
+    """Emit the line already rendered by the producer-side QueueHandler."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return record.getMessage()
+
+
+# One background writer per log file: producers only enqueue records
+_FILE_QUEUES: dict[str, tuple[queue.SimpleQueue, logging.handlers.QueueListener]] = {}
+_FILE_QUEUES_LOCK = threading.Lock()
+
+
+def _file_queue(path: Path) -> queue.SimpleQueue:
+    """Return the record queue for `path`, starting its QueueListener on first use."""
+    key = str(path.resolve())
+    with _FILE_QUEUES_LOCK:
+        entry = _FILE_QUEUES.get(key)
+        if entry is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(path, encoding="utf-8")
+            file_handler.setFormatter(_PreformattedFormatter())
+            q: queue.SimpleQueue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(q, file_handler)
+            listener.start()
+            entry = _FILE_QUEUES[key] = (q, listener)
+        return entry[0]
+
+
+@atexit.register
+def _stop_file_listeners() -> None:
+    """Flush queued records to disk and close the log files."""
+    with _FILE_QUEUES_LOCK:
+        entries = list(_FILE_QUEUES.values())
+        _FILE_QUEUES.clear()
+    for _, listener in entries:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+
+
+# Logging env settings are read once per process; see _refresh_env()
+_LOG_TO_FILE = False
+_LOG_FILE = Path("user_data/logs/bot.jsonl")
+_CID: str | None = None
+
+
+def _refresh_env() -> None:
+    """Re-read logging env vars (e.g. after tests patch them) and drop cached adapters."""
+    global _LOG_TO_FILE, _LOG_FILE, _CID
+    _LOG_TO_FILE = os.getenv("LOG_JSON_TO_FILE", "").strip().lower() in {"1", "true", "yes"}
+    _LOG_FILE = Path(os.getenv("LOG_FILE", "user_data/logs/bot.jsonl"))
+    _CID = os.getenv("CORRELATION_ID", "").strip() or None
+    _cached_adapter.cache_clear()
 
 
 def get_json_logger(
@@ -70,27 +200,53 @@ def get_json_logger(
 ) -> logging.LoggerAdapter:
     """Create or fetch a JSON logger with optional file output and static fields.
 
-    Env overrides (used only when `log_path` is None):
+    Env overrides (read once at import; used only when `log_path` is None):
       - LOG_JSON_TO_FILE: when truthy ("1", "true", "yes"), log to a file.
       - LOG_FILE: path to JSONL log file (default: "user_data/logs/bot.jsonl").
 
-    Returns a LoggerAdapter that injects `static_fields` into each record.
+    Returns a LoggerAdapter that injects `static_fields` into each record. The level
+    and handler setup are applied on every call (the last caller's level wins); the
+    adapter itself is cached per (logger, fields) when all field values are hashable.
     """
+    # Inject correlation_id from env if available and not explicitly set
+    fields = dict(static_fields or {})
+    if _CID and "correlation_id" not in fields:
+        fields["correlation_id"] = _CID
+
+    logger = _configure_logger(name, log_path, level)
+    try:
+        # The value's type is part of the key: True == 1 == 1.0 would share an adapter
+        return _cached_adapter(logger, frozenset((k, type(v), v) for k, v in fields.items()))
+    except TypeError:
+        # Unhashable static field values: build an uncached adapter
+        return logging.LoggerAdapter(logger, extra=fields)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_adapter(
+    logger: logging.Logger, fields: frozenset[tuple[str, type, Any]]
+) -> logging.LoggerAdapter:
+    return logging.LoggerAdapter(logger, extra={k: v for k, _, v in fields})
+
+
+def _configure_logger(name: str, log_path: Path | None, level: int) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(level)
+    # setLevel clears the logging manager's level cache under its lock; skip no-ops
+    if logger.level != level:
+        logger.setLevel(level)
 
     # Avoid duplicate handlers: add only if empty
     if not logger.handlers:
         effective_log_path = log_path
-        if effective_log_path is None:
+        if effective_log_path is None and _LOG_TO_FILE:
             # Env-driven file logging
-            _to_file = os.getenv("LOG_JSON_TO_FILE", "").strip().lower() in {"1", "true", "yes"}
-            if _to_file:
-                effective_log_path = Path(os.getenv("LOG_FILE", "user_data/logs/bot.jsonl"))
+            effective_log_path = _LOG_FILE
 
         if effective_log_path is not None:
-            effective_log_path.parent.mkdir(parents=True, exist_ok=True)
-            handler: logging.Handler = logging.FileHandler(effective_log_path, encoding="utf-8")
+            # Render JSON in the caller's thread; a background listener does the disk I/O
+            handler: logging.Handler = logging.handlers.QueueHandler(
+                _file_queue(effective_log_path)
+            )
         else:
             handler = logging.StreamHandler()
         handler.setLevel(level)
@@ -98,13 +254,10 @@ def get_json_logger(
         logger.addHandler(handler)
         logger.propagate = False  # stay self-contained
 
-    # Inject correlation_id from env if available and not explicitly set
-    fields = dict(static_fields or {})
-    _cid = os.getenv("CORRELATION_ID", "").strip()
-    if _cid and "correlation_id" not in fields:
-        fields["correlation_id"] = _cid
-    adapter = logging.LoggerAdapter(logger, extra=fields)
-    return adapter
+    return logger
+
+
+_refresh_env()
 
 
 def get_context_logger(
@@ -1,83 +1,194 @@
 from __future__ import annotations
 
+import bisect
 import hashlib
 import json
+import logging
+import mmap
+import multiprocessing
+import os
 import re
 import time
 import uuid
 import zipfile
-from dataclasses import dataclass
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from decimal import Decimal
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+import numpy as np
 
 from .logging_utils import get_json_logger
-from .persistence.sqlite import connect, ensure_schema
+from .persistence.sqlite import apply_bulk_write_pragmas, connect, ensure_schema
 
 UTC = timezone.utc
 
+# Per-op loggers built once at import; the upsert helpers run per row
+_LOG_PARSE_META = get_json_logger("metrics", static_fields={"op": "parse_backtest_meta"})
+_LOG_UPSERT_EXPERIMENT = get_json_logger("metrics", static_fields={"op": "_upsert_experiment"})
+_LOG_UPSERT_RUN = get_json_logger("metrics", static_fields={"op": "_upsert_run"})
+_LOG_UPSERT_RUNS_MANY = get_json_logger("metrics", static_fields={"op": "_upsert_runs_many"})
+_LOG_UPSERT_METRICS_MANY = get_json_logger("metrics", static_fields={"op": "_upsert_metrics_many"})
+_LOG_UPSERT_ARTIFACT = get_json_logger("metrics", static_fields={"op": "_upsert_artifact"})
+_LOG_VALIDATE_BACKTEST = get_json_logger(
+    "metrics", static_fields={"op": "_validate_backtest_payload"}
+)
+_LOG_VALIDATE_TRIAL = get_json_logger("metrics", static_fields={"op": "_validate_hyperopt_trial"})
+
+_file_digest = getattr(hashlib, "file_digest", None)  # Python 3.11+
+
+try:  # optional fast JSON parsing for meta files, zip summaries and trials
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+_FTHYPT_READ_BUFFER = 1 << 20
+
+# strategy_<Class>_<YYYY-MM-DD>_<HH-MM-SS>.fthypt
+_FTHYPT_TS_RE = re.compile(r"_(\d{4}-\d{2}-\d{2})_(\d{2}-\d{2}-\d{2})\.fthypt$")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts NaN/Infinity and arbitrarily large ints; let it decide
+            pass
+    return json.loads(data)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BacktestMeta:
     strategy_class: str
     run_id: str
     timeframe: str | None
     start_ts: int | None
     end_ts: int | None
+    # Derived once at construction; read several times per indexed run
+    start_iso: str | None = field(init=False, default=None)
+    end_iso: str | None = field(init=False, default=None)
 
-    @property
-    def start_iso(self) -> str | None:
-        if self.start_ts is None:
-            return None
-        return datetime.fromtimestamp(self.start_ts, tz=UTC).isoformat()
+    def __post_init__(self) -> None:
+        if self.start_ts is not None:
+            object.__setattr__(self, "start_iso", _utc_iso(self.start_ts))
+        if self.end_ts is not None:
+            object.__setattr__(self, "end_iso", _utc_iso(self.end_ts))
 
-    @property
-    def end_iso(self) -> str | None:
-        if self.end_ts is None:
-            return None
-        return datetime.fromtimestamp(self.end_ts, tz=UTC).isoformat()
 
+def _utc_iso(ts: float) -> str:
+    """ISO 8601 UTC string, identical to datetime.fromtimestamp(ts, tz=UTC).isoformat()."""
+    if type(ts) is int:
+        # Whole seconds: format the gmtime fields directly, no datetime/tzinfo objects
+        return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(ts))
+    return datetime.fromtimestamp(ts, tz=UTC).isoformat()
 
-def _sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
-    h = hashlib.sha256()
+
+def _sha256_file(path: Path) -> str:
     with path.open("rb") as f:
-        while True:
-            chunk = f.read(chunk_size)
-            if not chunk:
-                break
+        return _sha256_fileobj(f)
+
+
+# Known artifact hashes by path: (size_bytes, mtime_ns, sha256)
+_ShaCache = dict[str, tuple[int, int, str]]
+
+
+def _sha256_cached(path: Path, known: _ShaCache | None = None) -> tuple[str, int, int]:
+    """Return (sha256, size, mtime_ns), reusing a known hash when size and mtime match."""
+    st = path.stat()
+    hit = known.get(str(path)) if known else None
+    if hit is not None and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+        return hit[2], st.st_size, st.st_mtime_ns
+    return _sha256_file(path), st.st_size, st.st_mtime_ns
+
+
+def _load_sha_cache(cur) -> _ShaCache:
+    rows = cur.execute(
+        "SELECT path, size_bytes, mtime_ns, sha256 FROM artifacts"
+        " WHERE size_bytes IS NOT NULL AND mtime_ns IS NOT NULL AND sha256 != ''"
+    )
+    return {path: (size, mtime, sha) for path, size, mtime, sha in rows}
+
+
+def _sha256_fileobj(f: BinaryIO) -> str:
+    # file_digest (3.11+) hashes in C with a reusable buffer; on 3.10 mmap the file so
+    # the whole content is handed to OpenSSL in one call
+    if _file_digest is not None:
+        return _file_digest(f, "sha256").hexdigest()
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+    except (AttributeError, OSError, ValueError):
+        # not a real file (zip member) or empty file: plain chunked read
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
 
 
 def parse_backtest_meta(meta_path: Path) -> BacktestMeta | None:
-    logger = get_json_logger("metrics", static_fields={"op": "parse_backtest_meta"})
+    meta, warning = _read_backtest_meta(meta_path)
+    if warning is not None:
+        _LOG_PARSE_META.warning(warning[0], extra=warning[1])
+    return meta
+
+
+def _read_backtest_meta(
+    meta_path: Path,
+) -> tuple[BacktestMeta | None, tuple[str, dict[str, Any]] | None]:
+    """Parse a meta file without logging; returns (meta, (warning_msg, extra) | None)."""
     try:
-        data = json.loads(meta_path.read_text(encoding="utf-8"))
+        data = _loads(meta_path.read_bytes())
     except Exception as e:
-        logger.warning("meta_parse_error", extra={"path": str(meta_path), "error": str(e)})
-        return None
+        return None, ("meta_parse_error", {"path": str(meta_path), "error": str(e)})
 
     if not isinstance(data, dict) or not data:
-        return None
+        return None, None
 
     # Structure observed: {"ClassName": { ... entries ... }}
-    strat_class = next(iter(data.keys()))
+    strat_class = next(iter(data))
     payload = data[strat_class]
 
     # Optional validation via Pydantic if available
     _ok, _reason = _validate_backtest_payload(payload)
     if not _ok:
-        logger.warning("meta_validation_failed", extra={"path": str(meta_path), "reason": _reason})
-        return None
+        return None, ("meta_validation_failed", {"path": str(meta_path), "reason": _reason})
 
-    return BacktestMeta(
+    meta = BacktestMeta(
         strategy_class=str(strat_class),
         run_id=str(payload.get("run_id")) if payload.get("run_id") else meta_path.stem,
         timeframe=payload.get("timeframe"),
         start_ts=payload.get("backtest_start_ts"),
         end_ts=payload.get("backtest_end_ts"),
     )
+    return meta, None
+
+
+# Upsert statements are module constants: the same str object is passed on every call,
+# so sqlite3's per-connection statement cache reuses the prepared statement.
+_EXPERIMENT_UPSERT_SQL = """
+    INSERT INTO experiments (
+        id, idea_id, strategy_id, hypothesis, timeframe, markets, period_start_utc, period_end_utc, seed, config_hash, created_utc
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, datetime('now'))
+    ON CONFLICT(id) DO UPDATE SET
+        timeframe=excluded.timeframe,
+        period_start_utc=excluded.period_start_utc,
+        period_end_utc=excluded.period_end_utc,
+        config_hash=excluded.config_hash
+"""
+
+_ARTIFACT_UPSERT_SQL = """
+    INSERT INTO artifacts (run_id, name, path, sha256, size_bytes, mtime_ns)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(run_id, name) DO UPDATE SET
+        path=excluded.path,
+        sha256=excluded.sha256,
+        size_bytes=excluded.size_bytes,
+        mtime_ns=excluded.mtime_ns
+"""
 
 
 def _upsert_experiment(
@@ -90,19 +201,11 @@ def _upsert_experiment(
     end_iso: str | None,
     config_hash: str | None = None,
 ) -> None:
-    logger = get_json_logger("metrics", static_fields={"op": "_upsert_experiment"})
-    logger.debug("upserting_experiment", extra={"exp_id": exp_id, "strategy_id": strategy_id})
+    logger = _LOG_UPSERT_EXPERIMENT
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("upserting_experiment", extra={"exp_id": exp_id, "strategy_id": strategy_id})
     cur.execute(
-        """
-        INSERT INTO experiments (
-            id, idea_id, strategy_id, hypothesis, timeframe, markets, period_start_utc, period_end_utc, seed, config_hash, created_utc
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, datetime('now'))
-        ON CONFLICT(id) DO UPDATE SET
-            timeframe=excluded.timeframe,
-            period_start_utc=excluded.period_start_utc,
-            period_end_utc=excluded.period_end_utc,
-            config_hash=excluded.config_hash
-        """,
+        _EXPERIMENT_UPSERT_SQL,
         (
             exp_id,
             idea_id,
@@ -117,6 +220,21 @@ def _upsert_experiment(
     )
 
 
+_RUN_UPSERT_SQL = """
+    INSERT INTO runs (
+        id, experiment_id, kind, started_utc, finished_utc, status, docker_image, freqtrade_version, config_json, data_window, artifacts_path
+    ) VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, NULL, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        experiment_id=excluded.experiment_id,
+        kind=excluded.kind,
+        started_utc=excluded.started_utc,
+        finished_utc=excluded.finished_utc,
+        status=excluded.status,
+        data_window=excluded.data_window,
+        artifacts_path=excluded.artifacts_path
+"""
+
+
 def _upsert_run(
     cur,
     run_id: str,
@@ -128,22 +246,11 @@ def _upsert_run(
     artifacts_path: str | None,
     data_window: str | None = None,
 ) -> None:
-    logger = get_json_logger("metrics", static_fields={"op": "_upsert_run"})
-    logger.debug("upserting_run", extra={"run_id": run_id, "kind": kind, "status": status})
+    logger = _LOG_UPSERT_RUN
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("upserting_run", extra={"run_id": run_id, "kind": kind, "status": status})
     cur.execute(
-        """
-        INSERT INTO runs (
-            id, experiment_id, kind, started_utc, finished_utc, status, docker_image, freqtrade_version, config_json, data_window, artifacts_path
-        ) VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, NULL, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-            experiment_id=excluded.experiment_id,
-            kind=excluded.kind,
-            started_utc=excluded.started_utc,
-            finished_utc=excluded.finished_utc,
-            status=excluded.status,
-            data_window=excluded.data_window,
-            artifacts_path=excluded.artifacts_path
-        """,
+        _RUN_UPSERT_SQL,
         (
             run_id,
             experiment_id,
@@ -157,38 +264,89 @@ def _upsert_run(
     )
 
 
+# Rows buffered before a metrics executemany() flush in the indexers
+_METRIC_FLUSH_ROWS = 10_000
+
+# Rows per multi-row VALUES statement: 300 bound parameters, well under SQLite's
+# variable limit (999 before 3.32), and enough to amortize per-statement VDBE overhead
+_METRIC_VALUES_ROWS = 100
+
+# Stored metric precision. The column is REAL (IEEE-754 double), so a float round()
+# gives the same 8-decimal values a Decimal quantize did, without the str/Decimal trip.
+_METRIC_DECIMALS = 8
+
+
+def _upsert_runs_many(cur, rows: list[tuple[str, ...]]) -> None:
+    """Flush buffered run rows (in _RUN_UPSERT_SQL parameter order) and clear the buffer."""
+    if not rows:
+        return
+    logger = _LOG_UPSERT_RUNS_MANY
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("upserting_runs", extra={"rows": len(rows)})
+    cur.executemany(_RUN_UPSERT_SQL, rows)
+    rows.clear()
+
+
 def _upsert_metric(cur, run_id: str, key: str, value: float) -> None:
-    logger = get_json_logger("metrics", static_fields={"op": "_upsert_metric"})
-    logger.debug("upserting_metric", extra={"run_id": run_id, "key": key, "value": value})
-    # Use Decimal for monetary values to maintain precision
-    # Quantize to 8 decimal places to match the precision used in _parse_zip_metrics
-    # Only cast to float at the DB boundary as the schema uses REAL
-    decimal_value = Decimal(str(value)).quantize(Decimal("0.00000001"))
-    cur.execute(
-        """
-        INSERT INTO metrics (run_id, key, value)
-        VALUES (?, ?, ?)
-        ON CONFLICT(run_id, key) DO UPDATE SET
-            value=excluded.value
-        """,
-        (run_id, key, float(decimal_value)),
+    """Single-row form of `_upsert_metrics_many`."""
+    _upsert_metrics_many(cur, [(run_id, key, value)])
+
+
+@lru_cache(maxsize=8)
+def _metric_upsert_values_sql(n_rows: int) -> str:
+    """Metrics upsert with ``n_rows`` VALUES tuples; cached per row count."""
+    # Only "?" placeholders are interpolated; values are always bound
+    return (
+        "INSERT INTO metrics (run_id, key, value) VALUES "  # noqa: S608
+        + ",".join(["(?, ?, ?)"] * n_rows)
+        + " ON CONFLICT(run_id, key) DO UPDATE SET value=excluded.value"
     )
 
 
-def _upsert_artifact(cur, run_id: str, name: str, path: str, sha256: str | None) -> None:
-    logger = get_json_logger("metrics", static_fields={"op": "_upsert_artifact"})
-    logger.debug(
-        "upserting_artifact", extra={"run_id": run_id, "name": name, "sha256": sha256 or ""}
-    )
+def _upsert_metrics_many(cur, rows: list[tuple[str, str, float]]) -> None:
+    """Flush buffered (run_id, key, value) rows and clear the buffer.
+
+    Rows go out as multi-row VALUES statements of _METRIC_VALUES_ROWS rows each, so
+    SQLite steps one statement per block instead of one per row; the tail (fewer
+    rows than a block) is a single statement of its own size.
+    """
+    if not rows:
+        return
+    logger = _LOG_UPSERT_METRICS_MANY
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("upserting_metrics", extra={"rows": len(rows)})
+    params: list[Any] = []
+    for r, k, v in rows:
+        params += (r, k, round(v, _METRIC_DECIMALS))
+    width = 3 * _METRIC_VALUES_ROWS
+    full = len(params) - len(params) % width
+    if full:
+        cur.executemany(
+            _metric_upsert_values_sql(_METRIC_VALUES_ROWS),
+            [params[i : i + width] for i in range(0, full, width)],
+        )
+    if full < len(params):
+        cur.execute(_metric_upsert_values_sql((len(params) - full) // 3), params[full:])
+    rows.clear()
+
+
+def _upsert_artifact(
+    cur,
+    run_id: str,
+    name: str,
+    path: str,
+    sha256: str | None,
+    size_bytes: int | None = None,
+    mtime_ns: int | None = None,
+) -> None:
+    logger = _LOG_UPSERT_ARTIFACT
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "upserting_artifact", extra={"run_id": run_id, "name": name, "sha256": sha256 or ""}
+        )
     cur.execute(
-        """
-        INSERT INTO artifacts (run_id, name, path, sha256)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(run_id, name) DO UPDATE SET
-            path=excluded.path,
-            sha256=excluded.sha256
-        """,
-        (run_id, name, path, sha256 or ""),
+        _ARTIFACT_UPSERT_SQL,
+        (run_id, name, path, sha256 or "", size_bytes, mtime_ns),
     )
 
 
@@ -196,249 +354,440 @@ def _parse_zip_metrics(zip_path: Path) -> dict[str, float]:
     """Extract key metrics from a Freqtrade backtest ZIP.
 
     Looks for the main summary JSON inside the ZIP (excludes *_config.json and *_Strategy.json).
-    Returns a flat dict of metric_name -> float.
+    Returns a flat dict of metric_name -> float; the metrics part of `_process_zip`.
     """
-    out: dict[str, float] = {}
-    try:
-        with zipfile.ZipFile(zip_path) as zf:
-            # Find main JSON result
-            names = [
-                n
-                for n in zf.namelist()
-                if n.endswith(".json") and "_config" not in n and "_Strategy" not in n
-            ]
-            if not names:
-                return out
-            data = json.loads(zf.read(names[0]).decode("utf-8"))
-
-            # strategy section: {strategy_name: {...}}
-            strat = data.get("strategy")
-            if isinstance(strat, dict) and strat:
-                strat_name = next(iter(strat.keys()))
-                sd = strat.get(strat_name, {})
-                if isinstance(sd, dict):
-                    # Use Decimal for monetary values to maintain precision internally
-                    # Only cast to float at the end for DB storage
-                    monetary_keys = (
-                        "profit_total",
-                        "profit_total_abs",
-                        "profit_mean",
-                        "profit_median",
-                        "cagr",
-                        "expectancy",
-                        "expectancy_ratio",
-                        "market_change",
-                    )
+    return _process_zip(zip_path)[2]
 
-                    for k in monetary_keys:
-                        v = sd.get(k)
-                        if isinstance(v, (int, float)):
-                            # Use Decimal for precision, then convert to float for DB storage
-                            decimal_v = Decimal(str(v)).quantize(Decimal("0.00000001"))
-                            out[k] = float(decimal_v)
-
-                    # Non-monetary keys that can remain as regular floats
-                    for k in (
-                        "sortino",
-                        "sharpe",
-                        "calmar",
-                        "sqn",
-                        "profit_factor",
-                        "trades_per_day",
-                    ):
-                        v = sd.get(k)
-                        if isinstance(v, (int, float)):
-                            out[k] = float(v)
-
-                    # total_trades
-                    tt = sd.get("total_trades") or sd.get("trades")
-                    if isinstance(tt, (int, float)):
-                        out["trades"] = float(tt)
-
-            # strategy_comparison: list of per-strategy summaries
-            comp = data.get("strategy_comparison")
-            if isinstance(comp, list) and comp:
-                # pick matching strategy by 'key' if possible, else first
-                chosen = None
-                if isinstance(strat, dict) and strat:
-                    strat_name = next(iter(strat.keys()))
-                    for item in comp:
-                        if isinstance(item, dict) and item.get("key") == strat_name:
-                            chosen = item
-                            break
-                if chosen is None and isinstance(comp[0], dict):
-                    chosen = comp[0]
-                if isinstance(chosen, dict):
-                    # Use Decimal for monetary values to maintain precision internally
-                    # Only cast to float at the end for DB storage
-                    monetary_keys = (
-                        "profit_total",
-                        "profit_total_abs",
-                        "profit_mean",
-                        "profit_total_pct",
-                        "max_drawdown_account",
-                        "max_drawdown_abs",
-                    )
 
-                    for k in monetary_keys:
-                        v = chosen.get(k)
-                        if isinstance(v, (int, float)):
-                            # Use Decimal for precision, then convert to float for DB storage
-                            decimal_v = Decimal(str(v)).quantize(Decimal("0.00000001"))
-                            out[k] = float(decimal_v)
-
-                    # Non-monetary keys that can remain as regular floats
-                    for k in (
-                        "wins",
-                        "losses",
-                        "draws",
-                        "winrate",
-                        "duration_avg",
-                        "sortino",
-                        "sharpe",
-                        "calmar",
-                        "sqn",
-                        "profit_factor",
-                        "trades",
-                    ):
-                        v = chosen.get(k)
-                        if isinstance(v, (int, float)):
-                            out[k] = float(v)
+def _zip_json_members(zf: zipfile.ZipFile) -> tuple[str | None, str | None]:
+    """Return (config_json, summary_json) member names from a single central-directory pass.
+
+    ZipFile already holds the parsed directory; walking infolist() avoids building the
+    namelist() copy, and the walk stops as soon as both members are known.
+    """
+    cfg_name: str | None = None
+    summary_name: str | None = None
+    for info in zf.infolist():
+        n = info.filename
+        if not n.endswith(".json"):
+            continue
+        if n.endswith("_config.json"):
+            if cfg_name is None:
+                cfg_name = n
+        elif summary_name is None and "_config" not in n and "_Strategy" not in n:
+            summary_name = n
+        else:
+            continue
+        if cfg_name is not None and summary_name is not None:
+            break
+    return cfg_name, summary_name
+
+
+# Summary keys extracted from a backtest ZIP. Monetary values are rounded to the stored
+# metric precision; the rest are stored as plain floats.
+_STRAT_MONETARY_KEYS = (
+    "profit_total",
+    "profit_total_abs",
+    "profit_mean",
+    "profit_median",
+    "cagr",
+    "expectancy",
+    "expectancy_ratio",
+    "market_change",
+)
+_STRAT_NUMERIC_KEYS = ("sortino", "sharpe", "calmar", "sqn", "profit_factor", "trades_per_day")
+_COMP_MONETARY_KEYS = (
+    "profit_total",
+    "profit_total_abs",
+    "profit_mean",
+    "profit_total_pct",
+    "max_drawdown_account",
+    "max_drawdown_abs",
+)
+_COMP_NUMERIC_KEYS = (
+    "wins",
+    "losses",
+    "draws",
+    "winrate",
+    "duration_avg",
+    "sortino",
+    "sharpe",
+    "calmar",
+    "sqn",
+    "profit_factor",
+    "trades",
+)
+
+
+def _collect_numeric(
+    src: dict[str, Any],
+    monetary_keys: tuple[str, ...],
+    numeric_keys: tuple[str, ...],
+    out: dict[str, float],
+) -> None:
+    # Per-key lookups: the wanted keys are far fewer than the ~100 keys in a summary,
+    # so this beats scanning src.items() against a frozenset
+    for k in monetary_keys:
+        v = src.get(k)
+        if isinstance(v, (int, float)):
+            out[k] = round(float(v), _METRIC_DECIMALS)
+    for k in numeric_keys:
+        v = src.get(k)
+        if isinstance(v, (int, float)):
+            out[k] = float(v)
+
+
+def _zip_summary_metrics(zf: zipfile.ZipFile, summary_name: str | None) -> dict[str, float]:
+    out: dict[str, float] = {}
+    if summary_name is None:
+        return out
+    try:
+        data = _loads(zf.read(summary_name))
+
+        # strategy section: {strategy_name: {...}}
+        strat = data.get("strategy")
+        strat_name = next(iter(strat)) if isinstance(strat, dict) and strat else None
+        if strat_name is not None:
+            sd = strat[strat_name]
+            if isinstance(sd, dict):
+                _collect_numeric(sd, _STRAT_MONETARY_KEYS, _STRAT_NUMERIC_KEYS, out)
+
+                # total_trades
+                tt = sd.get("total_trades") or sd.get("trades")
+                if isinstance(tt, (int, float)):
+                    out["trades"] = float(tt)
+
+        # strategy_comparison: list of per-strategy summaries
+        comp = data.get("strategy_comparison")
+        if isinstance(comp, list) and comp:
+            # pick matching strategy by 'key' if possible, else first
+            chosen = None
+            if strat_name is not None:
+                for item in comp:
+                    if isinstance(item, dict) and item.get("key") == strat_name:
+                        chosen = item
+                        break
+            if chosen is None and isinstance(comp[0], dict):
+                chosen = comp[0]
+            if isinstance(chosen, dict):
+                _collect_numeric(chosen, _COMP_MONETARY_KEYS, _COMP_NUMERIC_KEYS, out)
     except Exception:
         # best-effort extraction; ignore errors and return what we found
         return out
     return out
 
 
-def index_backtests(backtests_dir: Path, db_path: Path) -> int:
+def _list_dir(directory: Path, *suffixes: str) -> tuple[list[str], ...]:
+    """Sorted names of regular, non-hidden files per suffix, from one os.scandir() pass.
+
+    Matches what sorted(directory.glob("*" + suffix)) returned for files, including an
+    empty result for a missing directory.
+    """
+    found: tuple[list[str], ...] = tuple([] for _ in suffixes)
+    try:
+        with os.scandir(directory) as it:
+            for e in it:
+                name = e.name
+                if name.startswith("."):
+                    continue
+                for bucket, suffix in zip(found, suffixes, strict=True):
+                    if name.endswith(suffix) and e.is_file():
+                        bucket.append(name)
+                        break
+    except FileNotFoundError:
+        pass
+    for bucket in found:
+        bucket.sort()
+    return found
+
+
+def _find_zip(meta_path: Path, zip_names: list[str] | None = None) -> Path | None:
+    """Locate the results ZIP for a meta file.
+
+    `zip_names` is the sorted list of *.zip names in the directory, listed once per
+    index run; without it the directory is probed (exists + glob) for this file.
+    """
+    prefix = meta_path.name.rsplit(".meta.json", 1)[0]
+    if zip_names is None:
+        zip_candidate = meta_path.with_suffix(".zip")
+        if zip_candidate.exists():
+            return zip_candidate
+        # Some files may include timestamps in names; try glob by stem prefix
+        return next(meta_path.parent.glob(prefix + "*.zip"), None)
+    exact = meta_path.with_suffix(".zip").name
+    i = bisect.bisect_left(zip_names, exact)
+    if i < len(zip_names) and zip_names[i] == exact:
+        return meta_path.parent / exact
+    # First name sharing the prefix (sorted order)
+    i = bisect.bisect_left(zip_names, prefix)
+    if i < len(zip_names) and zip_names[i].startswith(prefix):
+        return meta_path.parent / zip_names[i]
+    return None
+
+
+def _process_zip(
+    zip_path: Path, sha256: str | None = None
+) -> tuple[str, str | None, dict[str, float]]:
+    """Return (sha256, config_hash, metrics) for a backtest ZIP with a single ZipFile open.
+
+    Pass `sha256` when the archive hash is already known to skip hashing it again.
+    """
+    if sha256 is None:
+        sha256 = _sha256_file(zip_path)
+    config_hash: str | None = None
+    metrics: dict[str, float] = {}
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            cfg_name, summary_name = _zip_json_members(zf)
+            if cfg_name is not None:
+                try:
+                    with zf.open(cfg_name) as cfg:
+                        config_hash = _sha256_fileobj(cfg)
+                except Exception:
+                    # best-effort only
+                    config_hash = None
+            metrics = _zip_summary_metrics(zf, summary_name)
+    except Exception:
+        # unreadable archive: keep the file hash, skip contents
+        return sha256, None, {}
+    return sha256, config_hash, metrics
+
+
+class MetricsIndexer:
+    """One SQLite connection shared by several index passes.
+
+    The connection is opened, tuned for bulk writes and schema-checked once; each
+    ``index_*`` call then runs in its own BEGIN/COMMIT. Use as a context manager, or
+    call ``close()``, when indexing backtests and hyperopts into the same database
+    back to back.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        try:
+            apply_bulk_write_pragmas(self.conn)
+            ensure_schema(self.conn, with_extended=True)
+        except BaseException:
+            self.conn.close()
+            raise
+        # Manual transaction control: one BEGIN/COMMIT per index pass
+        self.conn.isolation_level = None
+
+    def __enter__(self) -> MetricsIndexer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _run(self, tx, *args):
+        cur = self.conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            result = tx(cur, *args)
+            cur.execute("COMMIT")
+        except BaseException:
+            # SQLite may already have rolled back (e.g. disk full, I/O error); a second
+            # ROLLBACK would raise and hide the original error
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+        return result
+
+    def index_backtests(self, backtests_dir: Path, max_workers: int = 1) -> int:
+        """Index *.meta.json runs from backtests_dir; see `index_backtests`."""
+        cid = uuid.uuid4().hex
+        logger = get_json_logger(
+            "metrics",
+            static_fields={"correlation_id": cid, "op": "index_backtests"},
+        )
+        count, meta_invalid_count = self._run(
+            _index_backtests_tx, backtests_dir, logger, max_workers
+        )
+        logger.info(
+            "index_done",
+            extra={
+                "count": count,
+                "db_path": str(self.db_path),
+                "meta_invalid": meta_invalid_count,
+            },
+        )
+        return count
+
+    def index_hyperopts(
+        self,
+        hyperopt_dir: Path,
+        max_workers: int = 1,
+        strict_validate: bool = False,
+    ) -> int:
+        """Index *.fthypt trials from hyperopt_dir; see `index_hyperopts`."""
+        cid = uuid.uuid4().hex
+        logger = get_json_logger(
+            "metrics",
+            static_fields={"correlation_id": cid, "op": "index_hyperopts"},
+        )
+        count = self._run(_index_hyperopts_tx, hyperopt_dir, logger, max_workers, strict_validate)
+        logger.info("index_done", extra={"count": count, "db_path": str(self.db_path)})
+        return count
+
+
+def index_backtests(backtests_dir: Path, db_path: Path, max_workers: int = 1) -> int:
     """Parse all *.meta.json in backtests_dir and persist to SQLite.
 
+    With ``max_workers`` > 1 files are hashed and parsed in a pool of spawned worker
+    processes while this process stays the only SQLite writer; the default of 1
+    parses inline.
     Returns number of indexed runs.
     """
-    cid = uuid.uuid4().hex
-    logger = get_json_logger(
-        "metrics",
-        static_fields={"correlation_id": cid, "op": "index_backtests"},
-    )
-    conn = connect(db_path)
-    ensure_schema(conn, with_extended=True)
-    cur = conn.cursor()
+    with MetricsIndexer(db_path) as indexer:
+        return indexer.index_backtests(backtests_dir, max_workers)
+
+
+_SPAWN = multiprocessing.get_context("spawn")
 
+
+def _map_files(func, paths: list[Path], max_workers: int, *args: list) -> Iterator[Any]:
+    """Yield func(path, *args[i]) in input order, fanned out to worker processes if asked.
+
+    Workers are spawned, never forked: the caller holds an open SQLite write
+    transaction and may run a logging QueueListener thread, neither of which a
+    forked child may inherit safely.
+    """
+    workers = min(max_workers, len(paths))
+    if workers <= 1:
+        yield from map(func, paths, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_SPAWN) as pool:
+        yield from pool.map(func, paths, *args)
+
+
+def _process_meta(
+    meta_path: Path, known: _ShaCache | None, zip_candidate: Path | None
+) -> dict[str, Any]:
+    """Worker: parse, hash and extract everything for one meta file; no DB access.
+
+    Returns the rows to upsert plus the warnings to log in the writer process.
+    """
+    t0 = time.perf_counter()
+    meta, warning = _read_backtest_meta(meta_path)
+    warnings = [warning] if warning is not None else []
+    if not meta:
+        return {"run_id": None, "warnings": warnings}
+
+    # Create synthetic IDs to tie together minimal experiment/run lineage
+    strategy_id = meta.strategy_class  # if registry uses IDs differently, this is a placeholder
+    exp_id = f"exp:{strategy_id}:{meta.timeframe or ''}:{meta.start_ts or ''}-{meta.end_ts or ''}"
+    # Results ZIP (located by the caller); hash, config hash and metrics come from one open
+    config_hash: str | None = None
+    zip_metrics: dict[str, float] = {}
+    if zip_candidate is not None:
+        zip_sha, zip_size, zip_mtime = _sha256_cached(zip_candidate, known)
+        _, config_hash, zip_metrics = _process_zip(zip_candidate, sha256=zip_sha)
+
+    experiment = {
+        "exp_id": exp_id,
+        "idea_id": f"idea:auto:{strategy_id}",
+        "strategy_id": strategy_id,
+        "timeframe": meta.timeframe,
+        "start_iso": meta.start_iso,
+        "end_iso": meta.end_iso,
+        "config_hash": config_hash,
+    }
+
+    # Run record
+    data_window = None
+    if meta.start_iso and meta.end_iso:
+        data_window = f"{meta.start_iso}..{meta.end_iso}"
+    run = {
+        "run_id": meta.run_id,
+        "experiment_id": exp_id,
+        "kind": "backtest",
+        "started_iso": meta.start_iso,
+        "finished_iso": meta.end_iso,
+        "status": "completed",
+        "artifacts_path": str(meta_path.parent),
+        "data_window": data_window,
+    }
+
+    # Minimal metrics we can infer now
+    metrics: list[tuple[str, str, float]] = []
+    if meta.start_ts is not None and meta.end_ts is not None:
+        metrics.append((meta.run_id, "window_days", (meta.end_ts - meta.start_ts) / 86400.0))
+    if meta.timeframe:
+        metrics.append((meta.run_id, "timeframe_minutes", _timeframe_to_minutes(meta.timeframe)))
+
+    # Artifacts: link meta json and potential zip with sha256
+    # (unchanged files reuse the hash recorded with their size and mtime)
+    meta_sha, meta_size, meta_mtime = _sha256_cached(meta_path, known)
+    artifacts = [(meta.run_id, meta_path.name, str(meta_path), meta_sha, meta_size, meta_mtime)]
+    if zip_candidate is not None:
+        artifacts.append(
+            (meta.run_id, zip_candidate.name, str(zip_candidate), zip_sha, zip_size, zip_mtime)
+        )
+        # Detailed metrics from ZIP summary JSON
+        metrics.extend((meta.run_id, k, v) for k, v in zip_metrics.items())
+
+    # Per-run parse latency in milliseconds
+    metrics.append((meta.run_id, "parse_ms", (time.perf_counter() - t0) * 1000.0))
+    return {
+        "run_id": meta.run_id,
+        "warnings": warnings,
+        "experiment": experiment,
+        "run": run,
+        "metrics": metrics,
+        "artifacts": artifacts,
+    }
+
+
+def _index_backtests_tx(cur, backtests_dir: Path, logger, max_workers: int = 1) -> tuple[int, int]:
     count = 0
     meta_invalid_count = 0
-    for meta_path in sorted(backtests_dir.glob("*.meta.json")):
+    # One directory listing for meta files and every ZIP lookup
+    meta_names, zip_names = _list_dir(backtests_dir, ".meta.json", ".zip")
+    meta_paths = [backtests_dir / n for n in meta_names]
+    zip_per_meta = [_find_zip(meta_path, zip_names) for meta_path in meta_paths]
+    # Hand each worker only the known hashes for its own files (same name prefix)
+    known = _load_sha_cache(cur)
+    known_paths = sorted(known)
+    known_per_meta = []
+    for meta_path in meta_paths:
+        prefix = str(meta_path.parent / meta_path.name.rsplit(".meta.json", 1)[0])
+        i = bisect.bisect_left(known_paths, prefix)
+        subset: _ShaCache = {}
+        while i < len(known_paths) and known_paths[i].startswith(prefix):
+            subset[known_paths[i]] = known[known_paths[i]]
+            i += 1
+        known_per_meta.append(subset)
+    for meta_path, res in zip(
+        meta_paths,
+        _map_files(_process_meta, meta_paths, max_workers, known_per_meta, zip_per_meta),
+        strict=True,
+    ):
         logger.info("scan_meta", extra={"path": str(meta_path)})
-        t0 = time.perf_counter()
-        meta = parse_backtest_meta(meta_path)
-        if not meta:
+        for msg, extra in res["warnings"]:
+            _LOG_PARSE_META.warning(msg, extra=extra)
+        run_id = res["run_id"]
+        if run_id is None:
             logger.warning("meta_invalid", extra={"path": str(meta_path)})
             meta_invalid_count += 1
             continue
 
-        # Create synthetic IDs to tie together minimal experiment/run lineage
-        strategy_id = meta.strategy_class  # if registry uses IDs differently, this is a placeholder
-        exp_id = (
-            f"exp:{strategy_id}:{meta.timeframe or ''}:{meta.start_ts or ''}-{meta.end_ts or ''}"
-        )
-        # Try to discover config hash inside ZIP (if present)
-        config_hash: str | None = None
-        zip_candidate = meta_path.with_suffix(".zip")
-        if not zip_candidate.exists():
-            prefix = meta_path.name.rsplit(".meta.json", 1)[0]
-            zips = list(meta_path.parent.glob(prefix + "*.zip"))
-            if zips:
-                zip_candidate = zips[0]
-        if zip_candidate.exists():
-            try:
-                with zipfile.ZipFile(zip_candidate) as zf:
-                    cfg_names = [n for n in zf.namelist() if n.endswith("_config.json")]
-                    if cfg_names:
-                        cfg_bytes = zf.read(cfg_names[0])
-                        config_hash = hashlib.sha256(cfg_bytes).hexdigest()
-            except Exception:
-                # best-effort only
-                config_hash = None
-
-        _upsert_experiment(
-            cur,
-            exp_id,
-            idea_id=f"idea:auto:{strategy_id}",
-            strategy_id=strategy_id,
-            timeframe=meta.timeframe,
-            start_iso=meta.start_iso,
-            end_iso=meta.end_iso,
-            config_hash=config_hash,
-        )
-
-        # Run record
-        artifacts_dir = str(meta_path.parent)
-        data_window = None
-        if meta.start_iso and meta.end_iso:
-            data_window = f"{meta.start_iso}..{meta.end_iso}"
-        _upsert_run(
-            cur,
-            meta.run_id,
-            experiment_id=exp_id,
-            kind="backtest",
-            started_iso=meta.start_iso,
-            finished_iso=meta.end_iso,
-            status="completed",
-            artifacts_path=artifacts_dir,
-            data_window=data_window,
-        )
-
-        # Minimal metrics we can infer now
-        if meta.start_ts is not None and meta.end_ts is not None:
-            _upsert_metric(cur, meta.run_id, "window_days", (meta.end_ts - meta.start_ts) / 86400.0)
-        if meta.timeframe:
-            _upsert_metric(
-                cur, meta.run_id, "timeframe_minutes", _timeframe_to_minutes(meta.timeframe)
-            )
-
-        # Artifacts: link meta json and potential zip with sha256
-        _upsert_artifact(
-            cur,
-            meta.run_id,
-            name=meta_path.name,
-            path=str(meta_path),
-            sha256=_sha256_file(meta_path),
-        )
-        zip_candidate = meta_path.with_suffix(".zip")
-        if not zip_candidate.exists():
-            # Some files may include timestamps in names; try glob by stem prefix
-            prefix = meta_path.name.rsplit(".meta.json", 1)[0]
-            zips = list(meta_path.parent.glob(prefix + "*.zip"))
-            if zips:
-                zip_candidate = zips[0]
-        if zip_candidate.exists():
-            _upsert_artifact(
-                cur,
-                meta.run_id,
-                name=zip_candidate.name,
-                path=str(zip_candidate),
-                sha256=_sha256_file(zip_candidate),
-            )
-            # Parse and upsert detailed metrics from ZIP summary JSON
-            metrics = _parse_zip_metrics(zip_candidate)
-            for k, v in metrics.items():
-                _upsert_metric(cur, meta.run_id, k, v)
-
-        # Per-run parse latency in milliseconds
-        dt_ms = (time.perf_counter() - t0) * 1000.0
-        _upsert_metric(cur, meta.run_id, "parse_ms", dt_ms)
+        _upsert_experiment(cur, **res["experiment"])
+        _upsert_run(cur, **res["run"])
+        for artifact in res["artifacts"]:
+            _upsert_artifact(cur, *artifact)
+        _upsert_metrics_many(cur, res["metrics"])
 
         count += 1
-        logger.info("meta_indexed", extra={"run_id": meta.run_id})
+        logger.info("meta_indexed", extra={"run_id": run_id})
 
-    conn.commit()
-    conn.close()
-    logger.info(
-        "index_done",
-        extra={"count": count, "db_path": str(db_path), "meta_invalid": meta_invalid_count},
-    )
-    return count
+    return count, meta_invalid_count
 
 
+@lru_cache(maxsize=32)  # a handful of distinct timeframes across all metas
 def _timeframe_to_minutes(tf: str) -> float:
     tf = tf.strip().lower()
     if tf.endswith("m"):
@@ -451,141 +800,217 @@ def _timeframe_to_minutes(tf: str) -> float:
     return 0.0
 
 
-def index_hyperopts(hyperopt_dir: Path, db_path: Path) -> int:
+def index_hyperopts(
+    hyperopt_dir: Path,
+    db_path: Path,
+    max_workers: int = 1,
+    strict_validate: bool = False,
+) -> int:
     """Parse all *.fthypt hyperopt result files and persist trials to SQLite.
 
     Each line in a .fthypt file is a JSON object for a trial, with keys such as
     'loss', 'params_dict', and optionally 'results_metrics'.
     We write one row in `runs` per trial (kind='hyperopt') and store numeric params
     as metrics with prefix 'param.' along with 'loss' and 'trades' (if available).
+    ``max_workers`` > 1 parses files in spawned workers as in `index_backtests`. Trials
+    only need to be JSON objects unless `strict_validate` runs each one through the
+    Pydantic model; the ingestion code type-checks every field it reads either way.
     """
-    cid = uuid.uuid4().hex
-    logger = get_json_logger(
-        "metrics",
-        static_fields={"correlation_id": cid, "op": "index_hyperopts"},
-    )
-    conn = connect(db_path)
-    ensure_schema(conn, with_extended=True)
-    cur = conn.cursor()
+    with MetricsIndexer(db_path) as indexer:
+        return indexer.index_hyperopts(hyperopt_dir, max_workers, strict_validate)
+
 
-    ts_re = re.compile(r"_(\d{4}-\d{2}-\d{2})_(\d{2}-\d{2}-\d{2})\\.fthypt$")
+def _process_fthypt(
+    f: Path, known: _ShaCache | None = None, strict_validate: bool = False
+) -> dict[str, Any]:
+    """Worker: parse one .fthypt file into run/metric/artifact rows; no DB access.
 
+    Metrics come back columnar - trial numbers and values as NumPy arrays, keys as a
+    list of interned strings - which pickles to the writer far cheaper than one tuple
+    per row. Run ids are materialized by the writer. Per-line problems are returned as
+    warning names for the writer process to log.
+    """
+    name = f.name
+    m = _FTHYPT_TS_RE.search(name)
+    if not m:
+        # Fallback: use file stem as timestamp id
+        ts_id = f.stem
+        strat_cls = name.replace("strategy_", "").split("_", 1)[0]
+    else:
+        date_s, time_s = m.groups()
+        ts_id = f"{date_s}_{time_s}"
+        # strategy_<Class>_<date>_<time>.fthypt -> extract Class
+        head = name[: m.start()]  # up to _YYYY-..
+        # remove trailing underscore
+        head = head[:-1] if head.endswith("_") else head
+        strat_cls = head.replace("strategy_", "")
+
+    # Experiment per file
+    exp_id = f"exp:hyperopt:{strat_cls}:{ts_id}"
+    experiment = {
+        "exp_id": exp_id,
+        "idea_id": f"idea:auto:{strat_cls}",
+        "strategy_id": strat_cls,
+        "timeframe": None,
+        "start_iso": None,
+        "end_iso": None,
+    }
+
+    # Artifact: the hyperopt results file, linked to the first trial
+    file_sha, file_size, file_mtime_ns = _sha256_cached(f, known)
+    artifact: tuple[str, str, str, str, int, int] | None = None
+    trial_idx = 0
+
+    # Use file mtimes as rough run timestamps
+    t_iso = datetime.fromtimestamp(f.stat().st_mtime, tz=UTC).isoformat()
+    artifacts_path = str(f.parent)
+
+    # Parallel metric columns: trial number, key, value
+    m_trial: list[int] = []
+    m_key: list[str] = []
+    m_val: list[float] = []
+    param_keys: dict[str, str] = {}  # raw param name -> shared "param.<name>" string
+    warnings: list[str] = []
+    file_error = False
+
+    # Iterate lines (one JSON per trial)
+    try:
+        # Binary reads with a large buffer: lines go to the JSON parser as bytes
+        with f.open("rb", buffering=_FTHYPT_READ_BUFFER) as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    rec = _loads(line)
+                except Exception:
+                    warnings.append("trial_json_error")
+                    continue
+
+                # Full model validation is opt-in; the soft check is enough for the guards below
+                valid = _validate_hyperopt_trial(rec) if strict_validate else isinstance(rec, dict)
+                if not valid:
+                    warnings.append("trial_invalid")
+                    continue
+
+                trial_idx += 1
+
+                # metrics: loss
+                loss = rec.get("loss")
+                if isinstance(loss, (int, float)):
+                    m_trial.append(trial_idx)
+                    m_key.append("loss")
+                    m_val.append(loss)
+
+                # metrics: params (bool is an int subclass; float64 conversion maps it to 1/0)
+                p = rec.get("params_dict") or {}
+                if isinstance(p, dict):
+                    for k, v in p.items():
+                        if isinstance(v, (int, float)):
+                            key = param_keys.get(k)
+                            if key is None:
+                                key = param_keys[k] = f"param.{k}"
+                            m_trial.append(trial_idx)
+                            m_key.append(key)
+                            m_val.append(v)
+
+                # metrics: results_metrics -> trades count if available
+                rm = rec.get("results_metrics") or {}
+                if isinstance(rm, dict):
+                    trades = rm.get("trades")
+                    if isinstance(trades, list):
+                        m_trial.append(trial_idx)
+                        m_key.append("trades")
+                        m_val.append(len(trades))
+
+                # Per-run parse latency in milliseconds
+                m_trial.append(trial_idx)
+                m_key.append("parse_ms")
+                m_val.append((time.perf_counter() - t0) * 1000.0)
+    except Exception:
+        # best-effort parsing per file; rows parsed so far are kept
+        file_error = True
+
+    # Run ids are f"{run_prefix}{n:05d}" for n = 1..n_trials
+    run_prefix = f"hp:{strat_cls}:{ts_id}:"
+    n_trials = trial_idx
+    # artifact link (once per file, on the first trial)
+    if n_trials:
+        artifact = (f"{run_prefix}{1:05d}", name, str(f), file_sha, file_size, file_mtime_ns)
+    return {
+        "experiment": experiment,
+        "run_prefix": run_prefix,
+        "n_trials": n_trials,
+        "run_row": (exp_id, "hyperopt", t_iso, t_iso, "completed", "", artifacts_path),
+        "metrics": (
+            np.asarray(m_trial, dtype=np.int64),
+            m_key,
+            np.asarray(m_val, dtype=np.float64),
+        ),
+        "artifact": artifact,
+        "warnings": warnings,
+        "file_error": file_error,
+    }
+
+
+def _index_hyperopts_tx(
+    cur,
+    hyperopt_dir: Path,
+    logger,
+    max_workers: int = 1,
+    strict_validate: bool = False,
+) -> int:
     count = 0
     trial_json_error_count = 0
     trial_invalid_count = 0
     file_parse_error_count = 0
-    for f in sorted(hyperopt_dir.glob("*.fthypt")):
+    (fthypt_names,) = _list_dir(hyperopt_dir, ".fthypt")
+    files = [hyperopt_dir / n for n in fthypt_names]
+    known = _load_sha_cache(cur)
+    known_per_file = [{str(f): known[str(f)]} if str(f) in known else {} for f in files]
+    for f, res in zip(
+        files,
+        _map_files(
+            partial(_process_fthypt, strict_validate=strict_validate),
+            files,
+            max_workers,
+            known_per_file,
+        ),
+        strict=True,
+    ):
         logger.info("scan_fthypt", extra={"path": str(f)})
-        name = f.name
-        m = ts_re.search(name)
-        if not m:
-            # Fallback: use file stem as timestamp id
-            ts_id = f.stem
-            strat_cls = name.replace("strategy_", "").split("_", 1)[0]
-        else:
-            date_s, time_s = m.groups()
-            ts_id = f"{date_s}_{time_s}"
-            # strategy_<Class>_<date>_<time>.fthypt -> extract Class
-            head = name[: m.start()]  # up to _YYYY-..
-            # remove trailing underscore
-            head = head[:-1] if head.endswith("_") else head
-            strat_cls = head.replace("strategy_", "")
-
-        # Experiment per file
-        exp_id = f"exp:hyperopt:{strat_cls}:{ts_id}"
-        _upsert_experiment(
-            cur,
-            exp_id=exp_id,
-            idea_id=f"idea:auto:{strat_cls}",
-            strategy_id=strat_cls,
-            timeframe=None,
-            start_iso=None,
-            end_iso=None,
-        )
-
-        # Artifact: the hyperopt results file (link once per first trial via a flag)
-        file_sha = _sha256_file(f)
-        file_artifact_added = False
-
-        # Use file mtimes as rough run timestamps
-        t_iso = datetime.fromtimestamp(f.stat().st_mtime, tz=UTC).isoformat()
-
-        # Iterate lines (one JSON per trial)
-        try:
-            with f.open("r", encoding="utf-8") as fh:
-                trial_idx = 0
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    t0 = time.perf_counter()
-                    try:
-                        rec = json.loads(line)
-                    except Exception:
-                        logger.warning("trial_json_error", extra={"file": name})
-                        trial_json_error_count += 1
-                        continue
-
-                    # Optional validation
-                    if not _validate_hyperopt_trial(rec):
-                        logger.warning("trial_invalid", extra={"file": name})
-                        trial_invalid_count += 1
-                        continue
-
-                    trial_idx += 1
-                    run_id = f"hp:{strat_cls}:{ts_id}:{trial_idx:05d}"
-                    _upsert_run(
-                        cur,
-                        run_id,
-                        experiment_id=exp_id,
-                        kind="hyperopt",
-                        started_iso=t_iso,
-                        finished_iso=t_iso,
-                        status="completed",
-                        artifacts_path=str(f.parent),
-                        data_window=None,
+        _upsert_experiment(cur, **res["experiment"])
+        for msg in res["warnings"]:
+            logger.warning(msg, extra={"file": f.name})
+            if msg == "trial_json_error":
+                trial_json_error_count += 1
+            else:
+                trial_invalid_count += 1
+        if res["artifact"] is not None:
+            _upsert_artifact(cur, *res["artifact"])
+        # executemany in bounded chunks so one huge file does not build one giant batch
+        n_trials, run_prefix, run_row = res["n_trials"], res["run_prefix"], res["run_row"]
+        run_ids = [f"{run_prefix}{n:05d}" for n in range(1, n_trials + 1)]
+        for i in range(0, n_trials, _METRIC_FLUSH_ROWS):
+            _upsert_runs_many(cur, [(rid, *run_row) for rid in run_ids[i : i + _METRIC_FLUSH_ROWS]])
+        m_trial, m_key, m_val = res["metrics"]
+        for i in range(0, len(m_key), _METRIC_FLUSH_ROWS):
+            j = i + _METRIC_FLUSH_ROWS
+            _upsert_metrics_many(
+                cur,
+                [
+                    (run_ids[t - 1], k, v)
+                    for t, k, v in zip(
+                        m_trial[i:j].tolist(), m_key[i:j], m_val[i:j].tolist(), strict=True
                     )
-
-                    # metrics: loss
-                    loss = rec.get("loss")
-                    if isinstance(loss, (int, float)):
-                        _upsert_metric(cur, run_id, "loss", float(loss))
-
-                    # metrics: params
-                    p = rec.get("params_dict") or {}
-                    if isinstance(p, dict):
-                        for k, v in p.items():
-                            if isinstance(v, bool):
-                                _upsert_metric(cur, run_id, f"param.{k}", 1.0 if v else 0.0)
-                            elif isinstance(v, (int, float)):
-                                _upsert_metric(cur, run_id, f"param.{k}", float(v))
-
-                    # metrics: results_metrics -> trades count if available
-                    rm = rec.get("results_metrics") or {}
-                    if isinstance(rm, dict):
-                        trades = rm.get("trades")
-                        if isinstance(trades, list):
-                            _upsert_metric(cur, run_id, "trades", float(len(trades)))
-
-                    # artifact link (once per file)
-                    if not file_artifact_added:
-                        _upsert_artifact(cur, run_id, name=name, path=str(f), sha256=file_sha)
-                        file_artifact_added = True
-
-                    # Per-run parse latency in milliseconds
-                    dt_ms = (time.perf_counter() - t0) * 1000.0
-                    _upsert_metric(cur, run_id, "parse_ms", dt_ms)
-
-                    count += 1
-        except Exception:
-            # best-effort parsing per file
+                ],
+            )
+        count += n_trials
+        if res["file_error"]:
             logger.warning("file_parse_error", extra={"path": str(f)})
             file_parse_error_count += 1
-            continue
 
-    conn.commit()
-    conn.close()
-    logger.info("index_done", extra={"count": count, "db_path": str(db_path)})
     return count
 
 
@@ -594,7 +1019,7 @@ try:
     from pydantic import BaseModel
 
     try:
-        from pydantic import ConfigDict, model_validator  # v2
+        from pydantic import ConfigDict, TypeAdapter, model_validator  # v2
 
         _PYD_V2 = True
     except Exception:  # pragma: no cover - depends on pydantic version
@@ -702,6 +1127,14 @@ try:
                     raise ValueError(f"{field.name} must be a dictionary")
                 return v
 
+    # Validators built once; v1 has no TypeAdapter and keeps the model-level call
+    if _PYD_V2:
+        _validate_payload_py = TypeAdapter(_BacktestPayloadModel).validate_python
+        _validate_trial_py = TypeAdapter(_HyperoptTrialModel).validate_python
+    else:  # pragma: no cover - depends on pydantic version
+        _validate_payload_py = _BacktestPayloadModel.parse_obj  # type: ignore[attr-defined]
+        _validate_trial_py = _HyperoptTrialModel.parse_obj  # type: ignore[attr-defined]
+
     _PYDANTIC_OK = True
 except Exception:  # pragma: no cover - pydantic not installed
     _PYDANTIC_OK = False
@@ -710,15 +1143,16 @@ except Exception:  # pragma: no cover - pydantic not installed
 
 
 def _validate_backtest_payload(payload: dict[str, Any]) -> tuple[bool, str | None]:
-    logger = get_json_logger("metrics", static_fields={"op": "_validate_backtest_payload"})
     """Validate backtest payload with Pydantic if available; otherwise run soft checks."""
+    logger = _LOG_VALIDATE_BACKTEST
     if _PYDANTIC_OK and _BacktestPayloadModel is not None:
         try:
-            _BacktestPayloadModel.model_validate(payload)  # type: ignore[attr-defined]
+            _validate_payload_py(payload)
             logger.debug("pydantic_validation_success")
             return True, None
         except Exception as e:  # pragma: no cover - validation error
-            logger.debug("pydantic_validation_failed", extra={"error": str(e)})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("pydantic_validation_failed", extra={"error": str(e)})
             return False, str(e)
     # Soft validation
     if not isinstance(payload, dict):
@@ -732,14 +1166,15 @@ def _validate_backtest_payload(payload: dict[str, Any]) -> tuple[bool, str | Non
 
 
 def _validate_hyperopt_trial(rec: dict[str, Any]) -> bool:
-    logger = get_json_logger("metrics", static_fields={"op": "_validate_hyperopt_trial"})
+    logger = _LOG_VALIDATE_TRIAL
     if _PYDANTIC_OK and _HyperoptTrialModel is not None:
         try:
-            _HyperoptTrialModel.model_validate(rec)  # type: ignore[attr-defined]
+            _validate_trial_py(rec)
             logger.debug("pydantic_validation_success")
             return True
         except Exception as e:  # pragma: no cover
-            logger.debug("pydantic_validation_failed", extra={"error": str(e)})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("pydantic_validation_failed", extra={"error": str(e)})
             return False
     # Soft validation
     return isinstance(rec, dict)
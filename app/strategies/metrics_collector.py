@@ -43,7 +43,9 @@ class MetricsCollector:
                 "correlation_id": correlation_id,
             }
         )
-        logger.info(f"Trade recorded for {strategy_name}", extra={"correlation_id": correlation_id})
+        logger.info(
+            "Trade recorded for %s", strategy_name, extra={"correlation_id": correlation_id}
+        )
 
     def record_error(self, strategy_name: str, error: str, correlation_id: str) -> None:
         """Record an error."""
@@ -55,7 +57,9 @@ class MetricsCollector:
                 "correlation_id": correlation_id,
             }
         )
-        logger.error(f"Error in {strategy_name}: {error}", extra={"correlation_id": correlation_id})
+        logger.error(
+            "Error in %s: %s", strategy_name, error, extra={"correlation_id": correlation_id}
+        )
 
     def get_summary(self) -> dict[str, Any]:
         """Get summary of collected metrics."""
@@ -1,16 +1,141 @@
 """Options trading strategies support."""
 
+import math
 from dataclasses import dataclass
 from enum import Enum
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+from scipy.special import ndtr
 
 from app.strategies.utils import get_json_logger
 
 logger = get_json_logger("options_trading")
 
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+def _ncdf(x: float) -> float:
+    """Standard normal CDF for a scalar; erfc keeps precision in the lower tail."""
+    return 0.5 * math.erfc(-x * _INV_SQRT2)
+
+
+def _npdf(x: float) -> float:
+    """Standard normal PDF for a scalar."""
+    return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+def _bs_limit(
+    spot: float,
+    strike: float,
+    time_to_expiry: float,
+    risk_free_rate: float,
+    is_call: bool,
+) -> tuple[float, float, float, float, float, float]:
+    """Price and Greeks where the closed form degenerates (T <= 0 or volatility <= 0).
+
+    An expired option is worth its intrinsic value and has no sensitivities left.
+    With zero volatility the underlying drifts deterministically, so the option is
+    worth its discounted forward intrinsic value and the Greeks are the sigma -> 0
+    limits of the closed form: a 0/+-1 delta step and no gamma or vega.
+    """
+    sign = 1.0 if is_call else -1.0
+    if time_to_expiry <= 0:
+        intrinsic = sign * (spot - strike)
+        if intrinsic <= 0:
+            return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        return intrinsic, sign, 0.0, 0.0, 0.0, 0.0
+    discounted = strike * math.exp(-risk_free_rate * time_to_expiry)
+    intrinsic = sign * (spot - discounted)
+    if intrinsic <= 0:
+        return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+    theta = -sign * risk_free_rate * discounted / 365
+    return intrinsic, sign, 0.0, theta, 0.0, sign * discounted * time_to_expiry / 100
+
+
+def _bs_limit_vec(
+    spot: float,
+    strikes: np.ndarray,
+    time_to_expiry: np.ndarray,
+    risk_free_rate: float,
+    sign: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Array counterpart of _bs_limit; ``sign`` is +1.0 for calls and -1.0 for puts."""
+    expired = time_to_expiry <= 0
+    # An expired option compares spot with the undiscounted strike
+    discounted = strikes * np.exp(-risk_free_rate * np.where(expired, 0.0, time_to_expiry))
+    intrinsic = sign * (spot - discounted)
+    itm = intrinsic > 0
+    live = itm & ~expired
+    zeros = np.zeros_like(intrinsic)
+    return (
+        np.where(itm, intrinsic, 0.0),
+        np.where(itm, sign, 0.0),
+        zeros,
+        np.where(live, -sign * risk_free_rate * discounted / 365, 0.0),
+        zeros,
+        np.where(live, sign * discounted * time_to_expiry / 100, 0.0),
+    )
+
+
+def _vec_inputs(
+    strikes: np.ndarray, time_to_expiry: float | np.ndarray, volatility: float | np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Broadcast strikes, T and volatility for the array Black-Scholes paths.
+
+    Returns (strikes, T, closed-form T, closed-form volatility, limit mask). Where the
+    closed form degenerates (T <= 0 or volatility <= 0) its T and volatility are set
+    to 1.0 so it stays finite; those entries are then taken from _bs_limit_vec.
+    """
+    strikes, t, vol = np.broadcast_arrays(
+        np.asarray(strikes, dtype=float),
+        np.asarray(time_to_expiry, dtype=float),
+        np.asarray(volatility, dtype=float),
+    )
+    limit = (t <= 0) | (vol <= 0)
+    if limit.any():
+        return strikes, t, np.where(limit, 1.0, t), np.where(limit, 1.0, vol), limit
+    return strikes, t, t, vol, limit
+
+
+def _bs_scalar(
+    spot: float,
+    strike: float,
+    time_to_expiry: float,
+    risk_free_rate: float,
+    volatility: float,
+    is_call: bool,
+) -> tuple[float, float, float, float, float, float]:
+    """Price and Greeks of one option from a single d1/d2 evaluation.
+
+    Returns (price, delta, gamma, theta, vega, rho) with the same conventions as
+    BlackScholes.calculate_greeks: daily theta, vega and rho per 1% move.
+    """
+    if time_to_expiry <= 0 or volatility <= 0:
+        return _bs_limit(spot, strike, time_to_expiry, risk_free_rate, is_call)
+    sqrt_t = math.sqrt(time_to_expiry)
+    drift = (risk_free_rate + 0.5 * volatility**2) * time_to_expiry
+    d1 = (math.log(spot / strike) + drift) / (volatility * sqrt_t)
+    d2 = d1 - volatility * sqrt_t
+    pdf_d1 = _npdf(d1)
+    discounted = strike * math.exp(-risk_free_rate * time_to_expiry)
+
+    gamma = pdf_d1 / (spot * volatility * sqrt_t)
+    vega = spot * pdf_d1 * sqrt_t / 100
+    term1 = -spot * pdf_d1 * volatility / (2 * sqrt_t)
+    if is_call:
+        cdf_d1 = _ncdf(d1)
+        cdf_d2 = _ncdf(d2)
+        price = spot * cdf_d1 - discounted * cdf_d2
+        theta = (term1 - risk_free_rate * discounted * cdf_d2) / 365
+        return price, cdf_d1, gamma, theta, vega, discounted * time_to_expiry * cdf_d2 / 100
+    cdf_d1 = _ncdf(-d1)
+    cdf_d2 = _ncdf(-d2)
+    price = discounted * cdf_d2 - spot * cdf_d1
+    theta = (term1 + risk_free_rate * discounted * cdf_d2) / 365
+    return price, -cdf_d1, gamma, theta, vega, -discounted * time_to_expiry * cdf_d2 / 100
+
 
 class OptionType(str, Enum):
     """Option types."""
@@ -51,6 +176,17 @@ class Option:
     rho: float | None = None
 
 
+@dataclass(slots=True)
+class Greeks:
+    """Option sensitivities: daily theta, vega and rho per 1% move."""
+
+    delta: float
+    gamma: float
+    theta: float
+    vega: float
+    rho: float
+
+
 class BlackScholes:
     """Black-Scholes option pricing model."""
 
@@ -64,19 +200,20 @@ class BlackScholes:
         option_type: OptionType,
     ) -> float:
         """Calculate option price using Black-Scholes."""
-        d1 = (np.log(spot / strike) + (risk_free_rate + 0.5 * volatility**2) * time_to_expiry) / (
-            volatility * np.sqrt(time_to_expiry)
-        )
-        d2 = d1 - volatility * np.sqrt(time_to_expiry)
+        if time_to_expiry <= 0 or volatility <= 0:
+            return _bs_limit(
+                spot, strike, time_to_expiry, risk_free_rate, option_type == OptionType.CALL
+            )[0]
+        sqrt_t = math.sqrt(time_to_expiry)
+        drift = (risk_free_rate + 0.5 * volatility**2) * time_to_expiry
+        d1 = (math.log(spot / strike) + drift) / (volatility * sqrt_t)
+        d2 = d1 - volatility * sqrt_t
+        discounted = strike * math.exp(-risk_free_rate * time_to_expiry)
 
         if option_type == OptionType.CALL:
-            price = spot * norm.cdf(d1) - strike * np.exp(
-                -risk_free_rate * time_to_expiry
-            ) * norm.cdf(d2)
+            price = spot * _ncdf(d1) - discounted * _ncdf(d2)
         else:  # PUT
-            price = strike * np.exp(-risk_free_rate * time_to_expiry) * norm.cdf(
-                -d2
-            ) - spot * norm.cdf(-d1)
+            price = discounted * _ncdf(-d2) - spot * _ncdf(-d1)
 
         return price
 
@@ -88,57 +225,86 @@ class BlackScholes:
         risk_free_rate: float,
         volatility: float,
         option_type: OptionType,
-    ) -> dict[str, float]:
+    ) -> Greeks:
         """Calculate option Greeks."""
-        d1 = (np.log(spot / strike) + (risk_free_rate + 0.5 * volatility**2) * time_to_expiry) / (
-            volatility * np.sqrt(time_to_expiry)
+        _, delta, gamma, theta, vega, rho = _bs_scalar(
+            spot,
+            strike,
+            time_to_expiry,
+            risk_free_rate,
+            volatility,
+            option_type == OptionType.CALL,
         )
-        d2 = d1 - volatility * np.sqrt(time_to_expiry)
-
-        # Delta
-        if option_type == OptionType.CALL:
-            delta = norm.cdf(d1)
-        else:
-            delta = -norm.cdf(-d1)
-
-        # Gamma (same for calls and puts)
-        gamma = norm.pdf(d1) / (spot * volatility * np.sqrt(time_to_expiry))
-
-        # Theta
-        term1 = -spot * norm.pdf(d1) * volatility / (2 * np.sqrt(time_to_expiry))
-        if option_type == OptionType.CALL:
-            term2 = (
-                risk_free_rate * strike * np.exp(-risk_free_rate * time_to_expiry) * norm.cdf(d2)
-            )
-            theta = (term1 - term2) / 365  # Daily theta
-        else:
-            term2 = (
-                risk_free_rate * strike * np.exp(-risk_free_rate * time_to_expiry) * norm.cdf(-d2)
-            )
-            theta = (term1 + term2) / 365
+        return Greeks(delta, gamma, theta, vega, rho)
 
-        # Vega (same for calls and puts)
-        vega = spot * norm.pdf(d1) * np.sqrt(time_to_expiry) / 100  # Per 1% change in volatility
+    @staticmethod
+    def _call_sign(option_types: list[OptionType]) -> np.ndarray:
+        """+1.0 for calls and -1.0 for puts, one entry per option type."""
+        return np.array([1.0 if t == OptionType.CALL else -1.0 for t in option_types])
 
-        # Rho
-        if option_type == OptionType.CALL:
-            rho = (
-                strike
-                * time_to_expiry
-                * np.exp(-risk_free_rate * time_to_expiry)
-                * norm.cdf(d2)
-                / 100
-            )
-        else:
-            rho = (
-                -strike
-                * time_to_expiry
-                * np.exp(-risk_free_rate * time_to_expiry)
-                * norm.cdf(-d2)
-                / 100
-            )
+    @staticmethod
+    def calculate_price_vec(
+        spot: float,
+        strikes: np.ndarray,
+        time_to_expiry: float | np.ndarray,
+        risk_free_rate: float,
+        volatility: float | np.ndarray,
+        option_types: list[OptionType],
+    ) -> np.ndarray:
+        """Black-Scholes prices for several options at once.
+
+        Same formula as calculate_price, evaluated over arrays so the legs of a
+        strategy go through the same ``ndtr`` calls. ``time_to_expiry`` and ``volatility``
+        may be scalars or per-option arrays; expired and zero-volatility options get
+        the same limits as calculate_price.
+        """
+        strikes, t, t_cf, vol, limit = _vec_inputs(strikes, time_to_expiry, volatility)
+        sign = BlackScholes._call_sign(option_types)
+        sqrt_t = np.sqrt(t_cf)
+        drift = (risk_free_rate + 0.5 * vol**2) * t_cf
+        d1 = (np.log(spot / strikes) + drift) / (vol * sqrt_t)
+        d2 = d1 - vol * sqrt_t
+        discounted = strikes * np.exp(-risk_free_rate * t_cf)
+        # call: S*N(d1) - K*df*N(d2); put: K*df*N(-d2) - S*N(-d1)
+        price = sign * (spot * ndtr(sign * d1) - discounted * ndtr(sign * d2))
+        if limit.any():
+            limit_price = _bs_limit_vec(spot, strikes, t, risk_free_rate, sign)[0]
+            price = np.where(limit, limit_price, price)
+        return price
 
-        return {"delta": delta, "gamma": gamma, "theta": theta, "vega": vega, "rho": rho}
+    @staticmethod
+    def calculate_greeks_vec(
+        spot: float,
+        strikes: np.ndarray,
+        time_to_expiry: float | np.ndarray,
+        risk_free_rate: float,
+        volatility: float | np.ndarray,
+        option_types: list[OptionType],
+    ) -> dict[str, np.ndarray]:
+        """Greeks for several options at once; array counterpart of calculate_greeks."""
+        strikes, t, t_cf, vol, limit = _vec_inputs(strikes, time_to_expiry, volatility)
+        sign = BlackScholes._call_sign(option_types)
+        sqrt_t = np.sqrt(t_cf)
+        drift = (risk_free_rate + 0.5 * vol**2) * t_cf
+        d1 = (np.log(spot / strikes) + drift) / (vol * sqrt_t)
+        d2 = d1 - vol * sqrt_t
+        pdf_d1 = _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+        cdf_d2 = ndtr(sign * d2)
+        discounted = strikes * np.exp(-risk_free_rate * t_cf)
+
+        term1 = -spot * pdf_d1 * vol / (2 * sqrt_t)
+        greeks = {
+            "delta": sign * ndtr(sign * d1),
+            "gamma": pdf_d1 / (spot * vol * sqrt_t),
+            "theta": (term1 - sign * (risk_free_rate * discounted * cdf_d2)) / 365,
+            "vega": spot * pdf_d1 * sqrt_t / 100,
+            "rho": sign * discounted * t_cf * cdf_d2 / 100,
+        }
+        if limit.any():
+            limits = _bs_limit_vec(spot, strikes, t, risk_free_rate, sign)[1:]
+            for name, value in zip(greeks, limits, strict=True):
+                greeks[name] = np.where(limit, value, greeks[name])
+        return greeks
 
 
 class OptionsStrategyBuilder:
@@ -159,12 +325,9 @@ class OptionsStrategyBuilder:
         """Create long call strategy."""
         time_to_expiry = (expiry - pd.Timestamp.now()).days / 365
 
-        premium = self.bs_model.calculate_price(
-            spot, strike, time_to_expiry, risk_free_rate, volatility, OptionType.CALL
-        )
-
-        greeks = self.bs_model.calculate_greeks(
-            spot, strike, time_to_expiry, risk_free_rate, volatility, OptionType.CALL
+        # Premium and Greeks share one d1/d2 evaluation
+        premium, delta, gamma, theta, vega, rho = _bs_scalar(
+            spot, strike, time_to_expiry, risk_free_rate, volatility, True
         )
 
         return {
@@ -175,7 +338,7 @@ class OptionsStrategyBuilder:
                     "position": 1,  # Long
                     "strike": strike,
                     "premium": premium,
-                    "greeks": greeks,
+                    "greeks": Greeks(delta, gamma, theta, vega, rho),
                 }
             ],
             "max_profit": "unlimited",
@@ -198,44 +361,19 @@ class OptionsStrategyBuilder:
         strikes = sorted(strikes)
         time_to_expiry = (expiry - pd.Timestamp.now()).days / 365
 
-        legs = []
-        net_premium = 0
-
-        # Buy OTM put
-        premium = self.bs_model.calculate_price(
-            spot, strikes[0], time_to_expiry, risk_free_rate, volatility, OptionType.PUT
-        )
-        legs.append(
-            {"type": OptionType.PUT, "position": 1, "strike": strikes[0], "premium": premium}
-        )
-        net_premium -= premium
-
-        # Sell OTM put
-        premium = self.bs_model.calculate_price(
-            spot, strikes[1], time_to_expiry, risk_free_rate, volatility, OptionType.PUT
-        )
-        legs.append(
-            {"type": OptionType.PUT, "position": -1, "strike": strikes[1], "premium": premium}
-        )
-        net_premium += premium
+        # Long put, short put, short call, long call; all four priced in one call
+        types = [OptionType.PUT, OptionType.PUT, OptionType.CALL, OptionType.CALL]
+        positions = [1, -1, -1, 1]
+        premiums = self.bs_model.calculate_price_vec(
+            spot, np.array(strikes), time_to_expiry, risk_free_rate, volatility, types
+        ).tolist()
 
-        # Sell OTM call
-        premium = self.bs_model.calculate_price(
-            spot, strikes[2], time_to_expiry, risk_free_rate, volatility, OptionType.CALL
-        )
-        legs.append(
-            {"type": OptionType.CALL, "position": -1, "strike": strikes[2], "premium": premium}
-        )
-        net_premium += premium
-
-        # Buy OTM call
-        premium = self.bs_model.calculate_price(
-            spot, strikes[3], time_to_expiry, risk_free_rate, volatility, OptionType.CALL
-        )
-        legs.append(
-            {"type": OptionType.CALL, "position": 1, "strike": strikes[3], "premium": premium}
-        )
-        net_premium -= premium
+        legs = [
+            {"type": t, "position": pos, "strike": k, "premium": p}
+            for t, pos, k, p in zip(types, positions, strikes, premiums, strict=True)
+        ]
+        # Premium received on the short legs net of premium paid on the long legs
+        net_premium = -premiums[0] + premiums[1] + premiums[2] - premiums[3]
 
         return {
             "strategy": OptionStrategy.IRON_CONDOR,
@@ -249,23 +387,19 @@ class OptionsStrategyBuilder:
 
     def calculate_payoff(self, strategy: dict, spot_prices: np.ndarray) -> np.ndarray:
         """Calculate strategy payoff at different spot prices."""
+        spot_prices = np.asarray(spot_prices, dtype=float)
         payoffs = np.zeros_like(spot_prices)
 
+        # One array op per leg over the whole spot grid
         for leg in strategy["legs"]:
-            position = leg["position"]
             strike = leg["strike"]
-            premium = leg["premium"]
-            option_type = leg["type"]
-
-            for i, spot in enumerate(spot_prices):
-                if option_type == OptionType.CALL:
-                    intrinsic_value = max(0, spot - strike)
-                else:  # PUT
-                    intrinsic_value = max(0, strike - spot)
+            if leg["type"] == OptionType.CALL:
+                intrinsic_value = np.maximum(spot_prices - strike, 0.0)
+            else:  # PUT
+                intrinsic_value = np.maximum(strike - spot_prices, 0.0)
 
-                # Account for premium paid/received
-                leg_payoff = position * (intrinsic_value - premium)
-                payoffs[i] += leg_payoff
+            # Account for premium paid/received
+            payoffs += leg["position"] * (intrinsic_value - leg["premium"])
 
         return payoffs
 
@@ -280,26 +414,33 @@ class OptionsDeltaHedger:
         self.hedge_history = []
 
     def calculate_portfolio_delta(
-        self, options: list[Option], spot: float, risk_free_rate: float = 0.05
+        self,
+        options: list[Option],
+        spot: float,
+        risk_free_rate: float = 0.05,
+        now: pd.Timestamp | None = None,
     ) -> float:
-        """Calculate total portfolio delta."""
-        total_delta = 0
-
-        for option in options:
-            time_to_expiry = (option.expiry - pd.Timestamp.now()).days / 365
-
-            greeks = self.bs_model.calculate_greeks(
-                spot,
-                option.strike,
-                time_to_expiry,
-                risk_free_rate,
-                option.implied_volatility,
-                option.option_type,
-            )
-
-            total_delta += greeks["delta"]
+        """Calculate total portfolio delta.
+
+        ``now`` is the valuation time used for every option's time to expiry;
+        it defaults to the current time, read once per call.
+        """
+        if not options:
+            return 0.0
+
+        if now is None:
+            now = pd.Timestamp.now()
+        time_to_expiry = np.array([(o.expiry - now).days / 365 for o in options])
+        greeks = self.bs_model.calculate_greeks_vec(
+            spot,
+            np.array([o.strike for o in options]),
+            time_to_expiry,
+            risk_free_rate,
+            np.array([o.implied_volatility for o in options]),
+            [o.option_type for o in options],
+        )
 
-        return total_delta
+        return float(greeks["delta"].sum())
 
     def calculate_hedge_quantity(
         self, portfolio_delta: float, contract_multiplier: int = 100
@@ -316,10 +457,17 @@ class OptionsDeltaHedger:
         return delta_difference > self.rebalance_threshold
 
     def execute_hedge(
-        self, options: list[Option], spot: float, current_hedge_position: int = 0
+        self,
+        options: list[Option],
+        spot: float,
+        current_hedge_position: int = 0,
+        now: pd.Timestamp | None = None,
     ) -> dict:
         """Execute delta hedge."""
-        portfolio_delta = self.calculate_portfolio_delta(options, spot)
+        # One clock read for both the valuation and the recorded timestamp
+        if now is None:
+            now = pd.Timestamp.now()
+        portfolio_delta = self.calculate_portfolio_delta(options, spot, now=now)
 
         target_hedge = self.calculate_hedge_quantity(portfolio_delta)
         hedge_adjustment = target_hedge - current_hedge_position
@@ -330,7 +478,7 @@ class OptionsDeltaHedger:
             "target_hedge": target_hedge,
             "adjustment": hedge_adjustment,
             "action": "buy" if hedge_adjustment > 0 else "sell" if hedge_adjustment < 0 else "none",
-            "timestamp": pd.Timestamp.now(),
+            "timestamp": now,
         }
 
         self.hedge_history.append(result)
@@ -1,10 +1,13 @@
 """Pairs trading statistical arbitrage module."""
 
+from typing import Literal
 
 import numpy as np
 import pandas as pd
 from pydantic import BaseModel
+from statsmodels.tsa.adfvalues import mackinnonp
 from statsmodels.tsa.stattools import coint
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
 
 from app.strategies.utils import get_json_logger
 
@@ -20,6 +23,80 @@ class PairsConfig(BaseModel):
     min_correlation: float = 0.8
     max_half_life: int = 30
     cointegration_pvalue: float = 0.05
+    # "johansen" gates the pairwise Engle-Granger tests behind one joint trace test
+    cointegration_method: Literal["pairwise", "johansen"] = "pairwise"
+    # Engle-Granger with a plain Dickey-Fuller step instead of AIC-selected ADF lags
+    fast_coint: bool = False
+    # Clip |z| to this bound; None disables it. Keep it above zscore_entry + 1.0 or the
+    # stop-loss in generate_signals can no longer trigger.
+    zscore_winsorize: float | None = None
+
+
+def _correlation_matrix(frame: pd.DataFrame) -> np.ndarray:
+    """Pearson correlation of the columns, matching DataFrame.corr().
+
+    Without gaps every pair sees the same rows, so np.corrcoef's single BLAS
+    product replaces pandas' pairwise loop (tens of times faster for hundreds of
+    symbols, equal to ~1e-14). With NaNs, pandas keeps its per-pair row dropping.
+    """
+    values = frame.to_numpy(dtype=float)
+    if min(values.shape) < 2 or np.isnan(values).any():
+        return frame.corr().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):  # constant columns give NaN
+        return np.corrcoef(values, rowvar=False)
+
+
+# statsmodels' threshold for treating the cointegrating regression as a perfect fit
+_COINT_COLLINEAR_TOL = 100 * np.sqrt(np.finfo(float).eps)
+
+
+def _fast_coint_pvalue(y: np.ndarray, x: np.ndarray) -> float:
+    """Engle-Granger p-value of y ~ const + x with a zero-lag Dickey-Fuller step.
+
+    Equals coint(y, x, maxlag=0, autolag=None)[1]: the cointegrating OLS and the
+    no-constant DF regression on its residuals are both single-regressor fits, so
+    they reduce to dot products and skip the statsmodels results objects and the
+    AIC lag search. Without lag augmentation the test assumes the residuals carry
+    no serial correlation beyond the first lag.
+    """
+    xc = x - np.add.reduce(x) / x.size
+    yc = y - np.add.reduce(y) / y.size
+    sxx = np.dot(xc, xc)
+    syy = np.dot(yc, yc)
+    if sxx == 0.0 or syy == 0.0:
+        return np.nan  # a constant leg has no cointegrating regression
+    resid = yc - (np.dot(xc, yc) / sxx) * xc
+    if np.dot(resid, resid) <= _COINT_COLLINEAR_TOL * syy:
+        return 0.0  # (almost) perfectly collinear: coint reports -inf, p = 0
+
+    lag = resid[:-1]
+    diff = resid[1:] - lag
+    sll = np.dot(lag, lag)
+    gamma = np.dot(lag, diff) / sll
+    err = diff - gamma * lag
+    se = np.sqrt(np.dot(err, err) / (diff.size - 1) / sll)
+    return float(mackinnonp(gamma / se, regression="c", N=2))
+
+
+# Johansen trace critical values are tabulated for at most 12 series
+_JOHANSEN_MAX_SERIES = 12
+
+
+def _johansen_has_cointegration(closes: pd.DataFrame) -> bool:
+    """Joint Johansen trace test of rank 0 at the 95% level.
+
+    Any cointegrated pair is a cointegrating vector of the whole system, so when
+    rank 0 is not rejected no pairwise test can succeed either. Systems the tables
+    do not cover (or that are too short to estimate) answer True and leave the
+    decision to the pairwise tests.
+    """
+    if closes.shape[1] > _JOHANSEN_MAX_SERIES:
+        return True
+    try:
+        result = coint_johansen(closes.dropna().to_numpy(dtype=float), det_order=0, k_ar_diff=1)
+    except (np.linalg.LinAlgError, ValueError):
+        return True
+    return bool(result.lr1[0] > result.cvt[0, 1])
 
 
 class PairAnalyzer:
@@ -36,35 +113,63 @@ class PairAnalyzer:
         """Find cointegrated pairs from price data."""
         symbols = list(data.keys())
         cointegrated_pairs = []
-
-        for i in range(len(symbols)):
-            for j in range(i + 1, len(symbols)):
-                symbol1, symbol2 = symbols[i], symbols[j]
-
-                # Get price series
-                price1 = data[symbol1]["close"]
-                price2 = data[symbol2]["close"]
-
-                # Check cointegration
-                score, pvalue, _ = coint(price1, price2)
-
-                if pvalue < self.config.cointegration_pvalue:
-                    # Check correlation
-                    correlation = price1.corr(price2)
-
-                    if correlation > self.config.min_correlation:
-                        cointegrated_pairs.append((symbol1, symbol2, pvalue))
-                        logger.info(
-                            f"Found cointegrated pair: {symbol1}-{symbol2}, p-value: {pvalue:.4f}"
-                        )
+        if len(symbols) < 2:
+            return cointegrated_pairs
+
+        # One pairwise correlation matrix up front (index-aligned, NaNs dropped per
+        # pair, as Series.corr does); only pairs above min_correlation get the far
+        # more expensive cointegration test
+        closes = {symbol: data[symbol]["close"] for symbol in symbols}
+        frame = pd.DataFrame(closes)
+        corr = _correlation_matrix(frame)
+        ii, jj = np.nonzero(np.triu(corr > self.config.min_correlation, k=1))
+
+        if self.config.cointegration_method == "johansen" and ii.size:
+            candidates = [symbols[k] for k in np.union1d(ii, jj).tolist()]
+            if not _johansen_has_cointegration(frame[candidates]):
+                logger.info(
+                    "Johansen trace test: no cointegration among %d symbols", len(candidates)
+                )
+                return cointegrated_pairs
+
+        for i, j in zip(ii.tolist(), jj.tolist(), strict=True):
+            symbol1, symbol2 = symbols[i], symbols[j]
+
+            # Check cointegration
+            if self.config.fast_coint:
+                pvalue = _fast_coint_pvalue(
+                    closes[symbol1].to_numpy(dtype=float), closes[symbol2].to_numpy(dtype=float)
+                )
+            else:
+                score, pvalue, _ = coint(closes[symbol1], closes[symbol2])
+
+            if pvalue < self.config.cointegration_pvalue:
+                cointegrated_pairs.append((symbol1, symbol2, pvalue))
+                logger.info(
+                    "Found cointegrated pair: %s-%s, p-value: %.4f", symbol1, symbol2, pvalue
+                )
 
         return cointegrated_pairs
 
     def calculate_spread(self, price1: pd.Series, price2: pd.Series) -> pd.Series:
         """Calculate spread between two price series."""
-        # Use log prices for better statistical properties
-        log_price1 = np.log(price1)
-        log_price2 = np.log(price2)
+        return self._spread_and_hedge_ratio(price1, price2)[0]
+
+    def _spread_and_hedge_ratio(
+        self, price1: pd.Series, price2: pd.Series
+    ) -> tuple[pd.Series, float]:
+        """Spread of the log prices together with the OLS hedge ratio it was built from."""
+        if not price1.index.equals(price2.index):
+            # Mismatched bars: let pandas align the spread by label
+            log_price1 = np.log(price1)
+            log_price2 = np.log(price2)
+            hedge_ratio = self._calculate_hedge_ratio(log_price1, log_price2)
+            return log_price1 - hedge_ratio * log_price2, hedge_ratio
+
+        # Same bars on both legs: log prices, OLS and spread on the raw arrays, wrapped once
+        # (log prices for better statistical properties)
+        log_price1 = np.log(price1.to_numpy(dtype=float))
+        log_price2 = np.log(price2.to_numpy(dtype=float))
 
         # Calculate hedge ratio using OLS
         hedge_ratio = self._calculate_hedge_ratio(log_price1, log_price2)
@@ -72,55 +177,61 @@ class PairAnalyzer:
         # Calculate spread
         spread = log_price1 - hedge_ratio * log_price2
 
-        return spread
-
-    def _calculate_hedge_ratio(self, series1: pd.Series, series2: pd.Series) -> float:
-        """Calculate hedge ratio using OLS regression."""
-        # Simple linear regression
-        x = series2.values.reshape(-1, 1)
-        y = series1.values
-
-        # Add constant
-        x = np.column_stack([np.ones(len(x)), x])
-
-        # OLS estimation
-        coeffs = np.linalg.lstsq(x, y, rcond=None)[0]
-
-        return coeffs[1]
+        name = price1.name if price1.name == price2.name else None  # as Series arithmetic
+        return pd.Series(spread, index=price1.index, name=name), hedge_ratio
+
+    def _calculate_hedge_ratio(
+        self, series1: pd.Series | np.ndarray, series2: pd.Series | np.ndarray
+    ) -> float:
+        """Calculate hedge ratio using OLS regression.
+
+        Slope of series1 = a + b * series2, in closed form: with the regressor
+        centered the intercept drops out and b = <xc, y> / <xc, xc>. Centering also
+        keeps the sums well conditioned for log prices, which share a large offset.
+        """
+        x = np.asarray(series2, dtype=float)
+        y = np.asarray(series1, dtype=float)
+        if not x.size:
+            return 0.0
+        xc = x - np.add.reduce(x) / x.size
+        sxx = np.dot(xc, xc)
+        if sxx == 0.0:
+            return 0.0  # constant regressor: no slope to estimate
+        return float(np.dot(xc, y) / sxx)
 
     def calculate_zscore(self, spread: pd.Series, window: int = None) -> pd.Series:
         """Calculate z-score of spread."""
         window = window or self.config.lookback_period
 
-        spread_mean = spread.rolling(window).mean()
-        spread_std = spread.rolling(window).std()
+        # pandas' rolling kernels keep their compensated sums; the z-score arithmetic
+        # runs on the raw arrays, skipping two rounds of Series index alignment
+        rolling = spread.rolling(window)
+        spread_mean = rolling.mean().to_numpy()
+        spread_std = rolling.std().to_numpy()
 
-        zscore = (spread - spread_mean) / spread_std
+        zscore = (spread.to_numpy(dtype=float) - spread_mean) / spread_std
+        limit = self.config.zscore_winsorize
+        if limit is not None:
+            # NaN warm-up values pass through np.clip untouched
+            np.clip(zscore, -limit, limit, out=zscore)
 
-        return zscore
+        return pd.Series(zscore, index=spread.index, name=spread.name)
 
     def calculate_half_life(self, spread: pd.Series) -> int:
         """Calculate mean reversion half-life."""
-        # Use OLS to estimate mean reversion speed
-        spread_lag = spread.shift(1)
-        spread_diff = spread - spread_lag
-
-        # Remove NaN values
-        spread_lag = spread_lag.dropna()
-        spread_diff = spread_diff.dropna()
-
-        # Align indices
-        common_index = spread_lag.index.intersection(spread_diff.index)
-        spread_lag = spread_lag.loc[common_index]
-        spread_diff = spread_diff.loc[common_index]
-
-        # OLS regression
-        x = spread_lag.values.reshape(-1, 1)
-        y = spread_diff.values
-
-        if len(x) > 0:
-            coeffs = np.linalg.lstsq(x, y, rcond=None)[0]
-            lambda_param = -coeffs[0]
+        # Use OLS to estimate mean reversion speed: regress the one-step change on the
+        # lagged level, without an intercept, over bars where both are known
+        values = spread.to_numpy(dtype=float)
+        spread_lag = values[:-1]
+        spread_diff = values[1:] - spread_lag
+        valid = ~np.isnan(spread_diff)  # NaN if either the bar or its lag is missing
+        if not valid.all():
+            spread_lag = spread_lag[valid]
+            spread_diff = spread_diff[valid]
+
+        sxx = np.dot(spread_lag, spread_lag)
+        if sxx > 0:
+            lambda_param = -np.dot(spread_lag, spread_diff) / sxx
 
             if lambda_param > 0:
                 half_life = int(np.log(2) / lambda_param)
@@ -129,6 +240,87 @@ class PairAnalyzer:
         return self.config.max_half_life
 
 
+def _next_true(mask: np.ndarray) -> np.ndarray:
+    """For each bar, the index of the first True at or after it (len(mask) if none).
+
+    Carries one trailing sentinel so the lookup is valid for every start in [0, n].
+    """
+    n = mask.size
+    idx = np.where(mask, np.arange(n), n)
+    return np.append(np.minimum.accumulate(idx[::-1])[::-1], n)
+
+
+def _first_stop(zscores: np.ndarray, start: int, stop: int, position: int, level: float) -> int:
+    """First bar in [start, stop) past the stop-loss level for position, else stop.
+
+    Scans in doubling chunks so the cost follows the distance to the hit rather
+    than the distance to the next exit.
+    """
+    width = 64
+    while start < stop:
+        end = min(start + width, stop)
+        segment = zscores[start:end]
+        hit = segment < level if position == 1 else segment > level
+        k = int(hit.argmax())
+        if hit[k]:
+            return start + k
+        start = end
+        width *= 2
+    return stop
+
+
+def _run_signals(
+    zscores: np.ndarray,
+    entry: float,
+    exit_threshold: float,
+    position: int,
+    entry_zscore: float | None,
+) -> tuple[np.ndarray, int, float | None]:
+    """Walk the z-scores through the entry/exit/stop state machine.
+
+    Starts from (position, entry_zscore) and returns the per-bar signals together
+    with the final state. The first bar and NaN z-scores never signal (every
+    comparison with NaN is False).
+
+    Entry and exit conditions do not depend on the state, so they are evaluated for
+    all bars at once and turned into next-event lookups; the walk then jumps from
+    one transition to the next instead of visiting every bar. Only the stop-loss
+    level depends on the entry z-score and is searched per trade. An exit and a
+    stop both close with -position, so whichever comes first decides the bar.
+    """
+    n = zscores.size
+    signals = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return signals, position, entry_zscore
+
+    short_entry = zscores > entry
+    next_entry = _next_true(short_entry | (zscores < -entry))
+    next_exit = _next_true(np.abs(zscores) < exit_threshold)
+
+    i = 1
+    while True:
+        if position == 0:
+            j = int(next_entry[i])
+            if j >= n:
+                break
+            # Short spread above +entry, long spread below -entry
+            position = -1 if short_entry[j] else 1
+            signals[j] = position
+            entry_zscore = float(zscores[j])
+        else:
+            # Stop loss: the z-score moves a further 1.0 against the entry
+            level = entry_zscore - 1 if position == 1 else entry_zscore + 1
+            j = _first_stop(zscores, i, int(next_exit[i]), position, level)
+            if j >= n:
+                break
+            signals[j] = -position  # Close position
+            position = 0
+            entry_zscore = None
+        i = j + 1
+
+    return signals, position, entry_zscore
+
+
 class PairsTradingStrategy:
     """Execute pairs trading strategy."""
 
@@ -139,57 +331,31 @@ class PairsTradingStrategy:
         self.analyzer = PairAnalyzer(config)
         self.position = 0  # -1: short spread, 0: no position, 1: long spread
         self.entry_zscore = None
+        self._last_hedge_ratio = None  # from the latest generate_signals call
 
     def generate_signals(self, price1: pd.Series, price2: pd.Series) -> pd.Series:
         """Generate trading signals."""
         # Calculate spread and z-score
-        spread = self.analyzer.calculate_spread(price1, price2)
+        spread, self._last_hedge_ratio = self.analyzer._spread_and_hedge_ratio(price1, price2)
         zscore = self.analyzer.calculate_zscore(spread)
 
         # Calculate half-life
         half_life = self.analyzer.calculate_half_life(spread)
 
         if half_life > self.config.max_half_life:
-            logger.warning(f"Half-life too long: {half_life} days")
+            logger.warning("Half-life too long: %s days", half_life)
             return pd.Series(0, index=zscore.index)  # No trading
 
-        # Generate signals
-        signals = pd.Series(0, index=zscore.index)
-
-        for i in range(1, len(zscore)):
-            if pd.isna(zscore.iloc[i]):
-                continue
-
-            current_z = zscore.iloc[i]
-
-            if self.position == 0:
-                # Entry signals
-                if current_z > self.config.zscore_entry:
-                    signals.iloc[i] = -1  # Short spread
-                    self.position = -1
-                    self.entry_zscore = current_z
-                elif current_z < -self.config.zscore_entry:
-                    signals.iloc[i] = 1  # Long spread
-                    self.position = 1
-                    self.entry_zscore = current_z
-
-            elif self.position != 0:
-                # Exit signals
-                if abs(current_z) < self.config.zscore_exit:
-                    signals.iloc[i] = -self.position  # Close position
-                    self.position = 0
-                    self.entry_zscore = None
-                # Stop loss: if z-score moves further against us
-                elif self.position == 1 and current_z < self.entry_zscore - 1:
-                    signals.iloc[i] = -1  # Close long
-                    self.position = 0
-                    self.entry_zscore = None
-                elif self.position == -1 and current_z > self.entry_zscore + 1:
-                    signals.iloc[i] = 1  # Close short
-                    self.position = 0
-                    self.entry_zscore = None
+        # Generate signals: the state machine jumps between events on the raw array
+        signals, self.position, self.entry_zscore = _run_signals(
+            zscore.to_numpy(dtype=float),
+            self.config.zscore_entry,
+            self.config.zscore_exit,
+            self.position,
+            self.entry_zscore,
+        )
 
-        return signals
+        return pd.Series(signals, index=zscore.index)
 
     def calculate_position_sizes(
         self, capital: float, price1: float, price2: float, hedge_ratio: float
@@ -209,6 +375,31 @@ class PairsTradingStrategy:
         return position1_shares, position2_shares
 
 
+# pandas < 3 forward-fills NaNs before pct_change (its default fill_method="pad")
+_PCT_CHANGE_PADS = int(pd.__version__.split(".", 1)[0]) < 3
+
+
+def _last_return(close: pd.Series, pad: bool = _PCT_CHANGE_PADS) -> float:
+    """Last bar's simple return, i.e. close.pct_change().iloc[-1] without the full Series.
+
+    With ``pad`` (the installed pandas' behaviour by default) a NaN close at either end
+    is replaced by the last valid close before it, as a forward fill would.
+    """
+    values = close.to_numpy(dtype=float)
+    n = values.size
+    if n < 2:
+        return np.nan
+    last, prev = values[-1], values[-2]
+    if pad and (np.isnan(last) or np.isnan(prev)):
+        valid = np.flatnonzero(~np.isnan(values))
+        if valid.size == 0 or valid[0] > n - 2:
+            return np.nan
+        last = values[valid[-1]]
+        prev = values[valid[valid <= n - 2][-1]]
+    with np.errstate(divide="ignore", invalid="ignore"):  # a zero close gives inf/NaN, as pandas
+        return last / prev - 1.0  # pandas' own form, bit-identical
+
+
 class PairsPortfolio:
     """Manage portfolio of pairs trades."""
 
@@ -238,18 +429,20 @@ class PairsPortfolio:
                 price2 = market_data[asset2]["close"]
 
                 # Generate signals
-                pair_signals = self.strategies[pair].generate_signals(price1, price2)
+                strategy = self.strategies[pair]
+                pair_signals = strategy.generate_signals(price1, price2)
 
                 # Calculate positions
                 if pair_signals.iloc[-1] != 0:
                     current_price1 = price1.iloc[-1]
                     current_price2 = price2.iloc[-1]
 
-                    analyzer = PairAnalyzer()
-                    hedge_ratio = analyzer._calculate_hedge_ratio(np.log(price1), np.log(price2))
-
-                    pos1, pos2 = self.strategies[pair].calculate_position_sizes(
-                        capital_per_pair, current_price1, current_price2, hedge_ratio
+                    # Same OLS fit generate_signals just built the spread from
+                    pos1, pos2 = strategy.calculate_position_sizes(
+                        capital_per_pair,
+                        current_price1,
+                        current_price2,
+                        strategy._last_hedge_ratio,
                     )
 
                     signal_value = pair_signals.iloc[-1]
@@ -277,8 +470,8 @@ class PairsPortfolio:
                 pos1 = self.positions[pair]["asset1"]
                 pos2 = self.positions[pair]["asset2"]
 
-                price1_change = market_data[asset1]["close"].pct_change().iloc[-1]
-                price2_change = market_data[asset2]["close"].pct_change().iloc[-1]
+                price1_change = _last_return(market_data[asset1]["close"])
+                price2_change = _last_return(market_data[asset2]["close"])
 
                 pair_pnl = pos1 * price1_change + pos2 * price2_change
 
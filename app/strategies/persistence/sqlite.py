@@ -71,6 +71,8 @@ SCHEMA: dict[str, str] = {
 }
 
 # Extended schema (ideation / experiments)
+# metrics/artifacts are keyed lookups on their composite primary key; WITHOUT ROWID
+# stores rows in that index directly instead of a rowid table plus a separate index.
 EXTENDED_SCHEMA: dict[str, str] = {
     "ideas": (
         """
@@ -127,7 +129,7 @@ EXTENDED_SCHEMA: dict[str, str] = {
             key TEXT,
             value REAL,
             PRIMARY KEY (run_id, key)
-        )
+        ) WITHOUT ROWID
         """
     ),
     "artifacts": (
@@ -137,8 +139,10 @@ EXTENDED_SCHEMA: dict[str, str] = {
             name TEXT,
             path TEXT,
             sha256 TEXT,
+            size_bytes INTEGER,
+            mtime_ns INTEGER,
             PRIMARY KEY (run_id, name)
-        )
+        ) WITHOUT ROWID
         """
     ),
     "decisions": (
@@ -252,9 +256,65 @@ EXTENDED_SCHEMA: dict[str, str] = {
 }
 
 
+# Prepared-statement LRU per connection (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+
 def connect(db_path: Path) -> sqlite3.Connection:
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(db_path)
+    return sqlite3.connect(db_path, cached_statements=CACHED_STATEMENTS)
+
+
+# Bulk-write tuning: WAL + NORMAL sync is durable on commit boundaries and avoids an
+# fsync per statement; cache_size is negative KiB (64 MiB).
+BULK_WRITE_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def apply_bulk_write_pragmas(conn: sqlite3.Connection) -> None:
+    """Tune a connection for large batched writes (indexers)."""
+    for pragma in BULK_WRITE_PRAGMAS:
+        conn.execute(pragma)
+
+
+# Read-side tuning for report queries. journal_mode/synchronous are left out: they
+# are write settings and a read-only (mode=ro) connection cannot switch to WAL.
+# mmap_size lets page reads of runs/metrics come straight from the OS page cache
+# instead of a pread() per page; busy_timeout waits out a concurrent indexer commit.
+READ_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def apply_read_pragmas(conn: sqlite3.Connection) -> None:
+    """Tune a (possibly read-only) connection for report queries."""
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+
+
+# Secondary indexes on the FK-like columns of the extended tables. metrics.run_id and
+# artifacts.run_id lead their composite primary keys, which already serve as the index.
+EXTENDED_INDEXES: tuple[str, ...] = (
+    "CREATE INDEX IF NOT EXISTS idx_experiments_idea ON experiments(idea_id)",
+    "CREATE INDEX IF NOT EXISTS idx_experiments_strategy ON experiments(strategy_id)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_experiment ON runs(experiment_id)",
+    "CREATE INDEX IF NOT EXISTS idx_decisions_idea ON decisions(idea_id)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_run ON incidents(run_id)",
+)
+
+
+# Columns added to extended tables after their first release; ensure_schema adds them
+# to databases created before the column existed.
+EXTENDED_ADDED_COLUMNS: dict[str, dict[str, str]] = {
+    "artifacts": {"size_bytes": "INTEGER", "mtime_ns": "INTEGER"},
+}
 
 
 def ensure_schema(conn: sqlite3.Connection, with_extended: bool = True) -> None:
@@ -264,6 +324,13 @@ def ensure_schema(conn: sqlite3.Connection, with_extended: bool = True) -> None:
     if with_extended:
         for sql in EXTENDED_SCHEMA.values():
             cur.execute(sql)
+        for table, columns in EXTENDED_ADDED_COLUMNS.items():
+            existing = {row[1] for row in cur.execute(f"PRAGMA table_info({table})")}
+            for column, decl in columns.items():
+                if column not in existing:
+                    cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+        for sql in EXTENDED_INDEXES:
+            cur.execute(sql)
     conn.commit()
 
 
@@ -273,109 +340,126 @@ def _csv(values: Iterable[Any] | None) -> str:
     return ",".join(str(v) for v in values)
 
 
-def upsert_registry(conn: sqlite3.Connection, registry: dict[str, Any]) -> None:
-    cur = conn.cursor()
+# Registry upserts, one statement per table (ids are the conflict targets)
+_UPSERT_STRATEGY_SQL = """
+    INSERT INTO strategies (
+        id, name, class_name, file_path, status, timeframes, markets,
+        indicators, parameters_json, risk_json, performance_json, tags
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name=excluded.name,
+        class_name=excluded.class_name,
+        file_path=excluded.file_path,
+        status=excluded.status,
+        timeframes=excluded.timeframes,
+        markets=excluded.markets,
+        indicators=excluded.indicators,
+        parameters_json=excluded.parameters_json,
+        risk_json=excluded.risk_json,
+        performance_json=excluded.performance_json,
+        tags=excluded.tags
+    """
 
-    for s in registry.get("strategies", []):
-        cur.execute(
-            """
-            INSERT INTO strategies (
-                id, name, class_name, file_path, status, timeframes, markets,
-                indicators, parameters_json, risk_json, performance_json, tags
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                name=excluded.name,
-                class_name=excluded.class_name,
-                file_path=excluded.file_path,
-                status=excluded.status,
-                timeframes=excluded.timeframes,
-                markets=excluded.markets,
-                indicators=excluded.indicators,
-                parameters_json=excluded.parameters_json,
-                risk_json=excluded.risk_json,
-                performance_json=excluded.performance_json,
-                tags=excluded.tags
-            """,
-            (
-                s.get("id"),
-                s.get("name"),
-                s.get("class_name"),
-                s.get("file_path"),
-                s.get("status"),
-                _csv(s.get("timeframes")),
-                _csv(s.get("markets")),
-                _csv(s.get("indicators")),
-                json.dumps(s.get("parameters", {}), ensure_ascii=False),
-                json.dumps(s.get("risk", {}), ensure_ascii=False),
-                json.dumps(s.get("performance", {}), ensure_ascii=False),
-                _csv(s.get("tags")),
-            ),
-        )
+_UPSERT_METHOD_SQL = """
+    INSERT INTO methods (
+        id, name, category, description, related_strategies, refs
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name=excluded.name,
+        category=excluded.category,
+        description=excluded.description,
+        related_strategies=excluded.related_strategies,
+        refs=excluded.refs
+    """
 
-    for m in registry.get("methods", []):
-        cur.execute(
-            """
-            INSERT INTO methods (
-                id, name, category, description, related_strategies, refs
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                name=excluded.name,
-                category=excluded.category,
-                description=excluded.description,
-                related_strategies=excluded.related_strategies,
-                refs=excluded.refs
-            """,
-            (
-                m.get("id"),
-                m.get("name"),
-                m.get("category"),
-                m.get("description"),
-                _csv(m.get("related_strategies")),
-                _csv(m.get("references")),
-            ),
-        )
+_UPSERT_CONCEPT_SQL = """
+    INSERT INTO concepts (
+        id, name, description, refs
+    ) VALUES (?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name=excluded.name,
+        description=excluded.description,
+        refs=excluded.refs
+    """
 
-    for c in registry.get("concepts", []):
-        cur.execute(
-            """
-            INSERT INTO concepts (
-                id, name, description, refs
-            ) VALUES (?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                name=excluded.name,
-                description=excluded.description,
-                refs=excluded.refs
-            """,
-            (
-                c.get("id"),
-                c.get("name"),
-                c.get("description"),
-                _csv(c.get("references")),
-            ),
-        )
+_UPSERT_SOURCE_SQL = """
+    INSERT INTO sources (
+        id, title, path, topic, quality
+    ) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        title=excluded.title,
+        path=excluded.path,
+        topic=excluded.topic,
+        quality=excluded.quality
+    """
 
-    for s in registry.get("sources", []):
-        cur.execute(
-            """
-            INSERT INTO sources (
-                id, title, path, topic, quality
-            ) VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                title=excluded.title,
-                path=excluded.path,
-                topic=excluded.topic,
-                quality=excluded.quality
-            """,
-            (
-                s.get("id"),
-                s.get("title"),
-                s.get("path"),
-                s.get("topic"),
-                s.get("quality"),
-            ),
+
+def upsert_registry(
+    conn: sqlite3.Connection, registry: dict[str, Any], replace: bool = False
+) -> None:
+    """Upsert all registry sections in one transaction (rolled back on error).
+
+    With replace=True the four registry tables are emptied first, so entries
+    dropped from the registry disappear too and every insert lands in an empty
+    table instead of taking the conflict-update path.
+    """
+    strategies = [
+        (
+            s.get("id"),
+            s.get("name"),
+            s.get("class_name"),
+            s.get("file_path"),
+            s.get("status"),
+            _csv(s.get("timeframes")),
+            _csv(s.get("markets")),
+            _csv(s.get("indicators")),
+            json.dumps(s.get("parameters", {}), ensure_ascii=False),
+            json.dumps(s.get("risk", {}), ensure_ascii=False),
+            json.dumps(s.get("performance", {}), ensure_ascii=False),
+            _csv(s.get("tags")),
+        )
+        for s in registry.get("strategies", [])
+    ]
+    methods = [
+        (
+            m.get("id"),
+            m.get("name"),
+            m.get("category"),
+            m.get("description"),
+            _csv(m.get("related_strategies")),
+            _csv(m.get("references")),
         )
+        for m in registry.get("methods", [])
+    ]
+    concepts = [
+        (
+            c.get("id"),
+            c.get("name"),
+            c.get("description"),
+            _csv(c.get("references")),
+        )
+        for c in registry.get("concepts", [])
+    ]
+    sources = [
+        (
+            s.get("id"),
+            s.get("title"),
+            s.get("path"),
+            s.get("topic"),
+            s.get("quality"),
+        )
+        for s in registry.get("sources", [])
+    ]
 
-    conn.commit()
+    with conn:
+        cur = conn.cursor()
+        if replace:
+            for table in SCHEMA:  # the registry tables, never user input
+                cur.execute(f"DELETE FROM {table}")  # noqa: S608
+        cur.executemany(_UPSERT_STRATEGY_SQL, strategies)
+        cur.executemany(_UPSERT_METHOD_SQL, methods)
+        cur.executemany(_UPSERT_CONCEPT_SQL, concepts)
+        cur.executemany(_UPSERT_SOURCE_SQL, sources)
 
 
 def get_news_articles_in_range(
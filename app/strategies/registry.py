@@ -1,15 +1,42 @@
 from __future__ import annotations
 
 import json
-import uuid
+import logging
+import secrets
 from pathlib import Path
 from typing import Any
 
 from .logging_utils import get_json_logger
-from .persistence.sqlite import connect, ensure_schema, upsert_registry
+from .persistence.sqlite import apply_bulk_write_pragmas, connect, ensure_schema, upsert_registry
 from .registry_models import RegistrySchema
 from .reporting import generate_markdown
 
+try:  # optional fast JSON parsing
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts NaN/Infinity and arbitrarily large ints; let it decide
+            pass
+    return json.loads(data)
+
+
+# Handlers and level are set up once; each call only wraps the logger in a fresh
+# adapter. Going through get_json_logger with a new correlation id every time would
+# fill its adapter cache with one-off entries.
+_LOGGER = get_json_logger("registry").logger
+
+
+def _op_logger(op: str) -> logging.LoggerAdapter:
+    """Adapter stamping one call's records with a fresh correlation id and op name."""
+    return logging.LoggerAdapter(_LOGGER, {"correlation_id": secrets.token_hex(16), "op": op})
+
 
 def load_registry(path: Path) -> dict[str, Any]:
     """Load registry JSON from path with Pydantic validation.
@@ -17,16 +44,13 @@ def load_registry(path: Path) -> dict[str, Any]:
     Raises FileNotFoundError if missing, JSONDecodeError on invalid JSON.
     Raises ValidationError if registry structure is invalid.
     """
-    cid = uuid.uuid4().hex
-    logger = get_json_logger(
-        "registry", static_fields={"correlation_id": cid, "op": "load_registry"}
-    )
+    logger = _op_logger("load_registry")
     logger.info("start", extra={"path": str(path)})
 
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = _loads(path.read_bytes())
 
     # Validate using Pydantic model
-    validated_registry = RegistrySchema(**data)
+    validated_registry = RegistrySchema.model_validate(data)
 
     logger.info("done", extra={"strategies": len(validated_registry.strategies)})
     return data
@@ -38,17 +62,15 @@ def write_markdown(registry: dict[str, Any], out_path: Path) -> None:
     out_path.write_text(md, encoding="utf-8")
 
 
-def export_sqlite(registry: dict[str, Any], db_path: Path) -> None:
-    cid = uuid.uuid4().hex
-    logger = get_json_logger(
-        "registry", static_fields={"correlation_id": cid, "op": "export_sqlite"}
-    )
+def export_sqlite(registry: dict[str, Any], db_path: Path, replace: bool = False) -> None:
+    logger = _op_logger("export_sqlite")
     logger.info("start", extra={"db_path": str(db_path)})
 
     conn = connect(db_path)
     try:
+        apply_bulk_write_pragmas(conn)
         ensure_schema(conn, with_extended=True)
-        upsert_registry(conn, registry)
+        upsert_registry(conn, registry, replace=replace)
         logger.info("done")
     finally:
         conn.close()
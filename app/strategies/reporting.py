@@ -1,19 +1,72 @@
 from __future__ import annotations
 
+import logging
+import os
 import sqlite3
+import time
 import uuid
-from datetime import datetime, timezone
-from decimal import Decimal
+from contextlib import closing, nullcontext
 from pathlib import Path
 from typing import Any
 
 from .logging_utils import get_json_logger
+from .persistence.sqlite import apply_read_pragmas
+
+# Run ids bound per IN (...) list; well under SQLite's variable limit (999 before 3.32)
+_IN_CHUNK = 500
 
 
 def _csv(values: list[Any] | None, dash: str = "-") -> str:
     if not values:
         return dash
-    return ", ".join(str(v) for v in values)
+    try:
+        # Registry lists are nearly always str already; join them without str() calls
+        return ", ".join(values)
+    except TypeError:
+        return ", ".join(map(str, values))
+
+
+def _fmt(x: Any) -> str:
+    return format(x, ".8f") if isinstance(x, (int, float)) else "-"
+
+
+def _utc_now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+# Optional-column probe results keyed by (path, mtime_ns, size, schema_version).
+# schema_version changes with every DDL statement, including ones still sitting in
+# the WAL, where the main file's mtime lags behind.
+_SCHEMA_CACHE: dict[tuple[str, int, int, int], tuple[frozenset[str], frozenset[str]]] = {}
+_SCHEMA_CACHE_MAX = 16
+
+
+def _schema_columns(cur: sqlite3.Cursor, db_path: Path) -> tuple[frozenset[str], frozenset[str]]:
+    """Column names of runs and experiments; empty when the table is missing."""
+    st = os.stat(db_path)
+    cur.execute("PRAGMA schema_version")
+    key = (str(db_path), st.st_mtime_ns, st.st_size, cur.fetchone()[0])
+    cached = _SCHEMA_CACHE.get(key)
+    if cached is None:
+        cur.execute("PRAGMA table_info(runs)")
+        run_cols = frozenset(r[1] for r in cur.fetchall())
+        cur.execute("PRAGMA table_info(experiments)")
+        exp_cols = frozenset(r[1] for r in cur.fetchall())
+        if len(_SCHEMA_CACHE) >= _SCHEMA_CACHE_MAX:
+            _SCHEMA_CACHE.clear()
+        cached = _SCHEMA_CACHE[key] = (run_cols, exp_cols)
+    return cached
+
+
+def _connect_ro(db_path: Path) -> sqlite3.Connection:
+    """Read-only connection with the read pragmas applied; closed again if they fail."""
+    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        apply_read_pragmas(con)
+    except BaseException:
+        con.close()
+        raise
+    return con
 
 
 def _safe(d: dict[str, Any], key: str, default: Any = "-") -> Any:
@@ -31,9 +84,7 @@ def generate_markdown(registry: dict[str, Any]) -> str:
         "reporting", static_fields={"correlation_id": cid, "op": "generate_markdown"}
     )
     logger.info("start", extra={"strategy_count": len(registry.get("strategies", []))})
-    updated = registry.get("updated_utc") or datetime.now(tz=timezone.utc).strftime(
-        "%Y-%m-%dT%H:%M:%SZ"
-    )
+    updated = registry.get("updated_utc") or _utc_now()
 
     lines: list[str] = []
     lines.append("# Strategier, metoder och koncept – Registry")
@@ -50,21 +101,10 @@ def generate_markdown(registry: dict[str, Any]) -> str:
     lines.append("|---|---|---|---|---|---|---|---|---|")
     for s in registry.get("strategies", []):
         lines.append(
-            "| "
-            + " | ".join(
-                [
-                    str(_safe(s, "id")),
-                    str(_safe(s, "name")),
-                    str(_safe(s, "class_name")),
-                    str(_safe(s, "file_path")),
-                    str(_safe(s, "status")),
-                    _csv(s.get("timeframes")),
-                    _csv(s.get("markets")),
-                    _csv(s.get("indicators")),
-                    _csv(s.get("tags")),
-                ]
-            )
-            + " |"
+            f"| {_safe(s, 'id')} | {_safe(s, 'name')} | {_safe(s, 'class_name')}"
+            f" | {_safe(s, 'file_path')} | {_safe(s, 'status')}"
+            f" | {_csv(s.get('timeframes'))} | {_csv(s.get('markets'))}"
+            f" | {_csv(s.get('indicators'))} | {_csv(s.get('tags'))} |"
         )
     lines.append("")
 
@@ -75,18 +115,9 @@ def generate_markdown(registry: dict[str, Any]) -> str:
     lines.append("|---|---|---|---|---|---|")
     for m in registry.get("methods", []):
         lines.append(
-            "| "
-            + " | ".join(
-                [
-                    str(_safe(m, "id")),
-                    str(_safe(m, "name")),
-                    str(_safe(m, "category")),
-                    str(_safe(m, "description")),
-                    _csv(m.get("related_strategies")),
-                    _csv(m.get("references")),
-                ]
-            )
-            + " |"
+            f"| {_safe(m, 'id')} | {_safe(m, 'name')} | {_safe(m, 'category')}"
+            f" | {_safe(m, 'description')} | {_csv(m.get('related_strategies'))}"
+            f" | {_csv(m.get('references'))} |"
         )
     lines.append("")
 
@@ -97,16 +128,8 @@ def generate_markdown(registry: dict[str, Any]) -> str:
     lines.append("|---|---|---|---|")
     for c in registry.get("concepts", []):
         lines.append(
-            "| "
-            + " | ".join(
-                [
-                    str(_safe(c, "id")),
-                    str(_safe(c, "name")),
-                    str(_safe(c, "description")),
-                    _csv(c.get("references")),
-                ]
-            )
-            + " |"
+            f"| {_safe(c, 'id')} | {_safe(c, 'name')} | {_safe(c, 'description')}"
+            f" | {_csv(c.get('references'))} |"
         )
     lines.append("")
 
@@ -117,17 +140,8 @@ def generate_markdown(registry: dict[str, Any]) -> str:
     lines.append("|---|---|---|---|---|")
     for s in registry.get("sources", []):
         lines.append(
-            "| "
-            + " | ".join(
-                [
-                    str(_safe(s, "id")),
-                    str(_safe(s, "title")),
-                    str(_safe(s, "path")),
-                    str(_safe(s, "topic")),
-                    str(_safe(s, "quality")),
-                ]
-            )
-            + " |"
+            f"| {_safe(s, 'id')} | {_safe(s, 'title')} | {_safe(s, 'path')}"
+            f" | {_safe(s, 'topic')} | {_safe(s, 'quality')} |"
         )
     lines.append("")
 
@@ -138,10 +152,14 @@ def generate_markdown(registry: dict[str, Any]) -> str:
     return out
 
 
-def generate_results_markdown_from_db(db_path: Path, limit: int = 20) -> str:
+def generate_results_markdown_from_db(
+    db_path: Path, limit: int = 20, con: sqlite3.Connection | None = None
+) -> str:
     """Generate a Markdown report of recent runs with key metrics from SQLite DB.
 
     Shows latest runs ordered by finished_utc (desc) with selected metrics.
+    Callers rendering repeatedly (e.g. a refreshing dashboard) can pass their own
+    open connection to db_path as ``con``; it is used as-is and left open.
     """
     cid = uuid.uuid4().hex
     logger = get_json_logger(
@@ -160,135 +178,104 @@ def generate_results_markdown_from_db(db_path: Path, limit: int = 20) -> str:
     ]
     logger.debug("metric_keys_to_report", extra={"keys": keys})
 
-    def _mmap(cur: sqlite3.Cursor, run_id: str) -> dict[str, float]:
-        cur.execute(
-            "SELECT key, value FROM metrics WHERE run_id = ?",
-            (run_id,),
-        )
-        # Use Decimal for monetary values to maintain precision when displaying
-        # Only convert to float for display purposes
-        result = {}
-        for k, v in cur.fetchall():
-            # For monetary values, use Decimal for better precision
-            monetary_keys = ("profit_total", "profit_total_abs", "max_drawdown_abs")
-            if k in monetary_keys:
-                decimal_v = Decimal(str(v)).quantize(Decimal("0.00000001"))
-                result[k] = float(decimal_v)
-            else:
-                result[k] = float(v)
-        return result
-
-    logger.debug("connecting_db", extra={"db_path": str(db_path)})
-    try:
-        con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        cur = con.cursor()
-    except sqlite3.OperationalError as e:
-        logger.error("db_connect_failed", extra={"db_path": str(db_path), "error": str(e)})
-        return f"# Fel: Kunde inte ansluta till databasen\n\nKunde inte öppna: `{db_path}`. Kontrollera att filen existerar och har korrekta läsbehörigheter."
-
-    # Detect optional columns/tables for backward compatibility
-    cur.execute("PRAGMA table_info(runs)")
-    run_cols = {r[1] for r in cur.fetchall()}  # type: ignore[index]
-    cur.execute("PRAGMA table_info(experiments)")
-    exp_cols = {r[1] for r in cur.fetchall()}  # type: ignore[index]
-    logger.debug(
-        "db_schema_info",
-        extra={"run_columns": list(run_cols), "experiment_columns": list(exp_cols)},
-    )
+    def _mmap_many(cur: sqlite3.Cursor, run_ids: list[str]) -> dict[str, dict[str, float]]:
+        """Reported metrics of all run_ids, bucketed per run, in one query per id chunk."""
+        by_run: dict[str, dict[str, float]] = {}
+        key_marks = ",".join("?" * len(keys))
+        # Monetary values are rounded to the 8 decimals the indexer stores and _fmt shows
+        monetary_keys = ("profit_total", "profit_total_abs", "max_drawdown_abs")
+        for i in range(0, len(run_ids), _IN_CHUNK):
+            chunk = run_ids[i : i + _IN_CHUNK]
+            id_marks = ",".join("?" * len(chunk))
+            cur.execute(
+                "SELECT run_id, key, value FROM metrics"  # noqa: S608
+                f" WHERE run_id IN ({id_marks}) AND key IN ({key_marks})",
+                (*chunk, *keys),
+            )
+            for rid, k, v in cur:
+                if k in monetary_keys:
+                    by_run.setdefault(rid, {})[k] = round(float(v), 8)
+                else:
+                    by_run.setdefault(rid, {})[k] = float(v)
+        return by_run
 
-    # Always select the core columns; we'll fetch optional fields per-row later
-    cur.execute(
-        "SELECT id, experiment_id, kind, started_utc, finished_utc, status FROM runs ORDER BY finished_utc DESC LIMIT ?",
-        (limit,),
-    )
-    rows: list[tuple[str, str, str, str, str, str]] = cur.fetchall()
-    logger.info("runs_fetched", extra={"count": len(rows)})
-    con.close()
+    owned = con is None
+    if con is None:
+        logger.debug("connecting_db", extra={"db_path": str(db_path)})
+        try:
+            con = _connect_ro(db_path)
+        except sqlite3.OperationalError as e:
+            logger.error("db_connect_failed", extra={"db_path": str(db_path), "error": str(e)})
+            return f"# Fel: Kunde inte ansluta till databasen\n\nKunde inte öppna: `{db_path}`. Kontrollera att filen existerar och har korrekta läsbehörigheter."
+    cur = con.cursor()
 
-    now_utc = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    lines: list[str] = []
-    lines.append("# Resultat – senaste körningar")
-    lines.append("")
-    lines.append(f"Genererad (UTC): {now_utc}")
-    lines.append("")
+    # One connection serves every query of the report
+    with closing(con) if owned else nullcontext(con):
+        # Detect optional columns/tables for backward compatibility
+        run_cols, exp_cols = _schema_columns(cur, db_path)
+        logger.debug(
+            "db_schema_info",
+            extra={"run_columns": list(run_cols), "experiment_columns": list(exp_cols)},
+        )
+
+        # Optional fields ride along in the same SELECT (NULL when the column is
+        # missing); config_hash as a scalar subquery so the runs scan and its
+        # ORDER BY stay exactly as before
+        data_window_sql = "r.data_window" if "data_window" in run_cols else "NULL"
+        config_hash_sql = (
+            "(SELECT config_hash FROM experiments e WHERE e.id = r.experiment_id)"
+            if "config_hash" in exp_cols
+            else "NULL"
+        )
+        cur.execute(
+            "SELECT r.id, r.experiment_id, r.kind, r.started_utc, r.finished_utc, r.status,"  # noqa: S608
+            f" {data_window_sql}, {config_hash_sql}"
+            " FROM runs r ORDER BY r.finished_utc DESC LIMIT ?",
+            (limit,),
+        )
+        rows: list[tuple[str, str, str, str, str, str, Any, Any]] = cur.fetchall()
+        logger.info("runs_fetched", extra={"count": len(rows)})
 
-    if not rows:
-        lines.append("Inga körningar hittades.")
-        out = "\n".join(lines) + "\n"
-        logger.info("done", extra={"rows": 0})
-        return out
+        now_utc = _utc_now()
+        lines: list[str] = []
+        lines.append("# Resultat – senaste körningar")
+        lines.append("")
+        lines.append(f"Genererad (UTC): {now_utc}")
+        lines.append("")
 
-    # Table header (include Data Window and Config Hash)
-    lines.append(
-        "| Run ID | Status | Start | Slut | Typ | Data Window | Config Hash | profit_total | profit_total_abs | sharpe | sortino | max_dd_abs | winrate | loss | trades |"
-    )
-    lines.append("|---|---|---|---|---|---|---|---:|---:|---:|---:|---:|---:|---:|---:|")
+        if not rows:
+            lines.append("Inga körningar hittades.")
+            out = "\n".join(lines) + "\n"
+            logger.info("done", extra={"rows": 0})
+            return out
 
-    con = sqlite3.connect(db_path)
-    cur = con.cursor()
-    # Re-compute presence flags in this connection
-    cur.execute("PRAGMA table_info(runs)")
-    run_cols = {r[1] for r in cur.fetchall()}  # type: ignore[index]
-    cur.execute("PRAGMA table_info(experiments)")
-    exp_cols = {r[1] for r in cur.fetchall()}  # type: ignore[index]
-    logger.debug(
-        "db_schema_info",
-        extra={"run_columns": list(run_cols), "experiment_columns": list(exp_cols)},
-    )
-    for rid, exp, kind, started, finished, status in rows:
-        mmap = _mmap(cur, rid)
-        vals = [mmap.get(k, None) for k in keys]
-        fmt = lambda x: (f"{x:.8f}" if isinstance(x, (int, float)) else "-")
-        # Optional fields with graceful fallback
-        data_window = "-"
-        if "data_window" in run_cols:
-            try:
-                cur.execute("SELECT data_window FROM runs WHERE id = ?", (rid,))
-                dw_row = cur.fetchone()
-                if dw_row and dw_row[0]:
-                    data_window = str(dw_row[0])
-                    logger.debug(
-                        "found_data_window", extra={"run_id": rid, "data_window": data_window}
-                    )
-            except Exception as e:
-                logger.warning("data_window_fetch_failed", extra={"run_id": rid, "error": str(e)})
-                data_window = "-"
-
-        config_hash = "-"
-        if "config_hash" in exp_cols:
-            try:
-                cur.execute("SELECT config_hash FROM experiments WHERE id = ?", (exp,))
-                ch_row = cur.fetchone()
-                if ch_row and ch_row[0]:
-                    config_hash = str(ch_row[0])
-                    logger.debug(
-                        "found_config_hash",
-                        extra={"run_id": rid, "experiment_id": exp, "config_hash": config_hash},
-                    )
-            except Exception as e:
-                logger.warning(
-                    "config_hash_fetch_failed",
-                    extra={"run_id": rid, "experiment_id": exp, "error": str(e)},
-                )
-                config_hash = "-"
+        # Table header (include Data Window and Config Hash)
         lines.append(
-            "| "
-            + " | ".join(
-                [
-                    rid,
-                    status or "-",
-                    started or "-",
-                    finished or "-",
-                    kind or "-",
-                    data_window,
-                    config_hash,
-                    *[fmt(v) for v in vals],
-                ]
-            )
-            + " |"
+            "| Run ID | Status | Start | Slut | Typ | Data Window | Config Hash | profit_total | profit_total_abs | sharpe | sortino | max_dd_abs | winrate | loss | trades |"
         )
-    con.close()
-    logger.debug("db_connection_closed")
+        lines.append("|---|---|---|---|---|---|---|---:|---:|---:|---:|---:|---:|---:|---:|")
+
+        metrics_by_run = _mmap_many(cur, [r[0] for r in rows])
+        for rid, _exp, kind, started, finished, status, dw, ch in rows:
+            mmap = metrics_by_run.get(rid, {})
+            vals = [mmap.get(k, None) for k in keys]
+            data_window = str(dw) if dw else "-"
+            config_hash = str(ch) if ch else "-"
+            lines.append(
+                f"| {rid} | {status or '-'} | {started or '-'} | {finished or '-'} | {kind or '-'}"
+                f" | {data_window} | {config_hash} | {' | '.join([_fmt(v) for v in vals])} |"
+            )
+        # One aggregate record instead of a debug call per row and field
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "optional_fields_found",
+                extra={
+                    "found_data_window_count": sum(1 for r in rows if r[6]),
+                    "found_config_hash_count": sum(1 for r in rows if r[7]),
+                },
+            )
+    if owned:
+        logger.debug("db_connection_closed")
 
     lines.append("")
     lines.append(f"Nycklar: {', '.join(keys)}")
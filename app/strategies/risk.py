@@ -331,7 +331,7 @@ class RiskManager:
                 # File was deleted between glob and stat, not active
                 continue
             except Exception as e:
-                logger.warning(f"Could not process lock file {p.name}: {e}")
+                logger.warning("Could not process lock file %s: %s", p.name, e)
                 continue  # Potentially corrupted, do not count as active
 
             if age > ttl:
@@ -343,7 +343,7 @@ class RiskManager:
                 try:
                     p.unlink()
                 except OSError as e:
-                    logger.error(f"Failed to remove stale lock {p.name}: {e}")
+                    logger.error("Failed to remove stale lock %s: %s", p.name, e)
                 continue  # Go to next file, do not count this stale lock.
 
             # If we reach here, the lock is not stale and is considered active.
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.strategies.ensemble import (
+    AdaptiveEnsemble,
+    EnsembleVoter,
+    StrategySignal,
+    VotingConfig,
+    _RollingStats,
+)
+
+
+def test_rolling_stats_match_numpy_over_window() -> None:
+    rng = np.random.default_rng(7)
+    stats = _RollingStats(window=25)
+    seen: list[float] = []
+    for _ in range(200):
+        x = float(rng.uniform(-5, 5))
+        stats.add(x)
+        seen.append(x)
+        tail = seen[-25:]
+        assert stats.mean == pytest.approx(np.mean(tail))
+        assert stats.std == pytest.approx(np.std(tail), abs=1e-9)
+
+
+def test_rebalance_weights_uses_recent_window() -> None:
+    ens = AdaptiveEnsemble(lookback=3)
+    for p in (-10.0, -10.0, 1.0, 2.0, 3.0):
+        ens.track_performance("a", p)
+    for p in (1.0, 1.0, 1.0):
+        ens.track_performance("b", p)
+
+    ens.rebalance_weights()
+
+    # a: mean 2 / std sqrt(2/3); b: constant profit -> raw mean
+    perf_a = 2.0 / np.std([1.0, 2.0, 3.0])
+    assert ens.weights["a"] == pytest.approx(perf_a / (perf_a + 1.0))
+    assert ens.weights["b"] == pytest.approx(1.0 / (perf_a + 1.0))
+    assert ens.voter.config.weights == ens.weights
+
+
+@pytest.mark.parametrize("lookback", [0, -5])
+def test_adaptive_ensemble_rejects_empty_window(lookback: int) -> None:
+    with pytest.raises(ValueError, match="lookback must be at least 1"):
+        AdaptiveEnsemble(lookback=lookback)
+
+
+def test_rebalance_weights_warns_when_lookback_exceeds_window(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    ens = AdaptiveEnsemble(lookback=3)
+    for p in (-10.0, 1.0, 2.0, 3.0):
+        ens.track_performance("a", p)
+
+    with caplog.at_level("WARNING", logger="ensemble"):
+        ens.rebalance_weights(lookback=3)
+        assert not caplog.records
+        ens.rebalance_weights(lookback=10)
+
+    assert [r.levelname for r in caplog.records] == ["WARNING"]
+    assert "lookback 10 exceeds the ensemble window 3" in caplog.records[0].getMessage()
+    # Still rebalanced, over the capped window
+    assert ens.weights == {"a": 1.0}
+
+
+@pytest.mark.parametrize(
+    "method,expected",
+    [
+        ("majority", ("buy", 2 / 3)),
+        ("weighted", ("hold", pytest.approx(0.5))),
+        ("confidence", ("sell", 0.95)),
+    ],
+)
+def test_vote_methods(method: str, expected: tuple) -> None:
+    voter = EnsembleVoter(VotingConfig(voting_method=method, confidence_threshold=0.6))
+    signals = [
+        StrategySignal("a", "buy", 0.8),
+        StrategySignal("b", "buy", 0.7),
+        StrategySignal("c", "sell", 0.95),
+    ]
+    assert voter.vote(signals) == expected
+
+
+@pytest.mark.parametrize(
+    "order,expected",
+    [
+        (("sell", "buy"), "sell"),
+        (("buy", "sell"), "buy"),
+        (("hold", "sell", "buy", "sell", "hold"), "hold"),
+    ],
+)
+def test_majority_vote_ties_go_to_first_signal(order: tuple[str, ...], expected: str) -> None:
+    voter = EnsembleVoter(VotingConfig(voting_method="majority", min_agreement=0.0))
+    signals = [StrategySignal(f"s{i}", sig, 0.9) for i, sig in enumerate(order)]
+    assert voter.vote(signals)[0] == expected
+
+    voter.record_outcome(signals, expected, 1.0)
+    assert voter.analyze_performance()["accuracy"] == 1.0
+
+
+def test_strategy_signal_rejects_unknown_signal() -> None:
+    with pytest.raises(ValueError, match="'long'"):
+        StrategySignal("a", "long", 0.5)
+
+
+def test_record_outcome_rejects_unknown_signal_without_recording() -> None:
+    voter = EnsembleVoter()
+    signals = [StrategySignal("a", "buy", 0.8), StrategySignal("b", "sell", 0.6)]
+    signals[1].signal = "long"
+
+    with pytest.raises(ValueError, match="'long'"):
+        voter.record_outcome(signals, "buy", 1.0)
+    assert len(voter.voting_history) == 0
+    assert voter.voting_history.signal == []
+    assert voter.analyze_performance() == {}
+
+
+@pytest.mark.parametrize("method", ["majority", "weighted", "confidence", "unknown"])
+def test_analyze_performance_matches_per_record_votes(method: str) -> None:
+    rng = np.random.default_rng(11)
+    weights = {"s0": 0.0, "s1": 2.0, "s2": 0.5}
+    voter = EnsembleVoter(VotingConfig(voting_method=method, weights=weights))
+    history = []
+    for _ in range(300):
+        signals = [
+            StrategySignal(
+                f"s{rng.integers(0, 4)}",
+                ("buy", "sell", "hold")[rng.integers(0, 3)],
+                float(rng.random()),
+            )
+            for _ in range(rng.integers(0, 6))
+        ]
+        outcome = ("buy", "sell", "hold", "flat")[rng.integers(0, 4)]
+        profit = float(rng.normal())
+        voter.record_outcome(signals, outcome, profit)
+        history.append((signals, outcome, profit))
+
+    expected_correct = sum(voter.vote(sig)[0] == out for sig, out, _ in history)
+    result = voter.analyze_performance()
+    assert result["total_votes"] == len(history)
+    assert result["accuracy"] == expected_correct / len(history)
+    assert result["total_profit"] == pytest.approx(sum(p for _, _, p in history))
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from app.strategies.metrics import index_hyperopts
+from app.strategies.metrics import _FTHYPT_TS_RE, MetricsIndexer, index_hyperopts
 
 
 def test_index_hyperopts() -> None:
@@ -76,5 +77,228 @@ def test_index_hyperopts_with_decimal_precision() -> None:
         assert count == 1
 
 
+def test_index_hyperopts_commits_single_transaction_in_wal_mode() -> None:
+    """All trials land in one committed transaction and the DB is left in WAL mode."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hyperopt_dir = Path(tmp_dir)
+        fthypt_path = hyperopt_dir / "strategy_TestStrategy_2025-01-01_12-00-00.fthypt"
+        with fthypt_path.open("w", encoding="utf-8") as f:
+            for i in range(50):
+                f.write(json.dumps({"loss": i / 100, "params_dict": {"p": i}}) + "\n")
+
+        db_path = hyperopt_dir / "test.db"
+        assert index_hyperopts(hyperopt_dir, db_path) == 50
+
+        con = sqlite3.connect(db_path)
+        try:
+            assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert con.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 50
+            assert (
+                con.execute("SELECT COUNT(*) FROM metrics WHERE key='param.p'").fetchone()[0] == 50
+            )
+        finally:
+            con.close()
+
+
+def test_index_hyperopts_binary_reader_handles_crlf_and_nan() -> None:
+    """CRLF line endings, blank lines and NaN literals parse the same as before."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hyperopt_dir = Path(tmp_dir)
+        fthypt_path = hyperopt_dir / "strategy_TestStrategy_2025-01-01_12-00-00.fthypt"
+        fthypt_path.write_bytes(
+            b'{"loss": 0.5, "params_dict": {"p": 1}}\r\n'
+            b"\r\n"
+            b'{"loss": NaN, "params_dict": {"p": 2}}\r\n'
+            b"{broken\r\n"
+        )
+
+        db_path = hyperopt_dir / "test.db"
+        assert index_hyperopts(hyperopt_dir, db_path) == 2
+
+
+def test_fthypt_filename_regex() -> None:
+    m = _FTHYPT_TS_RE.search("strategy_TestStrategy_2025-01-01_12-00-00.fthypt")
+    assert m is not None
+    assert m.groups() == ("2025-01-01", "12-00-00")
+    assert _FTHYPT_TS_RE.search("strategy_TestStrategy_2025-01-01_12-00-00\\.fthypt") is None
+
+
+def test_index_hyperopts_ids_from_filename_timestamp() -> None:
+    """Class names with underscores survive and the run id uses the parsed timestamp."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hyperopt_dir = Path(tmp_dir)
+        fthypt_path = hyperopt_dir / "strategy_My_Strat_2025-02-01_01-02-03.fthypt"
+        fthypt_path.write_text(json.dumps({"loss": 0.1}) + "\n", encoding="utf-8")
+
+        db_path = hyperopt_dir / "test.db"
+        assert index_hyperopts(hyperopt_dir, db_path) == 1
+
+        con = sqlite3.connect(db_path)
+        try:
+            run_id, exp_id = con.execute("SELECT id, experiment_id FROM runs").fetchone()
+        finally:
+            con.close()
+        assert run_id == "hp:My_Strat:2025-02-01_01-02-03:00001"
+        assert exp_id == "exp:hyperopt:My_Strat:2025-02-01_01-02-03"
+
+
+def test_index_hyperopts_process_pool_matches_inline() -> None:
+    """Worker processes produce the same rows as the inline path."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hyperopt_dir = Path(tmp_dir)
+        for n in range(3):
+            fthypt_path = hyperopt_dir / f"strategy_S{n}_2025-01-0{n + 1}_12-00-00.fthypt"
+            lines = [
+                json.dumps({"loss": i / 7, "params_dict": {"p": i, "b": i % 2 == 0}})
+                for i in range(5)
+            ] + ["{bad"]
+            fthypt_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        dumps = []
+        for workers in (1, 2):
+            db_path = hyperopt_dir / f"test{workers}.db"
+            assert index_hyperopts(hyperopt_dir, db_path, max_workers=workers) == 15
+            con = sqlite3.connect(db_path)
+            try:
+                dumps.append(
+                    (
+                        con.execute("SELECT * FROM runs ORDER BY id").fetchall(),
+                        con.execute(
+                            "SELECT * FROM metrics WHERE key != 'parse_ms' ORDER BY run_id, key"
+                        ).fetchall(),
+                        con.execute("SELECT * FROM artifacts ORDER BY run_id").fetchall(),
+                    )
+                )
+            finally:
+                con.close()
+        assert dumps[0] == dumps[1]
+
+
+def test_index_hyperopts_parses_inline_by_default(monkeypatch) -> None:
+    """Without max_workers no worker processes are started."""
+    import app.strategies.metrics as metrics_mod
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started without max_workers")
+
+    monkeypatch.setattr(metrics_mod, "ProcessPoolExecutor", no_pool)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hyperopt_dir = Path(tmp_dir)
+        for n in range(3):
+            fthypt_path = hyperopt_dir / f"strategy_S{n}_2025-01-0{n + 1}_12-00-00.fthypt"
+            fthypt_path.write_text(json.dumps({"loss": n}) + "\n", encoding="utf-8")
+        assert index_hyperopts(hyperopt_dir, hyperopt_dir / "test.db") == 3
+
+
+def test_index_hyperopts_reuses_hash_of_unchanged_file(monkeypatch) -> None:
+    """A second run skips hashing when size and mtime match; old DBs get the new columns."""
+    import app.strategies.metrics as metrics_mod
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hyperopt_dir = Path(tmp_dir)
+        fthypt_path = hyperopt_dir / "strategy_TestStrategy_2025-01-01_12-00-00.fthypt"
+        fthypt_path.write_text(json.dumps({"loss": 0.1}) + "\n", encoding="utf-8")
+        db_path = hyperopt_dir / "test.db"
+
+        # Pre-existing DB with the old artifacts layout (no size/mtime columns)
+        con = sqlite3.connect(db_path)
+        con.execute(
+            "CREATE TABLE artifacts (run_id TEXT, name TEXT, path TEXT, sha256 TEXT,"
+            " PRIMARY KEY (run_id, name))"
+        )
+        con.commit()
+        con.close()
+
+        calls: list[Path] = []
+        real_sha = metrics_mod._sha256_file
+        monkeypatch.setattr(metrics_mod, "_sha256_file", lambda p: calls.append(p) or real_sha(p))
+
+        index_hyperopts(hyperopt_dir, db_path, max_workers=1)
+        index_hyperopts(hyperopt_dir, db_path, max_workers=1)
+        assert calls == [fthypt_path]
+
+        fthypt_path.write_text(json.dumps({"loss": 0.25}) + "\n", encoding="utf-8")
+        index_hyperopts(hyperopt_dir, db_path, max_workers=1)
+        assert calls == [fthypt_path, fthypt_path]
+
+        con = sqlite3.connect(db_path)
+        try:
+            size, sha = con.execute("SELECT size_bytes, sha256 FROM artifacts").fetchone()
+        finally:
+            con.close()
+        assert size == fthypt_path.stat().st_size
+        assert sha == real_sha(fthypt_path)
+
+
+def test_index_hyperopts_strict_validate_flag() -> None:
+    """Soft validation (default) keeps JSON objects; strict mode applies the Pydantic model."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hyperopt_dir = Path(tmp_dir)
+        fthypt_path = hyperopt_dir / "strategy_TestStrategy_2025-01-01_12-00-00.fthypt"
+        fthypt_path.write_text(
+            "\n".join([json.dumps({"loss": 0.1}), json.dumps({"loss": "bad"}), "[1, 2]"]) + "\n",
+            encoding="utf-8",
+        )
+
+        assert index_hyperopts(hyperopt_dir, hyperopt_dir / "soft.db") == 2
+        assert index_hyperopts(hyperopt_dir, hyperopt_dir / "strict.db", strict_validate=True) == 1
+
+
+def test_index_hyperopts_missing_dir_and_non_files() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base = Path(tmp_dir)
+        assert index_hyperopts(base / "missing", base / "a.db") == 0
+
+        (base / "dir.fthypt").mkdir()
+        (base / ".hidden.fthypt").write_text(json.dumps({"loss": 1}) + "\n", encoding="utf-8")
+        assert index_hyperopts(base, base / "b.db") == 0
+
+
+def test_metrics_indexer_reuses_one_connection() -> None:
+    """Consecutive passes share the connection; each pass commits on its own."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base = Path(tmp_dir)
+        (base / "hp").mkdir()
+        (base / "bt").mkdir()
+        fthypt_path = base / "hp" / "strategy_TestStrategy_2025-01-01_12-00-00.fthypt"
+        fthypt_path.write_text(json.dumps({"loss": 0.1}) + "\n", encoding="utf-8")
+        db_path = base / "test.db"
+
+        with MetricsIndexer(db_path) as indexer:
+            conn = indexer.conn
+            assert indexer.index_backtests(base / "bt", max_workers=1) == 0
+            assert indexer.index_hyperopts(base / "hp", max_workers=1) == 1
+            assert indexer.conn is conn
+            assert not conn.in_transaction
+
+        con = sqlite3.connect(db_path)
+        try:
+            assert con.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+        finally:
+            con.close()
+
+
+def test_metrics_indexer_keeps_original_error_when_sqlite_rolled_back() -> None:
+    """A pass failing after SQLite ended the transaction re-raises its own error."""
+
+    def _aborted(cur):
+        cur.execute("INSERT INTO metrics (run_id, key, value) VALUES ('r', 'k', 1.0)")
+        cur.execute("ROLLBACK")  # as SQLite does itself on disk-full or I/O errors
+        raise sqlite3.OperationalError("disk I/O error")
+
+    def _failing(cur):
+        cur.execute("INSERT INTO metrics (run_id, key, value) VALUES ('r', 'k', 1.0)")
+        raise ValueError("boom")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with MetricsIndexer(Path(tmp_dir) / "test.db") as indexer:
+            with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+                indexer._run(_aborted)
+            with pytest.raises(ValueError, match="boom"):
+                indexer._run(_failing)
+            assert not indexer.conn.in_transaction
+            assert indexer.conn.execute("SELECT COUNT(*) FROM metrics").fetchone()[0] == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.strategies.introspect import discover_strategies, parse_strategy_file
+
+STRATEGY_SRC = '''
+from freqtrade.strategy import IStrategy, IntParameter, DecimalParameter
+
+
+class DemoStrategy(IStrategy):
+    """Demo EMA/RSI strategy."""
+
+    timeframe = "5m"
+    fast = IntParameter(5, 20, default=9)
+    slope = DecimalParameter(0.1, 1.0, default=0.5)
+
+    def populate_indicators(self, dataframe, metadata):
+        dataframe["ema"] = ta.EMA(dataframe)
+        dataframe["rsi"] = ta.RSI(dataframe)
+        return dataframe
+
+
+class Helper:
+    timeframe = "1h"
+'''
+
+
+def test_parse_strategy_file_extracts_fields(tmp_path: Path) -> None:
+    p = tmp_path / "demo.py"
+    p.write_text(STRATEGY_SRC, encoding="utf-8")
+
+    (info,) = parse_strategy_file(p)
+    assert info.class_name == "DemoStrategy"
+    assert info.timeframe == "5m"
+    assert [(x.name, x.kind) for x in info.parameters] == [
+        ("fast", "IntParameter"),
+        ("slope", "DecimalParameter"),
+    ]
+    assert info.indicators == ["EMA", "RSI"]
+    assert info.docstring == "Demo EMA/RSI strategy."
+
+
+def test_parse_strategy_file_reparses_after_edit(tmp_path: Path) -> None:
+    p = tmp_path / "demo.py"
+    p.write_text(STRATEGY_SRC, encoding="utf-8")
+    assert parse_strategy_file(p)[0].timeframe == "5m"
+
+    p.write_text(STRATEGY_SRC.replace('"5m"', '"15m"'), encoding="utf-8")
+    assert parse_strategy_file(p)[0].timeframe == "15m"
+
+
+def test_discover_strategies_skips_unparsable_files(tmp_path: Path) -> None:
+    (tmp_path / "b_demo.py").write_text(STRATEGY_SRC, encoding="utf-8")
+    (tmp_path / "a_broken.py").write_text("class BrokenStrategy(:\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("class TextStrategy: pass\n", encoding="utf-8")
+    # Files without any Strategy class are skipped before parsing, even if invalid
+    (tmp_path / "c_helpers.py").write_text("def helper(:\n", encoding="utf-8")
+
+    items = discover_strategies(tmp_path)
+    assert [it.class_name for it in items] == ["DemoStrategy"]
+
+
+def test_parse_strategy_file_cache_keeps_one_entry_and_hands_out_copies(tmp_path: Path) -> None:
+    from app.strategies.introspect import _PARSE_CACHE
+
+    p = tmp_path / "demo.py"
+    p.write_text(STRATEGY_SRC, encoding="utf-8")
+    (first,) = parse_strategy_file(p)
+    first.parameters[0].name = "mutated"
+    first.indicators.append("MUTATED")
+
+    (again,) = parse_strategy_file(p)
+    assert again.parameters[0].name == "fast"
+    assert again.indicators == ["EMA", "RSI"]
+
+    p.write_text(STRATEGY_SRC.replace('"5m"', '"15m"'), encoding="utf-8")
+    parse_strategy_file(p)
+    assert [k for k in _PARSE_CACHE if k.startswith(str(tmp_path))] == [str(p)]
+    assert _PARSE_CACHE[str(p)][1][0].timeframe == "15m"
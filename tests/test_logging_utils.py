@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+from app.strategies.logging_utils import (
+    JsonFormatter,
+    _refresh_env,
+    _stop_file_listeners,
+    get_json_logger,
+)
+
+
+def _make_logger(name: str) -> tuple[logging.Logger, io.StringIO]:
+    stream = io.StringIO()
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+    logger.propagate = False
+    return logger, stream
+
+
+def test_json_formatter_keeps_unicode_and_serializable_extras() -> None:
+    logger, stream = _make_logger("json-formatter-test")
+    logger.info(
+        "åäö ✓",
+        extra={"pair": "BTC/USDT", "counts": {1: 2}, "tags": ["a", "b"], "obj": object()},
+    )
+
+    line = stream.getvalue().strip()
+    assert "åäö ✓" in line
+    rec = json.loads(line)
+    assert rec["message"] == "åäö ✓"
+    assert rec["level"] == "INFO"
+    assert rec["logger"] == "json-formatter-test"
+    assert rec["pair"] == "BTC/USDT"
+    assert rec["counts"] == {"1": 2}
+    assert rec["tags"] == ["a", "b"]
+    # Non-serializable extras are dropped rather than failing the record
+    assert "obj" not in rec
+
+
+def test_json_formatter_keeps_ints_wider_than_64_bits() -> None:
+    logger, stream = _make_logger("json-formatter-bigint-test")
+    logger.info("big", extra={"n": 2**70, "nested": [2**64, 1]})
+
+    rec = json.loads(stream.getvalue())
+    assert rec["n"] == 1180591620717411303424
+    assert rec["nested"] == [2**64, 1]
+
+
+def test_json_formatter_plain_record_uses_record_time() -> None:
+    record = logging.LogRecord(
+        'strategy"x', logging.WARNING, __file__, 1, 'said "%s"\n', ("hi",), None
+    )
+    record.created = 1_700_000_000.25
+
+    rec = json.loads(JsonFormatter().format(record))
+    assert rec == {
+        "ts": "2023-11-14T22:13:20.250000+00:00",
+        "level": "WARNING",
+        "logger": 'strategy"x',
+        "message": 'said "hi"\n',
+    }
+
+    record.created = 1_700_000_001.0
+    assert json.loads(JsonFormatter().format(record))["ts"] == "2023-11-14T22:13:21+00:00"
+
+
+def test_get_json_logger_reuses_adapter_per_fields(monkeypatch) -> None:
+    monkeypatch.delenv("CORRELATION_ID", raising=False)
+    _refresh_env()
+    a = get_json_logger("adapter-cache-test", static_fields={"op": "x"})
+    assert get_json_logger("adapter-cache-test", static_fields={"op": "x"}) is a
+    assert get_json_logger("adapter-cache-test", static_fields={"op": "y"}) is not a
+
+    # Equal values of different types (True == 1 == 1.0) get their own adapters
+    flags = [get_json_logger("adapter-cache-test", static_fields={"n": v}) for v in (1, True, 1.0)]
+    assert [type(f.extra["n"]) for f in flags] == [int, bool, float]
+
+    # Unhashable field values still work, just without caching
+    b = get_json_logger("adapter-cache-test", static_fields={"tags": ["a"]})
+    assert b.extra == {"tags": ["a"]}
+
+    monkeypatch.setenv("CORRELATION_ID", "cid-1")
+    # Env is read once; refresh picks up the change and drops cached adapters
+    assert get_json_logger("adapter-cache-test", static_fields={"op": "x"}) is a
+    _refresh_env()
+    c = get_json_logger("adapter-cache-test", static_fields={"op": "x"})
+    assert c is not a
+    assert c.extra == {"op": "x", "correlation_id": "cid-1"}
+
+    monkeypatch.delenv("CORRELATION_ID")
+    _refresh_env()
+
+
+def test_get_json_logger_writes_file_via_background_listener(tmp_path) -> None:
+    log_file = tmp_path / "logs" / "bot.jsonl"
+    logger = get_json_logger("queued-file-test", log_path=log_file, static_fields={"run_id": "r1"})
+    try:
+        logger.info("queued %s", "line")
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("failed")
+    finally:
+        _stop_file_listeners()
+        logging.getLogger("queued-file-test").handlers.clear()
+
+    lines = [json.loads(x) for x in log_file.read_text(encoding="utf-8").splitlines()]
+    assert [x["message"] for x in lines] == ["queued line", "failed"]
+    assert all(x["run_id"] == "r1" for x in lines)
+    assert lines[1]["level"] == "ERROR"
+
+
+def test_get_json_logger_reapplies_level_and_handlers_on_cache_hit() -> None:
+    name = "adapter-level-test"
+    get_json_logger(name, level=logging.DEBUG)
+    get_json_logger(name, level=logging.INFO)
+    adapter = get_json_logger(name, level=logging.DEBUG)
+    logger = logging.getLogger(name)
+    try:
+        assert adapter.logger is logger
+        assert logger.level == logging.DEBUG
+
+        logger.handlers.clear()
+        get_json_logger(name, level=logging.DEBUG)
+        assert len(logger.handlers) == 1
+    finally:
+        logger.handlers.clear()
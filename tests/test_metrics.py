@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import sqlite3
 import tempfile
 import zipfile
 from decimal import Decimal
 from pathlib import Path
 
+import app.strategies.metrics as metrics_mod
 from app.strategies.metrics import (
+    _METRIC_VALUES_ROWS,
+    BacktestMeta,
+    _find_zip,
     _parse_zip_metrics,
+    _process_zip,
     _upsert_metric,
+    _upsert_metrics_many,
     _validate_backtest_payload,
     _validate_hyperopt_trial,
+    index_backtests,
 )
 
 
@@ -82,6 +91,57 @@ def test_parse_zip_metrics() -> None:
     zip_path.unlink()
 
 
+def test_process_zip_single_open(tmp_path: Path) -> None:
+    """_process_zip returns file hash, config hash and summary metrics together."""
+    zip_path = tmp_path / "run.zip"
+    cfg = json.dumps({"stake_currency": "USDT"}).encode()
+    summary = {"strategy": {"S": {"profit_total": 0.123456789, "total_trades": 7}}}
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("run_config.json", cfg)
+        zf.writestr("run_S.py", "class S: ...")
+        zf.writestr("run.json", json.dumps(summary))
+
+    sha, config_hash, metrics = _process_zip(zip_path)
+
+    assert sha == hashlib.sha256(zip_path.read_bytes()).hexdigest()
+    assert config_hash == hashlib.sha256(cfg).hexdigest()
+    assert metrics == _parse_zip_metrics(zip_path) == {"profit_total": 0.12345679, "trades": 7.0}
+
+    broken = tmp_path / "broken.zip"
+    broken.write_bytes(b"not a zip")
+    assert _process_zip(broken) == (hashlib.sha256(b"not a zip").hexdigest(), None, {})
+
+
+def test_find_zip_with_listing_matches_filesystem_probe(tmp_path: Path) -> None:
+    for name in ("a-2025.zip", "b.meta.zip", "b-1.zip"):
+        (tmp_path / name).write_bytes(b"")
+    zip_names = sorted(p.name for p in tmp_path.glob("*.zip"))
+
+    for meta_name, expected in (
+        ("a.meta.json", "a-2025.zip"),
+        ("b.meta.json", "b.meta.zip"),
+        ("c.meta.json", None),
+    ):
+        meta_path = tmp_path / meta_name
+        found = _find_zip(meta_path, zip_names)
+        assert found == _find_zip(meta_path)
+        assert (found.name if found else None) == expected
+
+
+def test_backtest_meta_iso_fields_are_eager_and_frozen() -> None:
+    import dataclasses
+    from datetime import datetime, timezone
+
+    import pytest
+
+    meta = BacktestMeta("S", "run", "5m", 1_700_000_000, None)
+    assert meta.start_iso == datetime.fromtimestamp(1_700_000_000, tz=timezone.utc).isoformat()
+    assert meta.end_iso is None
+    assert not hasattr(meta, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        meta.run_id = "other"  # type: ignore[misc]
+
+
 def test_parse_zip_metrics_precision() -> None:
     """Test that _parse_zip_metrics maintains precision for monetary values using Decimal."""
     # Create a temporary ZIP file with sample data
@@ -217,6 +277,38 @@ def test_upsert_metric_decimal_precision() -> None:
     conn.close()
 
 
+def test_upsert_metrics_many_matches_single_row_path() -> None:
+    """Bulk flush stores quantized values, lets later rows win, and empties the buffer."""
+    import sqlite3
+
+    conn = sqlite3.connect(":memory:")
+    cur = conn.cursor()
+    cur.execute(
+        "CREATE TABLE metrics (run_id TEXT, key TEXT, value REAL, PRIMARY KEY (run_id, key))"
+    )
+
+    rows = [
+        ("r1", "a", 0.123456789123456789),
+        ("r1", "b", -0.9876543210987654321),
+        ("r1", "a", 2.0),
+    ]
+    _upsert_metrics_many(cur, rows)
+
+    assert rows == []
+    got = dict(cur.execute("SELECT key, value FROM metrics WHERE run_id = 'r1'").fetchall())
+    assert got == {"a": 2.0, "b": -0.98765432}
+
+    # Full VALUES blocks plus a short tail, with a repeated key spanning both
+    n = 2 * _METRIC_VALUES_ROWS + 7
+    rows = [("r2", f"k{i}", i / 3) for i in range(n)] + [("r2", "k0", 5.0)]
+    _upsert_metrics_many(cur, rows)
+    got = dict(cur.execute("SELECT key, value FROM metrics WHERE run_id = 'r2'").fetchall())
+    assert len(got) == n
+    assert got["k0"] == 5.0
+    assert got[f"k{n - 1}"] == round((n - 1) / 3, 8)
+    conn.close()
+
+
 def test_validate_backtest_payload() -> None:
     """Test validating backtest payload."""
     # Valid payload
@@ -256,3 +348,103 @@ def test_validate_hyperopt_trial() -> None:
 
     is_valid = _validate_hyperopt_trial(invalid_trial)
     assert not is_valid
+
+
+def _write_backtest(directory: Path, stem: str) -> tuple[Path, Path, bytes]:
+    meta_path = directory / f"{stem}.meta.json"
+    meta_path.write_text(
+        json.dumps(
+            {
+                "TestStrategy": {
+                    "run_id": "run-1",
+                    "timeframe": "1h",
+                    "backtest_start_ts": 1640995200,
+                    "backtest_end_ts": 1641081600,
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    cfg = json.dumps({"stake_currency": "USDT"}).encode()
+    summary = {
+        "strategy": {"TestStrategy": {"profit_total": 0.123456789, "total_trades": 7}},
+        "strategy_comparison": [{"key": "TestStrategy", "winrate": 0.5, "max_drawdown_abs": 1.5}],
+    }
+    zip_path = directory / f"{stem}-2022-01-02.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr(f"{stem}_config.json", cfg)
+        zf.writestr(f"{stem}.json", json.dumps(summary))
+    return meta_path, zip_path, cfg
+
+
+def test_index_backtests_persists_run_metrics_and_artifacts(tmp_path: Path) -> None:
+    backtests_dir = tmp_path / "backtests"
+    backtests_dir.mkdir()
+    meta_path, zip_path, cfg = _write_backtest(backtests_dir, "bt")
+    (backtests_dir / "broken.meta.json").write_text("{not json", encoding="utf-8")
+    db_path = tmp_path / "results.db"
+
+    assert index_backtests(backtests_dir, db_path) == 1
+
+    con = sqlite3.connect(db_path)
+    try:
+        run = con.execute(
+            "SELECT id, experiment_id, kind, started_utc, finished_utc, status, data_window"
+            " FROM runs"
+        ).fetchall()
+        exp = con.execute(
+            "SELECT id, strategy_id, timeframe, config_hash FROM experiments"
+        ).fetchall()
+        metrics = dict(
+            con.execute("SELECT key, value FROM metrics WHERE key != 'parse_ms'").fetchall()
+        )
+        artifacts = con.execute(
+            "SELECT name, path, sha256, size_bytes FROM artifacts ORDER BY name"
+        ).fetchall()
+    finally:
+        con.close()
+
+    exp_id = "exp:TestStrategy:1h:1640995200-1641081600"
+    start, end = "2022-01-01T00:00:00+00:00", "2022-01-02T00:00:00+00:00"
+    assert run == [("run-1", exp_id, "backtest", start, end, "completed", f"{start}..{end}")]
+    assert exp == [(exp_id, "TestStrategy", "1h", hashlib.sha256(cfg).hexdigest())]
+    assert metrics == {
+        "window_days": 1.0,
+        "timeframe_minutes": 60.0,
+        "profit_total": 0.12345679,
+        "trades": 7.0,
+        "winrate": 0.5,
+        "max_drawdown_abs": 1.5,
+    }
+    assert artifacts == [
+        (p.name, str(p), hashlib.sha256(p.read_bytes()).hexdigest(), p.stat().st_size)
+        for p in (zip_path, meta_path)  # sorted by name
+    ]
+
+
+def test_index_backtests_reuses_hash_of_unchanged_file(tmp_path: Path, monkeypatch) -> None:
+    meta_path, zip_path, _ = _write_backtest(tmp_path, "bt")
+    db_path = tmp_path / "results.db"
+
+    calls: list[Path] = []
+    real_sha = metrics_mod._sha256_file
+    monkeypatch.setattr(metrics_mod, "_sha256_file", lambda p: calls.append(p) or real_sha(p))
+
+    index_backtests(tmp_path, db_path)
+    assert sorted(calls) == sorted([meta_path, zip_path])
+    calls.clear()
+
+    index_backtests(tmp_path, db_path)
+    assert calls == []
+
+    with zipfile.ZipFile(zip_path, "a") as zf:
+        zf.writestr("notes.txt", "changed")
+    index_backtests(tmp_path, db_path)
+    assert calls == [zip_path]
+
+    con = sqlite3.connect(db_path)
+    try:
+        sha = con.execute("SELECT sha256 FROM artifacts WHERE name = ?", (zip_path.name,))
+        assert sha.fetchone()[0] == real_sha(zip_path)
+    finally:
+        con.close()
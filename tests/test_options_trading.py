@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.strategies.options_trading import (
+    BlackScholes,
+    Greeks,
+    Option,
+    OptionsDeltaHedger,
+    OptionsStrategyBuilder,
+    OptionType,
+)
+
+STRIKES = [80.0, 95.0, 100.0, 105.0, 130.0]
+TYPES = [OptionType.CALL, OptionType.PUT, OptionType.CALL, OptionType.PUT, OptionType.CALL]
+
+
+@pytest.mark.parametrize("option_type", [OptionType.CALL, OptionType.PUT])
+def test_calculate_price_vec_matches_scalar(option_type: OptionType) -> None:
+    times = np.array([0.05, 0.25, 0.5, 1.0, 2.0])
+    vols = np.array([0.1, 0.2, 0.35, 0.5, 0.8])
+    vec = BlackScholes.calculate_price_vec(
+        100.0, np.array(STRIKES), times, 0.03, vols, [option_type] * len(STRIKES)
+    )
+    scalar = [
+        BlackScholes.calculate_price(100.0, k, t, 0.03, v, option_type)
+        for k, t, v in zip(STRIKES, times, vols, strict=True)
+    ]
+    np.testing.assert_allclose(vec, scalar, rtol=1e-12, atol=1e-12)
+
+
+def test_calculate_greeks_vec_matches_scalar_for_mixed_types() -> None:
+    vec = BlackScholes.calculate_greeks_vec(100.0, np.array(STRIKES), 0.5, 0.05, 0.25, TYPES)
+    for i, (k, t) in enumerate(zip(STRIKES, TYPES, strict=True)):
+        scalar = BlackScholes.calculate_greeks(100.0, k, 0.5, 0.05, 0.25, t)
+        for name, value in dataclasses.asdict(scalar).items():
+            assert vec[name][i] == pytest.approx(value, rel=1e-12, abs=1e-12), name
+
+
+@pytest.mark.parametrize(
+    "times,vols",
+    [
+        ([0.0, 0.0, 0.0, 0.0, 0.0], 0.3),
+        ([-0.1, -0.1, 0.5, -0.1, 1.0], 0.3),
+        (0.5, [0.0, 0.0, 0.0, 0.2, 0.0]),
+        ([0.0, -0.5, 0.5, 0.25, 1.0], [0.2, 0.3, 0.0, 0.4, 0.0]),
+    ],
+)
+def test_vec_paths_match_scalar_at_expiry_and_zero_volatility(times, vols) -> None:
+    times, vols = np.broadcast_arrays(np.asarray(times, float), np.asarray(vols, float))
+    strikes = np.array(STRIKES)
+    prices = BlackScholes.calculate_price_vec(100.0, strikes, times, 0.05, vols, TYPES)
+    greeks = BlackScholes.calculate_greeks_vec(100.0, strikes, times, 0.05, vols, TYPES)
+
+    for i, (k, t) in enumerate(zip(STRIKES, TYPES, strict=True)):
+        args = (100.0, k, float(times[i]), 0.05, float(vols[i]), t)
+        assert prices[i] == pytest.approx(BlackScholes.calculate_price(*args), abs=1e-12)
+        for name, value in dataclasses.asdict(BlackScholes.calculate_greeks(*args)).items():
+            assert greeks[name][i] == pytest.approx(value, rel=1e-12, abs=1e-12), name
+
+
+def test_greeks_attribute_api() -> None:
+    greeks = BlackScholes.calculate_greeks(100.0, 100.0, 0.5, 0.05, 0.2, OptionType.CALL)
+    assert isinstance(greeks, Greeks)
+    assert 0.5 < greeks.delta < 1.0
+    assert greeks.gamma > 0
+    assert greeks.theta < 0
+    assert greeks.vega > 0
+    assert greeks.rho > 0
+    with pytest.raises(AttributeError):
+        greeks.unknown = 1.0  # type: ignore[attr-defined]
+
+    put = BlackScholes.calculate_greeks(100.0, 100.0, 0.5, 0.05, 0.2, OptionType.PUT)
+    # Put-call parity on delta; gamma and vega are shared
+    assert greeks.delta - put.delta == pytest.approx(1.0)
+    assert put.gamma == pytest.approx(greeks.gamma)
+    assert put.vega == pytest.approx(greeks.vega)
+
+
+def test_portfolio_delta_of_empty_portfolio_is_zero() -> None:
+    assert OptionsDeltaHedger().calculate_portfolio_delta([], spot=100.0) == 0.0
+
+
+def test_portfolio_delta_sums_scalar_deltas() -> None:
+    now = pd.Timestamp("2025-01-01")
+    options = [
+        Option("X", t, k, now + pd.Timedelta(days=90), 0.0, 0.3)
+        for k, t in zip(STRIKES, TYPES, strict=True)
+    ]
+    expected = sum(
+        BlackScholes.calculate_greeks(100.0, o.strike, 90 / 365, 0.05, 0.3, o.option_type).delta
+        for o in options
+    )
+    delta = OptionsDeltaHedger().calculate_portfolio_delta(options, 100.0, now=now)
+    assert delta == pytest.approx(expected, rel=1e-12)
+
+
+def test_portfolio_delta_with_an_expired_option() -> None:
+    now = pd.Timestamp("2025-01-01")
+    options = [
+        Option("X", OptionType.CALL, 90.0, now - pd.Timedelta(days=3), 0.0, 0.3),
+        Option("X", OptionType.PUT, 100.0, now + pd.Timedelta(days=30), 0.0, 0.3),
+    ]
+    put_delta = BlackScholes.calculate_greeks(100.0, 100.0, 30 / 365, 0.05, 0.3, OptionType.PUT)
+    delta = OptionsDeltaHedger().calculate_portfolio_delta(options, 100.0, now=now)
+    assert delta == pytest.approx(1.0 + put_delta.delta, rel=1e-12)
+
+
+def test_iron_condor_expiring_today_prices_legs_at_intrinsic_value() -> None:
+    expiry = pd.Timestamp.now() + pd.Timedelta(hours=6)
+    condor = OptionsStrategyBuilder().create_iron_condor(100.0, [90, 100, 100, 110], expiry, 0.2)
+
+    assert [leg["premium"] for leg in condor["legs"]] == [0.0, 0.0, 0.0, 0.0]
+    assert condor["max_profit"] == 0.0
+
+
+def test_calculate_payoff_accepts_integer_spot_grid() -> None:
+    strategy = {
+        "legs": [
+            {"type": OptionType.CALL, "position": 1, "strike": 100.0, "premium": 2.5},
+            {"type": OptionType.PUT, "position": -1, "strike": 90.0, "premium": 1.25},
+        ]
+    }
+    spots = np.arange(80, 121, 10)  # int64 grid
+    payoff = OptionsStrategyBuilder().calculate_payoff(strategy, spots)
+
+    assert payoff.dtype == np.float64
+    np.testing.assert_allclose(payoff, [-11.25, -1.25, -1.25, 8.75, 18.75])
+
+
+@pytest.mark.parametrize("time_to_expiry", [0.0, -0.1])
+def test_expired_option_is_worth_intrinsic_value(time_to_expiry: float) -> None:
+    price = BlackScholes.calculate_price(110.0, 100.0, time_to_expiry, 0.05, 0.2, OptionType.CALL)
+    assert price == 10.0
+    assert (
+        BlackScholes.calculate_price(110.0, 100.0, time_to_expiry, 0.05, 0.2, OptionType.PUT) == 0
+    )
+
+    greeks = BlackScholes.calculate_greeks(90.0, 100.0, time_to_expiry, 0.05, 0.2, OptionType.PUT)
+    assert greeks == Greeks(delta=-1.0, gamma=0.0, theta=0.0, vega=0.0, rho=0.0)
+
+
+def test_zero_volatility_prices_discounted_forward_intrinsic() -> None:
+    call = BlackScholes.calculate_price(100.0, 100.0, 0.5, 0.05, 0.0, OptionType.CALL)
+    assert call == pytest.approx(100.0 - 100.0 * np.exp(-0.025))  # 2.469
+    assert BlackScholes.calculate_price(100.0, 100.0, 0.5, 0.05, 0.0, OptionType.PUT) == 0.0
+
+    # Limits of the closed form as volatility goes to zero
+    limit = BlackScholes.calculate_greeks(100.0, 100.0, 0.5, 0.05, 0.0, OptionType.CALL)
+    near = BlackScholes.calculate_greeks(100.0, 100.0, 0.5, 0.05, 1e-4, OptionType.CALL)
+    for name, value in dataclasses.asdict(limit).items():
+        assert getattr(near, name) == pytest.approx(value, abs=1e-6), name
+
+
+def test_long_call_expiring_within_a_day() -> None:
+    expiry = pd.Timestamp.now() + pd.Timedelta(hours=6)
+    strategy = OptionsStrategyBuilder().create_long_call(110.0, 100.0, expiry, 0.2)
+
+    assert strategy["max_loss"] == 10.0
+    assert strategy["legs"][0]["greeks"].delta == 1.0
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.stattools import coint
+
+from app.strategies.pairs_trading import (
+    PairAnalyzer,
+    PairsConfig,
+    PairsTradingStrategy,
+    _fast_coint_pvalue,
+    _last_return,
+    _run_signals,
+)
+
+
+def _reference_signals(
+    zscores: np.ndarray,
+    entry: float,
+    exit_threshold: float,
+    position: int,
+    entry_zscore: float | None,
+) -> tuple[list[int], int, float | None]:
+    """Plain per-bar state machine, as generate_signals looped before vectorization."""
+    signals = [0] * len(zscores)
+    for i in range(1, len(zscores)):
+        z = zscores[i]
+        if np.isnan(z):
+            continue
+        if position == 0:
+            if z > entry:
+                signals[i] = -1
+                position, entry_zscore = -1, z
+            elif z < -entry:
+                signals[i] = 1
+                position, entry_zscore = 1, z
+        elif abs(z) < exit_threshold:
+            signals[i] = -position
+            position, entry_zscore = 0, None
+        elif position == 1 and z < entry_zscore - 1:
+            signals[i] = -1
+            position, entry_zscore = 0, None
+        elif position == -1 and z > entry_zscore + 1:
+            signals[i] = 1
+            position, entry_zscore = 0, None
+    return signals, position, entry_zscore
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("start", [(0, None), (1, -2.5), (-1, 2.0), (1, -3.25)])
+def test_run_signals_matches_per_bar_loop(seed: int, start: tuple[int, float | None]) -> None:
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(0, 400))
+    # A quarter-step grid puts many bars exactly on the entry, exit and stop levels
+    zscores = np.round(np.cumsum(rng.normal(0, 0.6, n)) * 4) / 4
+    zscores[rng.random(n) < 0.1] = np.nan
+    if n:
+        zscores[: int(rng.integers(0, min(n, 30)))] = np.nan  # rolling warm-up
+
+    signals, position, entry_zscore = _run_signals(zscores, 2.0, 0.5, *start)
+    expected, exp_position, exp_entry = _reference_signals(zscores, 2.0, 0.5, *start)
+
+    assert signals.tolist() == expected
+    assert position == exp_position
+    assert entry_zscore == exp_entry
+
+
+def test_run_signals_threshold_ties_do_not_trigger() -> None:
+    # Equal to +entry, then to the exit level, then to the stop level: all strict comparisons
+    zscores = np.array([np.nan, 2.0, 2.25, 0.5, 3.25, 0.25, -2.5, -3.5, -3.75])
+    signals, position, entry_zscore = _run_signals(zscores, 2.0, 0.5, 0, None)
+
+    assert signals.tolist() == [0, 0, -1, 0, 0, 1, 1, 0, -1]
+    assert (position, entry_zscore) == (0, None)
+    assert signals.tolist() == _reference_signals(zscores, 2.0, 0.5, 0, None)[0]
+
+
+def test_generate_signals_carries_state_between_calls() -> None:
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2025-01-01", periods=300, freq="h")
+    base = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+    price1 = pd.Series(base * np.exp(rng.normal(0, 0.02, 300)), index=index)
+    price2 = pd.Series(base, index=index)
+    strategy = PairsTradingStrategy(("A", "B"), PairsConfig(lookback_period=20, max_half_life=365))
+
+    expected_state = (0, None)
+    # The first call ends with an open short, so the second starts from carried state
+    for chunk in (slice(0, 190), slice(190, 300)):
+        p1, p2 = price1[chunk], price2[chunk]
+        zscore = strategy.analyzer.calculate_zscore(strategy.analyzer.calculate_spread(p1, p2))
+        expected, *state = _reference_signals(zscore.to_numpy(), 2.0, 0.5, *expected_state)
+        expected_state = tuple(state)
+        assert strategy.generate_signals(p1, p2).tolist() == expected
+        assert (strategy.position, strategy.entry_zscore) == expected_state
+        if chunk.start == 0:
+            assert strategy.position == -1
+    assert any(expected)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hedge_ratio_matches_lstsq(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    x = np.log(50 + np.cumsum(rng.normal(0, 1, 500)).clip(-40))
+    y = 0.3 + 1.7 * x + rng.normal(0, 0.05, 500)
+    design = np.column_stack([np.ones_like(x), x])
+    expected = np.linalg.lstsq(design, y, rcond=None)[0][1]
+
+    analyzer = PairAnalyzer()
+    assert analyzer._calculate_hedge_ratio(y, x) == pytest.approx(expected, rel=1e-10)
+    assert analyzer._calculate_hedge_ratio(pd.Series(y), pd.Series(x)) == pytest.approx(
+        expected, rel=1e-10
+    )
+
+
+def test_half_life_matches_lstsq_with_gaps() -> None:
+    rng = np.random.default_rng(3)
+    values = np.zeros(400)
+    for i in range(1, 400):
+        values[i] = 0.9 * values[i - 1] + rng.normal()
+    values[[10, 11, 200]] = np.nan
+    spread = pd.Series(values)
+
+    lag = spread.shift(1)
+    diff = spread - lag
+    keep = lag.notna() & diff.notna()
+    coef = np.linalg.lstsq(lag[keep].to_numpy().reshape(-1, 1), diff[keep].to_numpy())[0][0]
+
+    assert PairAnalyzer().calculate_half_life(spread) == min(int(np.log(2) / -coef), 365)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_fast_coint_pvalue_matches_statsmodels(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.normal(size=300))
+    if seed % 2:
+        y = 2.0 * x + rng.normal(size=300)  # cointegrated
+    else:
+        y = np.cumsum(rng.normal(size=300))  # independent random walks
+
+    expected = coint(y, x, maxlag=0, autolag=None)[1]
+    assert _fast_coint_pvalue(y, x) == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_fast_coint_pvalue_degenerate_legs() -> None:
+    x = np.cumsum(np.random.default_rng(0).normal(size=100))
+    assert np.isnan(_fast_coint_pvalue(x, np.full(100, 3.0)))
+    assert _fast_coint_pvalue(1.5 * x + 2.0, x) == 0.0
+
+
+@pytest.mark.parametrize("pad", [True, False])
+@pytest.mark.parametrize(
+    "closes",
+    [
+        [100.0, 101.0, 103.0],
+        [100.0, 101.0, np.nan],
+        [100.0, np.nan, 103.0],
+        [100.0, np.nan, np.nan],
+        [np.nan, np.nan, 103.0],
+        [np.nan, 101.0, 103.0],
+        [np.nan, np.nan, np.nan],
+        [100.0, 0.0, 103.0],
+        [100.0],
+        [],
+    ],
+)
+def test_last_return_matches_pct_change(closes: list[float], pad: bool) -> None:
+    close = pd.Series(closes, dtype=float)
+    expected = (close.ffill() if pad else close).pct_change().iloc[-1] if len(closes) else np.nan
+    assert _last_return(close, pad=pad) == pytest.approx(expected, nan_ok=True)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 from pathlib import Path
 
 import pytest
 from pydantic import ValidationError
 
-from app.strategies.registry import load_registry
+from app.strategies.registry import export_sqlite, load_registry
 from app.strategies.registry_models import RegistrySchema
 
 
@@ -113,3 +114,65 @@ def test_registry_schema_validation() -> None:
     # This should raise ValidationError
     with pytest.raises(ValidationError):
         RegistrySchema(**invalid_data)
+
+
+def test_export_sqlite_upserts_all_sections(tmp_path: Path) -> None:
+    """A second export updates existing rows in place instead of duplicating them."""
+    registry = {
+        "strategies": [
+            {
+                "id": f"s{i}",
+                "name": f"S{i}",
+                "class_name": f"S{i}",
+                "file_path": f"s{i}.py",
+                "timeframes": ["5m", "1h"],
+                "parameters": {"p": i},
+            }
+            for i in range(3)
+        ],
+        "methods": [{"id": "m", "name": "M", "references": ["a", "b"]}],
+        "concepts": [{"id": "c", "name": "C"}],
+        "sources": [{"id": "src", "title": "T"}],
+    }
+    db_path = tmp_path / "registry.db"
+    export_sqlite(registry, db_path)
+    registry["strategies"][0]["status"] = "retired"
+    export_sqlite(registry, db_path)
+
+    con = sqlite3.connect(db_path)
+    try:
+        counts = [
+            con.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]  # noqa: S608
+            for t in ("strategies", "methods", "concepts", "sources")
+        ]
+        row = con.execute(
+            "SELECT status, timeframes, parameters_json FROM strategies WHERE id = 's0'"
+        ).fetchone()
+        refs = con.execute("SELECT refs FROM methods").fetchone()[0]
+    finally:
+        con.close()
+    assert counts == [3, 1, 1, 1]
+    assert row == ("retired", "5m,1h", '{"p": 0}')
+    assert refs == "a,b"
+
+
+def test_export_sqlite_replace_drops_stale_rows(tmp_path: Path) -> None:
+    strategy = {"name": "S", "class_name": "S", "file_path": "s.py"}
+    db_path = tmp_path / "registry.db"
+    export_sqlite({"strategies": [{"id": "old", **strategy}, {"id": "kept", **strategy}]}, db_path)
+
+    registry = {
+        "strategies": [{"id": "kept", **strategy, "status": "active"}, {"id": "new", **strategy}]
+    }
+    export_sqlite(registry, db_path)
+    export_sqlite(registry, tmp_path / "fresh.db")
+    export_sqlite(registry, db_path, replace=True)
+
+    def dump(path: Path) -> list[tuple]:
+        con = sqlite3.connect(path)
+        try:
+            return con.execute("SELECT id, status FROM strategies ORDER BY id").fetchall()
+        finally:
+            con.close()
+
+    assert dump(db_path) == dump(tmp_path / "fresh.db") == [("kept", "active"), ("new", None)]
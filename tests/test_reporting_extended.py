@@ -4,6 +4,9 @@ import sqlite3
 import tempfile
 from pathlib import Path
 
+import pytest
+
+import app.strategies.reporting as reporting
 from app.strategies.reporting import generate_results_markdown_from_db
 
 
@@ -126,3 +129,72 @@ def test_generate_results_markdown_includes_data_window_and_config_hash() -> Non
 
     # Cleanup
     db_path.unlink()
+
+
+def test_generate_results_markdown_sees_columns_added_between_calls(tmp_path: Path) -> None:
+    db_path = tmp_path / "results.db"
+    con = sqlite3.connect(db_path)
+    con.executescript("""
+        PRAGMA journal_mode=WAL;
+        CREATE TABLE runs (
+            id TEXT PRIMARY KEY, experiment_id TEXT, kind TEXT,
+            started_utc TEXT, finished_utc TEXT, status TEXT
+        );
+        CREATE TABLE metrics (run_id TEXT, key TEXT, value REAL, PRIMARY KEY (run_id, key));
+        INSERT INTO runs VALUES ('run_1', 'exp_1', 'backtest', 's', 'f', 'completed');
+        """)
+    con.commit()
+    try:
+        assert "window_1" not in generate_results_markdown_from_db(db_path)
+
+        # Schema change while the writer still holds the WAL open
+        con.execute("ALTER TABLE runs ADD COLUMN data_window TEXT")
+        con.execute("UPDATE runs SET data_window = 'window_1'")
+        con.commit()
+        assert "window_1" in generate_results_markdown_from_db(db_path)
+    finally:
+        con.close()
+
+
+def test_generate_results_markdown_reuses_caller_connection(tmp_path: Path) -> None:
+    db_path = tmp_path / "results.db"
+    con = sqlite3.connect(db_path)
+    con.executescript("""
+        CREATE TABLE runs (
+            id TEXT PRIMARY KEY, experiment_id TEXT, kind TEXT,
+            started_utc TEXT, finished_utc TEXT, status TEXT
+        );
+        CREATE TABLE metrics (run_id TEXT, key TEXT, value REAL, PRIMARY KEY (run_id, key));
+        INSERT INTO runs VALUES ('run_1', 'exp_1', 'backtest', 's', 'f', 'completed');
+        INSERT INTO metrics VALUES ('run_1', 'sharpe', 1.5);
+        """)
+    try:
+        first = generate_results_markdown_from_db(db_path, con=con)
+        second = generate_results_markdown_from_db(db_path, con=con)
+        # Still open for the caller
+        assert con.execute("SELECT COUNT(*) FROM runs").fetchone() == (1,)
+    finally:
+        con.close()
+    assert "| run_1 | completed |" in first
+    assert "1.50000000" in first
+    assert first.split("\n", 3)[3] == second.split("\n", 3)[3]
+
+
+def test_generate_results_markdown_closes_connection_when_pragmas_fail(
+    tmp_path: Path, monkeypatch
+) -> None:
+    db_path = tmp_path / "results.db"
+    sqlite3.connect(db_path).close()
+    opened: list[sqlite3.Connection] = []
+
+    def _failing_pragmas(con: sqlite3.Connection) -> None:
+        opened.append(con)
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(reporting, "apply_read_pragmas", _failing_pragmas)
+    out = generate_results_markdown_from_db(db_path)
+
+    assert out.startswith("# Fel: Kunde inte ansluta till databasen")
+    assert len(opened) == 1
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        opened[0].execute("SELECT 1")
@@ -314,10 +314,9 @@ def test_count_active_locks_generic_stat_error(tmp_path: Path) -> None:
         assert count == 0
         mock_logger.warning.assert_called_once()
 
-        # The f-string in the code produces a single argument to the warning call.
+        # Lazy %-style args: render the message the way logging would.
         args, _ = mock_logger.warning.call_args
-        assert len(args) == 1
-        log_message = args[0]
+        log_message = args[0] % args[1:]
         assert "Could not process lock file" in log_message
         assert lock_file.name in log_message
         assert "Unexpected stat error" in log_message